@@ -0,0 +1,512 @@
+import csv
+import io
+import json
+import logging
+from dataclasses import dataclass, field
+from itertools import batched
+from typing import Any, ClassVar, Iterable, Iterator
+
+from fastapi import UploadFile, status
+from sqlalchemy import delete, exc, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.dashboard import invalidate_dashboard_stats
+from app.api.dependencies.gejala_manager import GejalaManager
+from app.api.dependencies.knowledge_base import knowledge_base
+from app.api.dependencies.penyakit_manager import PenyakitManager
+from app.api.dependencies.rule_manager import RuleManager
+from app.db.id_allocator import IdAllocator
+from app.db.models.gejala import Gejala
+from app.db.models.kelompok import Kelompok
+from app.db.models.kelompok_gejala import KelompokGejala
+from app.db.models.pakar import Pakar
+from app.db.models.penyakit import Penyakit
+from app.db.models.rule import Rule
+from app.db.models.rule_cf import RuleCf
+from app.db.rule_cf_aggregate import refresh_rule_cf_aggregates
+from app.db.unit_of_work import on_commit, unit_of_work
+from app.schemas.bulk_import import ImportResult, ImportRowError
+from app.schemas.rule import CF_MAX, CF_MIN, CF_RANGE_MESSAGE
+from app.utils.common import ErrorCode
+from app.utils.exceptions import AppExceptionError
+from app.utils.id_healper import IDHelper
+from app.utils.upsert import upsert
+
+logger = logging.getLogger(__name__)
+
+# Jumlah baris yang divalidasi dan ditulis sekaligus
+CHUNK_SIZE = 1000
+# Jumlah maksimum kesalahan baris yang dikembalikan dalam laporan
+MAX_REPORTED_ERRORS = 1000
+
+
+def read_rows(upload: UploadFile) -> Iterator[dict[str, Any]]:
+    """
+    Membaca baris dari file CSV, JSON (array objek) atau JSON Lines. CSV dan
+    JSON Lines dibaca bertahap sehingga file besar tidak dimuat sekaligus.
+    """
+    # Kesalahan encoding dan format CSV baru muncul saat file dibaca
+    try:
+        yield from _read_rows(upload)
+    except UnicodeDecodeError:
+        raise _file_error("File harus menggunakan encoding UTF-8.") from None
+    except csv.Error as e:
+        raise _file_error(f"File CSV tidak valid: {e}") from None
+
+
+def _read_rows(upload: UploadFile) -> Iterator[dict[str, Any]]:
+    name = (upload.filename or "").lower()
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    if name.endswith(".csv") or upload.content_type == "text/csv":
+        yield from csv.DictReader(text)
+    elif name.endswith((".jsonl", ".ndjson")):
+        for line in text:
+            if line.strip():
+                yield _json_object(line)
+    elif name.endswith(".json") or upload.content_type == "application/json":
+        data = _json_load(text)
+        if not isinstance(data, list):
+            raise _file_error("File JSON harus berisi array objek.")
+        yield from data
+    else:
+        raise AppExceptionError(
+            "Format file tidak didukung. Gunakan .csv, .json, atau .jsonl.",
+            error_code=ErrorCode.IMPORT_FILE_INVALID,
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        )
+
+
+def _json_load(text: io.TextIOWrapper) -> Any:
+    try:
+        return json.load(text)
+    except UnicodeDecodeError:
+        # Dilaporkan oleh read_rows
+        raise
+    except ValueError as e:
+        raise _file_error(f"File JSON tidak valid: {e}") from None
+
+
+def _json_object(line: str) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        raise _file_error(f"Baris JSON tidak valid: {e}") from None
+
+
+def _file_error(message: str) -> AppExceptionError:
+    return AppExceptionError(
+        message,
+        error_code=ErrorCode.IMPORT_FILE_INVALID,
+        status_code=status.HTTP_400_BAD_REQUEST,
+    )
+
+
+@dataclass(slots=True)
+class _Row:
+    number: int
+    values: dict[str, Any]
+    errors: list[str] = field(default_factory=list)
+
+
+class BulkImporter:
+    """
+    Impor massal satu jenis data dalam satu transaksi.
+
+    Baris dibaca per ``CHUNK_SIZE``; setiap chunk divalidasi di memori dengan
+    beberapa query ``IN`` lalu ditulis dengan satu ``INSERT ... ON CONFLICT``
+    (executemany). Jika ada baris tidak valid, seluruh impor dibatalkan kecuali
+    ``skip_invalid`` aktif, di mana baris tersebut dilewati.
+
+    Subclass mendefinisikan pemetaan kolom file ke field model (format yang sama
+    dengan ``app/db/factories/file/*.csv``), ``parse`` untuk validasi per baris,
+    ``check`` untuk validasi terhadap database, dan ``write``.
+    """
+
+    model: ClassVar[Any]
+    # kolom file -> field model
+    columns: ClassVar[dict[str, str]]
+    required: ClassVar[tuple[str, ...]]
+    index_elements: ClassVar[tuple[str, ...]] = ("id",)
+    update_columns: ClassVar[tuple[str, ...]] = ()
+    id_helper: IDHelper | None = None
+    id_allocator: IdAllocator | None = None
+
+    def __init__(self, session: AsyncSession, skip_invalid: bool = False):
+        self.session = session
+        self.skip_invalid = skip_invalid
+        # Kunci yang sudah muncul di file, untuk mendeteksi duplikat antar chunk
+        self._seen: dict[str, set[Any]] = {}
+
+    async def run(self, raw_rows: Iterable[Any]) -> ImportResult:
+        result = ImportResult(total_rows=0, imported=0, skipped=0)
+        try:
+            async with unit_of_work(self.session):
+                for chunk in batched(raw_rows, CHUNK_SIZE):
+                    rows = [
+                        self._parse_row(result.total_rows + i, raw)
+                        for i, raw in enumerate(chunk, start=1)
+                    ]
+                    result.total_rows += len(rows)
+                    await self.check([row for row in rows if not row.errors])
+
+                    valid = [row.values for row in rows if not row.errors]
+                    for row in rows:
+                        if row.errors:
+                            result.skipped += 1
+                            if len(result.errors) < MAX_REPORTED_ERRORS:
+                                result.errors.append(self._report(row))
+
+                    # Tanpa skip_invalid hasil akan dibatalkan, jadi penulisan
+                    # dihentikan dan sisa file hanya divalidasi.
+                    if valid and (self.skip_invalid or not result.skipped):
+                        await self.write(valid)
+                        result.imported += len(valid)
+
+                if result.skipped and not self.skip_invalid:
+                    raise AppExceptionError(
+                        f"Impor dibatalkan: {result.skipped} dari "
+                        f"{result.total_rows} baris tidak valid.",
+                        error_code=ErrorCode.IMPORT_VALIDATION_ERROR,
+                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                        total_rows=result.total_rows,
+                        errors=[error.model_dump() for error in result.errors],
+                    )
+        except exc.IntegrityError as e:
+            logger.error(f"Integrity error importing {self.model.__name__}: {e}")
+            raise AppExceptionError(
+                f"Impor {self.model.__name__} gagal karena konflik data.",
+                f"Detail: {e.orig}",
+                error_code=ErrorCode.INTEGRITY_ERROR,
+                status_code=status.HTTP_409_CONFLICT,
+            ) from None
+        except exc.SQLAlchemyError as e:
+            logger.error(
+                f"SQLAlchemy error importing {self.model.__name__}: {e}",
+                exc_info=True,
+            )
+            raise AppExceptionError(
+                f"Impor {self.model.__name__} gagal karena kesalahan database.",
+                error_code=ErrorCode.INTERNAL_SERVER_ERROR,
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            ) from None
+
+        on_commit(self.session, knowledge_base.invalidate)
+        on_commit(self.session, invalidate_dashboard_stats)
+        logger.info(
+            f"Imported {result.imported} {self.model.__name__} rows "
+            f"({result.skipped} skipped)."
+        )
+        return result
+
+    def _parse_row(self, number: int, raw: Any) -> _Row:
+        row = _Row(number, {})
+        if not isinstance(raw, dict):
+            row.errors.append("Baris harus berupa objek.")
+            return row
+
+        for column, field_name in self.columns.items():
+            value = raw.get(column)
+            if value is not None and not isinstance(value, list):
+                value = str(value).strip()
+            if value in (None, ""):
+                if column in self.required:
+                    row.errors.append(f"Kolom {column} wajib diisi.")
+                continue
+            row.values[field_name] = value
+
+        if not row.errors:
+            self.parse(row)
+        if not row.errors:
+            self._check_duplicates_in_file(row)
+        return row
+
+    def _check_duplicates_in_file(self, row: _Row) -> None:
+        for name, key in self.unique_keys(row.values).items():
+            seen = self._seen.setdefault(name, set())
+            if key in seen:
+                row.errors.append(f"{name} duplikat di dalam file.")
+            else:
+                seen.add(key)
+
+    def _report(self, row: _Row) -> ImportRowError:
+        id_value = row.values.get(self.index_elements[0])
+        return ImportRowError(
+            row=row.number,
+            id=None if id_value is None else str(id_value),
+            errors=row.errors,
+        )
+
+    def _check_id_format(self, row: _Row) -> None:
+        if self.id_helper is None:
+            return
+        is_valid, message = self.id_helper.validate_format(row.values["id"])
+        if not is_valid:
+            row.errors.append(message)
+
+    def unique_keys(self, values: dict[str, Any]) -> dict[str, Any]:
+        """Kunci yang harus unik di dalam file, per nama kunci."""
+        return {"ID": tuple(values[key] for key in self.index_elements)}
+
+    def parse(self, row: _Row) -> None:
+        """Validasi dan konversi nilai satu baris tanpa akses database."""
+        self._check_id_format(row)
+
+    async def check(self, rows: list[_Row]) -> None:
+        """Validasi satu chunk terhadap database."""
+
+    async def write(self, rows: list[dict[str, Any]]) -> None:
+        # Kolom yang tidak diisi file tidak ikut diperbarui pada data yang
+        # sudah ada, jadi baris dikelompokkan menurut kolom yang diisi
+        groups: dict[frozenset[str], list[dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault(frozenset(row), []).append(row)
+        for keys, group in groups.items():
+            await upsert(
+                self.session,
+                self.model,
+                group,
+                index_elements=self.index_elements,
+                update_columns=[c for c in self.update_columns if c in keys],
+            )
+        # ID dari file tidak boleh dialokasikan lagi untuk data baru
+        if self.id_allocator is not None:
+            await self.id_allocator.claim(row["id"] for row in rows)
+
+    async def _existing(self, column: Any, values: Iterable[Any]) -> set[Any]:
+        values = set(values)
+        if not values:
+            return set()
+        return set(
+            await self.session.scalars(select(column).where(column.in_(values)))
+        )
+
+    async def _check_unique_nama(self, rows: list[_Row]) -> None:
+        """Nama tidak boleh sudah dipakai data lain dengan ID berbeda."""
+        names = {row.values["nama"] for row in rows}
+        owners = dict(
+            (
+                await self.session.execute(
+                    select(self.model.nama, self.model.id).where(
+                        self.model.nama.in_(names)
+                    )
+                )
+            ).all()
+        )
+        for row in rows:
+            owner = owners.get(row.values["nama"])
+            if owner is not None and owner != row.values["id"]:
+                row.errors.append(
+                    f"Nama {row.values['nama']} sudah digunakan oleh {owner}."
+                )
+
+
+class PenyakitImporter(BulkImporter):
+    model = Penyakit
+    columns: ClassVar[dict[str, str]] = {
+        "kode_penyakit": "id",
+        "nama_penyakit": "nama",
+        "deskripsi": "deskripsi",
+        "solusi": "solusi",
+        "pencegahan": "pencegahan",
+    }
+    required = ("kode_penyakit", "nama_penyakit", "solusi")
+    update_columns = ("nama", "deskripsi", "solusi", "pencegahan")
+
+    def __init__(self, session: AsyncSession, skip_invalid: bool = False):
+        super().__init__(session, skip_invalid)
+        manager = PenyakitManager(session)
+        self.id_helper = manager.id_helper
+        self.id_allocator = manager.id_allocator
+
+    def unique_keys(self, values: dict[str, Any]) -> dict[str, Any]:
+        return {"ID": values["id"], "Nama": values["nama"]}
+
+    async def check(self, rows: list[_Row]) -> None:
+        await self._check_unique_nama(rows)
+
+
+class GejalaImporter(BulkImporter):
+    """
+    Kolom ``id_kelompok`` berisi ID kelompok dipisah ``;`` (atau list pada
+    JSON). Jika diisi, kelompok gejala diganti dengan daftar tersebut.
+    """
+
+    model = Gejala
+    columns: ClassVar[dict[str, str]] = {
+        "kode_gejala": "id",
+        "nama_gejala": "nama",
+        "deskripsi": "deskripsi",
+        "pertanyaan": "pertanyaan",
+        "id_kelompok": "kelompoks",
+    }
+    required = ("kode_gejala", "nama_gejala")
+    update_columns = ("nama", "deskripsi", "pertanyaan")
+
+    def __init__(self, session: AsyncSession, skip_invalid: bool = False):
+        super().__init__(session, skip_invalid)
+        manager = GejalaManager(session)
+        self.id_helper = manager.id_helper
+        self.id_allocator = manager.id_allocator
+
+    def unique_keys(self, values: dict[str, Any]) -> dict[str, Any]:
+        return {"ID": values["id"], "Nama": values["nama"]}
+
+    def parse(self, row: _Row) -> None:
+        super().parse(row)
+        values = row.values
+        kelompoks = values.get("kelompoks")
+        if kelompoks is None:
+            return
+        if isinstance(kelompoks, str):
+            kelompoks = kelompoks.split(";")
+        try:
+            values["kelompoks"] = sorted(
+                {int(str(kelompok).strip()) for kelompok in kelompoks}
+            )
+        except (TypeError, ValueError):
+            row.errors.append("id_kelompok harus berisi angka dipisah ';'.")
+
+    async def check(self, rows: list[_Row]) -> None:
+        await self._check_unique_nama(rows)
+        kelompok_ids = {k for row in rows for k in row.values.get("kelompoks", ())}
+        existing = await self._existing(Kelompok.id, kelompok_ids)
+        for row in rows:
+            missing = set(row.values.get("kelompoks", ())) - existing
+            if missing:
+                missing_ids = ", ".join(map(str, sorted(missing)))
+                row.errors.append(f"Kelompok tidak ditemukan: {missing_ids}.")
+
+    async def write(self, rows: list[dict[str, Any]]) -> None:
+        relations = {
+            row["id"]: row.pop("kelompoks") for row in rows if "kelompoks" in row
+        }
+        # Sama dengan seeder: pertanyaan gejala baru dibentuk dari nama jika
+        # tidak diisi; pertanyaan gejala yang sudah ada dibiarkan
+        without = [row for row in rows if "pertanyaan" not in row]
+        existing = await self._existing(Gejala.id, (row["id"] for row in without))
+        for row in without:
+            if row["id"] not in existing:
+                row["pertanyaan"] = (
+                    f"Apakah kucing Anda menunjukkan gejala: {row['nama']}?"
+                )
+        await super().write(rows)
+        if not relations:
+            return
+        await self.session.execute(
+            delete(KelompokGejala).where(KelompokGejala.id_gejala.in_(relations))
+        )
+        await upsert(
+            self.session,
+            KelompokGejala,
+            [
+                {"id_gejala": id_gejala, "id_kelompok": id_kelompok}
+                for id_gejala, kelompok_ids in relations.items()
+                for id_kelompok in kelompok_ids
+            ],
+            index_elements=("id_gejala", "id_kelompok"),
+        )
+
+
+class RuleImporter(BulkImporter):
+    model = Rule
+    columns: ClassVar[dict[str, str]] = {
+        "id_rule": "id",
+        "kode_penyakit": "id_penyakit",
+        "kode_gejala_terkait": "id_gejala",
+    }
+    required = ("id_rule", "kode_penyakit", "kode_gejala_terkait")
+    update_columns = ("id_penyakit", "id_gejala")
+
+    def __init__(self, session: AsyncSession, skip_invalid: bool = False):
+        super().__init__(session, skip_invalid)
+        manager = RuleManager(session)
+        self.id_helper = manager.id_helper
+        self.id_allocator = manager.id_allocator
+
+    def unique_keys(self, values: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "ID": values["id"],
+            "Pasangan gejala-penyakit": (values["id_gejala"], values["id_penyakit"]),
+        }
+
+    async def check(self, rows: list[_Row]) -> None:
+        penyakit = await self._existing(
+            Penyakit.id, (row.values["id_penyakit"] for row in rows)
+        )
+        gejala = await self._existing(
+            Gejala.id, (row.values["id_gejala"] for row in rows)
+        )
+        pairs = {
+            (row.values["id_gejala"], row.values["id_penyakit"]) for row in rows
+        }
+        owners = {}
+        if pairs:
+            owners = {
+                (id_gejala, id_penyakit): id_
+                for id_, id_gejala, id_penyakit in await self.session.execute(
+                    select(Rule.id, Rule.id_gejala, Rule.id_penyakit).where(
+                        tuple_(Rule.id_gejala, Rule.id_penyakit).in_(pairs)
+                    )
+                )
+            }
+
+        for row in rows:
+            values = row.values
+            if values["id_penyakit"] not in penyakit:
+                row.errors.append(
+                    f"Penyakit {values['id_penyakit']} tidak ditemukan."
+                )
+            if values["id_gejala"] not in gejala:
+                row.errors.append(f"Gejala {values['id_gejala']} tidak ditemukan.")
+            owner = owners.get((values["id_gejala"], values["id_penyakit"]))
+            if owner is not None and owner != values["id"]:
+                row.errors.append(
+                    "Aturan dengan gejala dan penyakit yang sama sudah ada "
+                    f"({owner})."
+                )
+
+
+class RuleCfImporter(BulkImporter):
+    """Nilai CF berada pada rentang -1 hingga 1, sama dengan data seeder."""
+
+    model = RuleCf
+    columns: ClassVar[dict[str, str]] = {
+        "id_rule": "id_rule",
+        "id_pakar": "id_pakar",
+        "nilai_cf": "nilai",
+    }
+    required = ("id_rule", "id_pakar", "nilai_cf")
+    index_elements = ("id_rule", "id_pakar")
+    update_columns = ("nilai",)
+
+    def parse(self, row: _Row) -> None:
+        values = row.values
+        try:
+            values["nilai"] = float(values["nilai"])
+        except (TypeError, ValueError):
+            row.errors.append("nilai_cf harus berupa angka.")
+            return
+        if not CF_MIN <= values["nilai"] <= CF_MAX:
+            row.errors.append(CF_RANGE_MESSAGE)
+
+    def unique_keys(self, values: dict[str, Any]) -> dict[str, Any]:
+        return {"Pasangan rule-pakar": (values["id_rule"], values["id_pakar"])}
+
+    async def check(self, rows: list[_Row]) -> None:
+        rules = await self._existing(
+            Rule.id, (row.values["id_rule"] for row in rows)
+        )
+        pakar = await self._existing(
+            Pakar.id, (row.values["id_pakar"] for row in rows)
+        )
+        for row in rows:
+            if row.values["id_rule"] not in rules:
+                row.errors.append(f"Rule {row.values['id_rule']} tidak ditemukan.")
+            if row.values["id_pakar"] not in pakar:
+                row.errors.append(f"Pakar {row.values['id_pakar']} tidak ditemukan.")
+
+    async def write(self, rows: list[dict[str, Any]]) -> None:
+        await super().write(rows)
+        await refresh_rule_cf_aggregates(
+            self.session, (row["id_rule"] for row in rows)
+        )
@@ -0,0 +1,190 @@
+from dataclasses import dataclass
+from typing import Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class CfMatrixResult:
+    """
+    Hasil evaluasi CfMatrix untuk satu kasus.
+
+    ``cf`` dan ``matched`` berukuran (jumlah penyakit terdampak, jumlah kolom),
+    dengan urutan kolom mengikuti argumen ``columns`` pada ``CfMatrix.evaluate``.
+    """
+
+    penyakit_ids: tuple[str, ...]
+    cf: np.ndarray
+    matched: np.ndarray
+
+
+@dataclass(frozen=True, slots=True)
+class CfMatrix:
+    """
+    Matriks CF penyakit x gejala dalam format sparse berorientasi gejala (CSC).
+
+    Setiap entri (aturan) menyimpan satu kolom CF per pakar ditambah satu kolom
+    rata-rata (kolom terakhir). Nilai NaN berarti pakar tidak memberi CF untuk
+    aturan tersebut.
+    """
+
+    penyakit_ids: tuple[str, ...]
+    gejala_ids: tuple[str, ...]
+    gejala_index: Mapping[str, int]
+    pakar_ids: tuple[str, ...]
+    indptr: np.ndarray
+    penyakit_idx: np.ndarray
+    data: np.ndarray
+
+    @classmethod
+    def from_rules(
+        cls,
+        rules: Iterable[tuple[str, str, Mapping[str, float], Optional[float]]],
+        pakar_ids: Iterable[str],
+    ) -> "CfMatrix":
+        """
+        Membangun matriks dari tuple ``(id_gejala, id_penyakit, cf_pakar, cf_avg)``.
+        Aturan tanpa CF pakar tetap disimpan dengan seluruh kolom NaN.
+        """
+        pakar_ids = tuple(pakar_ids)
+        pakar_column = {pakar_id: i for i, pakar_id in enumerate(pakar_ids)}
+
+        by_gejala: dict[
+            str, list[tuple[str, Mapping[str, float], Optional[float]]]
+        ] = {}
+        for id_gejala, id_penyakit, cf_pakar, cf_avg in rules:
+            by_gejala.setdefault(id_gejala, []).append(
+                (id_penyakit, cf_pakar, cf_avg)
+            )
+
+        penyakit_index: dict[str, int] = {}
+        gejala_index: dict[str, int] = {}
+        indptr = [0]
+        penyakit_idx: list[int] = []
+        rows: list[list[float]] = []
+        for id_gejala, entries in by_gejala.items():
+            gejala_index[id_gejala] = len(gejala_index)
+            for id_penyakit, cf_pakar, cf_avg in entries:
+                penyakit_idx.append(
+                    penyakit_index.setdefault(id_penyakit, len(penyakit_index))
+                )
+                row = [np.nan] * (len(pakar_ids) + 1)
+                for pakar_id, nilai in cf_pakar.items():
+                    if pakar_id in pakar_column:
+                        row[pakar_column[pakar_id]] = nilai
+                if cf_avg is not None:
+                    row[-1] = cf_avg
+                rows.append(row)
+            indptr.append(len(penyakit_idx))
+
+        indptr_array = np.asarray(indptr, dtype=np.intp)
+        penyakit_idx_array = np.asarray(penyakit_idx, dtype=np.intp)
+        data = np.asarray(rows, dtype=np.float64).reshape(-1, len(pakar_ids) + 1)
+
+        return cls(
+            penyakit_ids=tuple(penyakit_index),
+            gejala_ids=tuple(gejala_index),
+            gejala_index=gejala_index,
+            pakar_ids=pakar_ids,
+            indptr=indptr_array,
+            penyakit_idx=penyakit_idx_array,
+            data=data,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.penyakit_idx.nbytes + self.data.nbytes
+
+    def column(self, pakar_id: Optional[str] = None) -> int:
+        """Indeks kolom untuk pakar tertentu, atau kolom rata-rata jika None."""
+        if pakar_id is None:
+            return len(self.pakar_ids)
+        return self.pakar_ids.index(pakar_id)
+
+    def separation(self, column: int, penyakit: Sequence[int]) -> np.ndarray:
+        """
+        Simpangan baku CF setiap gejala terhadap penyakit ``penyakit`` (indeks
+        posisi pada ``penyakit_ids``), dengan 0 untuk pasangan tanpa aturan atau
+        tanpa CF. Dihitung langsung dari entri sparse tanpa membentuk matriks
+        padat gejala x penyakit.
+        """
+        selected = np.zeros(len(self.penyakit_ids), dtype=bool)
+        selected[penyakit] = True
+        size = len(self.gejala_ids)
+        entry_gejala = np.repeat(np.arange(size), np.diff(self.indptr))
+        keep = selected[self.penyakit_idx]
+        gejala = entry_gejala[keep]
+        values = np.nan_to_num(self.data[keep, column], nan=0.0)
+
+        count = len(penyakit)
+        mean = np.bincount(gejala, weights=values, minlength=size) / count
+        # Penyakit kandidat tanpa entri untuk gejala tersebut bernilai 0
+        missing = count - np.bincount(gejala, minlength=size)
+        squares = np.bincount(
+            gejala, weights=(values - mean[gejala]) ** 2, minlength=size
+        )
+        return np.sqrt((squares + missing * mean**2) / count)
+
+    def evaluate(
+        self, user_cf_map: Mapping[str, float], columns: Iterable[int]
+    ) -> CfMatrixResult:
+        """
+        Menghitung CF gabungan seluruh penyakit untuk beberapa kolom sekaligus.
+
+        Bukti dengan tanda yang sama digabung dengan bentuk tertutup
+        ``1 - prod(1 - cf)`` (positif) dan ``prod(1 + cf) - 1`` (negatif), lalu
+        kedua hasil digabung sekali dengan rumus konflik. Hasilnya sama dengan
+        ``Diagnosis.combine_cf`` yang diterapkan berurutan selama semua bukti
+        untuk satu penyakit bertanda sama; jika tandanya bercampur, hasil ini
+        tidak bergantung pada urutan bukti.
+        """
+        columns = list(columns)
+        slices = [
+            np.arange(self.indptr[i], self.indptr[i + 1])
+            for i in map(self.gejala_index.get, user_cf_map)
+            if i is not None
+        ]
+        user_cf = [
+            cf
+            for gejala_id, cf in user_cf_map.items()
+            if gejala_id in self.gejala_index
+        ]
+        if not slices:
+            empty = np.empty((0, len(columns)))
+            return CfMatrixResult(penyakit_ids=(), cf=empty, matched=empty)
+
+        entries = np.concatenate(slices)
+        entry_user_cf = np.repeat(user_cf, [len(s) for s in slices])
+        data = self.data[np.ix_(entries, columns)]
+        used = ~np.isnan(data)
+        evidence = np.where(used, data * entry_user_cf[:, None], 0.0)
+
+        touched, local_idx = np.unique(
+            self.penyakit_idx[entries], return_inverse=True
+        )
+        shape = (len(touched), len(columns))
+        positive = np.ones(shape)
+        negative = np.ones(shape)
+        matched = np.zeros(shape, dtype=np.intp)
+        np.multiply.at(
+            positive, local_idx, np.where(evidence > 0, 1 - evidence, 1.0)
+        )
+        np.multiply.at(
+            negative, local_idx, np.where(evidence < 0, 1 + evidence, 1.0)
+        )
+        np.add.at(matched, local_idx, used)
+
+        cf_positive = 1 - positive
+        cf_negative = negative - 1
+        denominator = 1 - np.minimum(cf_positive, -cf_negative)
+        conflict = denominator == 0
+        cf = np.where(
+            conflict,
+            0.0,
+            (cf_positive + cf_negative) / np.where(conflict, 1.0, denominator),
+        )
+        return CfMatrixResult(
+            penyakit_ids=tuple(self.penyakit_ids[i] for i in touched),
+            cf=cf,
+            matched=matched,
+        )
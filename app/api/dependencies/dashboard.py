@@ -0,0 +1,93 @@
+from sqlalchemy import ScalarSelect, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.base import Base, async_session_maker
+from app.db.models.gejala import Gejala
+from app.db.models.kelompok import Kelompok
+from app.db.models.pakar import Pakar
+from app.db.models.penyakit import Penyakit
+from app.db.models.rule import Rule
+from app.db.models.rule_cf import RuleCf
+from app.schemas.other import PakarCfCoverage, PenyakitRuleCount, SystemStats
+from app.utils.cache import LRUCache
+
+_CACHE_KEY = "system_stats"
+
+dashboard_stats_cache: LRUCache[str, SystemStats] = LRUCache(
+    max_size=1 if settings.DASHBOARD_STATS_TTL > 0 else 0,
+    ttl=settings.DASHBOARD_STATS_TTL,
+)
+
+
+def invalidate_dashboard_stats() -> None:
+    """Dipanggil manager setelah menulis data yang dihitung di dashboard."""
+    dashboard_stats_cache.clear()
+
+
+def _count(model: type[Base]) -> ScalarSelect[int]:
+    return select(func.count()).select_from(model).scalar_subquery()
+
+
+async def build_system_stats(session: AsyncSession) -> SystemStats:
+    """
+    Menghitung statistik dengan tiga query: seluruh total dalam satu SELECT
+    (scalar subquery), lalu satu GROUP BY untuk aturan per penyakit dan satu
+    GROUP BY untuk cakupan CF per pakar.
+    """
+    totals = (
+        await session.execute(
+            select(
+                _count(Penyakit).label("total_penyakit"),
+                _count(Gejala).label("total_gejala"),
+                _count(Pakar).label("total_pakar"),
+                _count(Kelompok).label("total_kelompok_gejala"),
+                _count(Rule).label("total_rules"),
+            )
+        )
+    ).one()
+
+    rules_per_penyakit = await session.execute(
+        select(Penyakit.id, Penyakit.nama, func.count(Rule.id))
+        .outerjoin(Rule, Rule.id_penyakit == Penyakit.id)
+        .group_by(Penyakit.id, Penyakit.nama)
+        .order_by(Penyakit.id)
+    )
+    cf_per_pakar = await session.execute(
+        select(Pakar.id, Pakar.nama, func.count(RuleCf.id_rule))
+        .outerjoin(RuleCf, RuleCf.id_pakar == Pakar.id)
+        .group_by(Pakar.id, Pakar.nama)
+        .order_by(Pakar.id)
+    )
+
+    total_rules = totals.total_rules
+    return SystemStats(
+        **totals._asdict(),
+        rules_per_penyakit=[
+            PenyakitRuleCount(id=id_, nama=nama, total_rules=count)
+            for id_, nama, count in rules_per_penyakit
+        ],
+        cf_coverage_per_pakar=[
+            PakarCfCoverage(
+                id=id_,
+                nama=nama,
+                total_cf=count,
+                coverage=count / total_rules if total_rules else 0.0,
+            )
+            for id_, nama, count in cf_per_pakar
+        ],
+    )
+
+
+async def get_system_stats() -> SystemStats:
+    """
+    Statistik dari cache, atau dihitung dari database utama. Replika baca yang
+    tertinggal tidak dipakai: hasilnya akan disajikan ke semua klien (termasuk
+    yang baru menulis) sampai TTL habis.
+    """
+    stats = dashboard_stats_cache.get(_CACHE_KEY)
+    if stats is None:
+        async with async_session_maker() as session:
+            stats = await build_system_stats(session)
+        dashboard_stats_cache.set(_CACHE_KEY, stats)
+    return stats
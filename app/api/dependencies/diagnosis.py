@@ -1,40 +1,74 @@
+import heapq
 import logging
 from collections import defaultdict
-from typing import Optional, Sequence
-
-from fastapi import APIRouter
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
-
-from app.db.models.penyakit import Penyakit as PenyakitModel
-from app.db.models.rule import Rule
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Any, Iterable, Mapping, NamedTuple, Optional
+
+import numpy as np
+from fastapi import APIRouter, status
+from pydantic import ValidationError
+
+from app.api.dependencies.knowledge_base import (
+    CompiledRule,
+    KnowledgeBase,
+    knowledge_base,
+)
+from app.core.config import settings
+from app.middleware.pagination import request_object
 from app.schemas.diagnosis import (
+    DiagnosisBatchItem,
+    DiagnosisBatchRequest,
+    DiagnosisBatchResult,
+    DiagnosisConsensusResult,
+    DiagnosisOptions,
     DiagnosisRequest,
     DiagnosisResult,
+    DiagnosisSummaryResult,
     EvidenceDetail,
+    NextQuestion,
+    NextQuestionRequest,
+    NextQuestionResult,
+    PakarScore,
+    PenyakitConsensusResult,
     PenyakitResult,
+    PenyakitSummaryResult,
+    UserGejalaInput,
 )
+from app.schemas.gejala import SimpleGejalaRead
 from app.schemas.penyakit import PenyakitRead
+from app.utils.cache import LRUCache
+from app.utils.common import ErrorCode
+from app.utils.exceptions import AppExceptionError, NotValidIDError
 
 logger = logging.getLogger(__name__)
 r = router = APIRouter(tags=["Diagnosis"])
 
+diagnosis_cache: LRUCache[tuple, DiagnosisResult | DiagnosisSummaryResult] = (
+    LRUCache(
+        max_size=settings.DIAGNOSIS_CACHE_SIZE, ttl=settings.DIAGNOSIS_CACHE_TTL
+    )
+)
+
 
-class _PenyakitCalculationDetail(defaultdict):
+class _Evidence(NamedTuple):
+    """Rekaman bukti internal; EvidenceDetail hanya dibentuk untuk respons."""
+
+    gejala: SimpleGejalaRead
+    cf_user: float
+    cf_pakar: float
+    cf_evidence: float
+
+
+@dataclass(slots=True)
+class _PenyakitCalculationDetail:
     """
     Struktur data internal untuk mengakumulasi hasil perhitungan CF per penyakit.
     """
 
-    cf_combined: float
-    evidence: list[EvidenceDetail]
-    penyakit_obj: Optional[PenyakitModel]
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.cf_combined = 0.0
-        self.evidence = []
-        self.penyakit_obj = None
+    cf_combined: float = 0.0
+    evidence: list[_Evidence] = field(default_factory=list)
+    penyakit_obj: Optional[Mapping[str, Any]] = None
 
 
 class Diagnosis:
@@ -73,36 +107,38 @@ class Diagnosis:
         return (cf_old + cf_new) / denominator
 
     @staticmethod
-    async def fetch_relevant_rules(
-        session: AsyncSession, user_gejala_ids: set[str]
-    ) -> Sequence[Rule]:
+    def validate_pakar(kb: KnowledgeBase, pakar_id: str) -> None:
         """
-        Mengambil semua aturan (Rule) yang relevan dengan gejala yang diberikan pengguna.
+        Memastikan pakar terdaftar menggunakan basis pengetahuan, tanpa query ke
+        database.
 
-        Args:
-            session: Sesi database SQLAlchemy AsyncSession.
-            user_gejala_ids: set ID gejala yang dipilih oleh pengguna.
-
-        Returns:
-            Daftar objek Rule yang relevan, dengan relasi penyakit, gejala, dan rule_cfs
-            sudah di-load (eager loading).
+        Raises:
+            NotValidIDError: Jika pakar tidak ditemukan.
         """
-        query = (
-            select(Rule)
-            .where(Rule.id_gejala.in_(user_gejala_ids))
-            .options(
-                joinedload(Rule.penyakit),
-                joinedload(Rule.gejala),
-                joinedload(Rule.rule_cfs),  # Untuk mengakses nilai CF dari pakar
+        if pakar_id not in kb.pakar:
+            raise NotValidIDError(
+                f"Pakar with ID '{pakar_id}' not found.",
+                status_code=status.HTTP_404_NOT_FOUND,
+                error_code=ErrorCode.NOT_VALID_ID_PAKAR,
             )
-        )
-        result = await session.execute(query)
-        return result.scalars().unique().all()
+
+    @staticmethod
+    def rule_cf_pakar(
+        rule: CompiledRule, pakar_id_filter: Optional[str] = None
+    ) -> Optional[float]:
+        """
+        Nilai CF pakar sebuah aturan: CF pakar spesifik jika ``pakar_id_filter``
+        diberikan, atau rata-rata CF seluruh pakar. None jika tidak tersedia.
+        """
+        if pakar_id_filter:  # Diagnosis berdasarkan pakar spesifik
+            return rule.cf_pakar.get(pakar_id_filter)
+        return rule.cf_avg
 
     @staticmethod
     def calculate_diagnosis_cf(
-        rules: list[Rule],
+        rules: list[CompiledRule],
         user_cf_map: dict[str, float],
+        penyakit_map: Mapping[str, Mapping[str, Any]],
         pakar_id_filter: Optional[str] = None,
     ) -> dict[str, _PenyakitCalculationDetail]:
         """
@@ -110,8 +146,10 @@ class Diagnosis:
         dan CF pengguna.
 
         Args:
-            rules: Daftar aturan (Rule) yang relevan.
+            rules: Daftar aturan terkompilasi (CompiledRule) yang relevan.
             user_cf_map: Mapping dari ID gejala ke CF yang diberikan pengguna.
+            penyakit_map: Mapping dari ID penyakit ke data penyakit (dari
+                          KnowledgeBase).
             pakar_id_filter: Jika disediakan, hanya CF dari pakar dengan ID ini yang
                             akan digunakan. Jika None, rata-rata CF dari semua pakar
                             pada aturan tersebut akan digunakan.
@@ -123,32 +161,28 @@ class Diagnosis:
         penyakit_accumulator: dict[str, _PenyakitCalculationDetail] = defaultdict(
             _PenyakitCalculationDetail
         )
+        Diagnosis.fold_rules(
+            penyakit_accumulator, rules, user_cf_map, penyakit_map, pakar_id_filter
+        )
+        return penyakit_accumulator
 
+    @staticmethod
+    def fold_rules(
+        penyakit_accumulator: dict[str, _PenyakitCalculationDetail],
+        rules: Iterable[CompiledRule],
+        user_cf_map: Mapping[str, float],
+        penyakit_map: Mapping[str, Mapping[str, Any]],
+        pakar_id_filter: Optional[str] = None,
+    ) -> None:
+        """
+        Menggabungkan bukti dari ``rules`` ke dalam akumulator per penyakit yang
+        sudah ada (defaultdict). Dipakai oleh calculate_diagnosis_cf dan oleh sesi
+        diagnosis interaktif untuk menambahkan jawaban secara bertahap.
+        """
         for rule in rules:
-            if not rule.gejala:
-                logger.warning(
-                    f"Aturan {rule.id} tidak memiliki objek gejala terkait. Dilewati."
-                )
-                continue
-            if not rule.penyakit or not rule.id_penyakit:
-                logger.warning(
-                    f"Aturan {rule.id} (gejala: {rule.id_gejala}) tidak memiliki penyakit "
-                    f"terkait (id_penyakit: {rule.id_penyakit}). Dilewati."
-                )
-                continue
-
-            penyakit_id: str = rule.id_penyakit  # type: ignore
-
-            cf_pakar_value: Optional[float] = None
-            if pakar_id_filter:  # Diagnosis berdasarkan pakar spesifik
-                pakar_cf_obj = next(
-                    (cf for cf in rule.rule_cfs if cf.id_pakar == pakar_id_filter), None
-                )
-                if pakar_cf_obj:
-                    cf_pakar_value = pakar_cf_obj.nilai
-            elif rule.rule_cfs:  # Memastikan ada CF dari pakar
-                cf_pakar_value = sum(cf.nilai for cf in rule.rule_cfs) / len(rule.rule_cfs)
+            penyakit_id = rule.id_penyakit
 
+            cf_pakar_value = Diagnosis.rule_cf_pakar(rule, pakar_id_filter)
             if cf_pakar_value is None:
                 logger.debug(
                     f"Tidak ada nilai CF pakar untuk aturan {rule.id} "
@@ -162,54 +196,101 @@ class Diagnosis:
 
             current_data = penyakit_accumulator[penyakit_id]
             current_data.cf_combined = Diagnosis.combine_cf(current_data.cf_combined, cf_he)
-            current_data.penyakit_obj = rule.penyakit
-
-            evidence = EvidenceDetail(
-                gejala=rule.gejala,  # type: ignore
-                cf_user=cf_user,
-                # Meskipun fieldnya cf_pakar_avg, ini akan berisi cf_pakar_value
-                # yang bisa jadi nilai spesifik pakar atau rata-rata.
-                cf_pakar_avg=round(cf_pakar_value, 4),
-                cf_evidence=round(cf_he, 4),
+            if current_data.penyakit_obj is None:
+                current_data.penyakit_obj = penyakit_map.get(penyakit_id)
+
+            current_data.evidence.append(
+                _Evidence(rule.gejala, cf_user, cf_pakar_value, cf_he)
+            )
+
+    @staticmethod
+    def calculate_diagnosis_cf_vectorized(
+        kb: KnowledgeBase,
+        user_cf_map: dict[str, float],
+        pakar_id_filter: Optional[str] = None,
+    ) -> dict[str, _PenyakitCalculationDetail]:
+        """
+        Versi vektor (NumPy) dari calculate_diagnosis_cf. CF gabungan seluruh
+        penyakit dihitung dalam satu evaluasi CfMatrix; calculate_diagnosis_cf
+        tetap menjadi implementasi referensi.
+
+        Rincian bukti hanya dibentuk untuk penyakit dengan CF gabungan positif,
+        karena hanya penyakit tersebut yang masuk ke hasil diagnosis.
+
+        Args:
+            kb: KnowledgeBase yang aktif.
+            user_cf_map: Mapping dari ID gejala ke CF yang diberikan pengguna.
+            pakar_id_filter: Jika disediakan, gunakan kolom CF pakar ini. Jika
+                            None, gunakan kolom rata-rata CF pakar.
+
+        Returns:
+            Kamus yang memetakan ID penyakit ke detail perhitungan CF
+            (_PenyakitCalculationDetail).
+        """
+        column = kb.cf_matrix.column(pakar_id_filter)
+        result = kb.cf_matrix.evaluate(user_cf_map, columns=[column])
+
+        penyakit_accumulator: dict[str, _PenyakitCalculationDetail] = {}
+        for penyakit_id, cf_combined, matched in zip(
+            result.penyakit_ids, result.cf[:, 0], result.matched[:, 0], strict=True
+        ):
+            if not matched:
+                continue
+            penyakit_accumulator[penyakit_id] = _PenyakitCalculationDetail(
+                cf_combined=float(cf_combined),
+                penyakit_obj=kb.penyakit.get(penyakit_id),
+            )
+
+        for rule in kb.rules_for(user_cf_map):
+            current_data = penyakit_accumulator.get(rule.id_penyakit)
+            if current_data is None or current_data.cf_combined <= 0:
+                continue
+            cf_pakar_value = Diagnosis.rule_cf_pakar(rule, pakar_id_filter)
+            if cf_pakar_value is None:
+                continue
+
+            cf_user = user_cf_map[rule.id_gejala]
+            cf_he = cf_pakar_value * cf_user
+            current_data.evidence.append(
+                _Evidence(rule.gejala, cf_user, cf_pakar_value, cf_he)
             )
-            current_data.evidence.append(evidence)
 
         return penyakit_accumulator
 
     @staticmethod
     def format_diagnosis_results(
         penyakit_data_map: dict[str, _PenyakitCalculationDetail],
-    ) -> DiagnosisResult:
+        options: Optional[DiagnosisOptions] = None,
+    ) -> DiagnosisResult | DiagnosisSummaryResult:
         """
         Memformat hasil perhitungan CF menjadi struktur DiagnosisResult.
 
+        Penyakit dipilih lebih dulu (CF > 0, ``min_score``, lalu ``top_k`` dengan
+        heap), sehingga model hanya dibentuk untuk penyakit yang dikembalikan.
+
         Args:
             penyakit_data_map: Kamus hasil dari _calculate_diagnosis_cf.
+            options: Opsi top_k, min_score dan detail. Default: semua penyakit
+                     dengan data lengkap.
 
         Returns:
-            Objek DiagnosisResult yang berisi daftar penyakit terurut berdasarkan skor
-            keyakinan.
+            Objek DiagnosisResult (atau DiagnosisSummaryResult untuk
+            ``detail="summary"``) yang berisi daftar penyakit terurut berdasarkan
+            skor keyakinan.
         """
-        results: list[PenyakitResult] = []
+        options = options or DiagnosisOptions()
+
+        candidates: list[tuple[float, _PenyakitCalculationDetail]] = []
         for penyakit_id, data in penyakit_data_map.items():
             if data.cf_combined > 0 and data.penyakit_obj:
-                # Pastikan penyakit_obj adalah instance dari skema PenyakitRead jika
-                # diperlukan Untuk sekarang, kita asumsikan struktur PenyakitModel
-                # kompatibel atau akan dikonversi oleh FastAPI.
-                penyakit_read_obj = PenyakitRead.model_validate(data.penyakit_obj)
-
-                results.append(
-                    PenyakitResult(
-                        penyakit=penyakit_read_obj,  # type: ignore
-                        certainty_score=round(data.cf_combined * 100, 2),
-                        matching_gejala_count=len(data.evidence),
-                        matching_gejala_ids=[ev.gejala.id for ev in data.evidence],
-                        evidence_details=data.evidence,
-                    )
-                )
+                certainty_score = round(data.cf_combined * 100, 2)
+                if certainty_score >= options.min_score:
+                    candidates.append((certainty_score, data))
             elif data.cf_combined <= 0:
                 penyakit_name = (
-                    data.penyakit_obj.nama if data.penyakit_obj else f"ID {penyakit_id}"
+                    data.penyakit_obj["nama"]
+                    if data.penyakit_obj
+                    else f"ID {penyakit_id}"
                 )
                 logger.debug(
                     f"Penyakit '{penyakit_name}' memiliki CF gabungan <= 0 "
@@ -222,18 +303,343 @@ class Diagnosis:
                     "Tidak dimasukkan dalam hasil."
                 )
 
-        # Urutkan hasil berdasarkan certainty_score tertinggi
-        ranked_results = sorted(results, key=lambda p: p.certainty_score, reverse=True)
-        return DiagnosisResult(ranked_results=ranked_results)
+        # Urutkan berdasarkan certainty_score tertinggi (stabil untuk skor sama)
+        if options.top_k is not None:
+            selected = heapq.nlargest(options.top_k, candidates, key=itemgetter(0))
+        else:
+            selected = sorted(candidates, key=itemgetter(0), reverse=True)
+
+        if options.detail == "summary":
+            return DiagnosisSummaryResult(
+                ranked_results=[
+                    PenyakitSummaryResult(
+                        id=data.penyakit_obj["id"],
+                        nama=data.penyakit_obj["nama"],
+                        certainty_score=certainty_score,
+                        matching_gejala_count=len(data.evidence),
+                    )
+                    for certainty_score, data in selected
+                ]
+            )
+
+        # penyakit_obj adalah snapshot kolom dari KnowledgeBase; validasi dilakukan
+        # di sini karena image_url bergantung pada request.
+        return DiagnosisResult(
+            ranked_results=[
+                PenyakitResult(
+                    penyakit=PenyakitRead.model_validate(data.penyakit_obj),
+                    certainty_score=certainty_score,
+                    matching_gejala_count=len(data.evidence),
+                    matching_gejala_ids=[ev.gejala.id for ev in data.evidence],
+                    evidence_details=[
+                        EvidenceDetail(
+                            gejala=ev.gejala,
+                            cf_user=ev.cf_user,
+                            # Meskipun fieldnya cf_pakar_avg, ini berisi CF pakar
+                            # spesifik atau rata-rata sesuai mode diagnosis.
+                            cf_pakar_avg=round(ev.cf_pakar, 4),
+                            cf_evidence=round(ev.cf_evidence, 4),
+                        )
+                        for ev in data.evidence
+                    ],
+                )
+                for certainty_score, data in selected
+            ]
+        )
 
     @staticmethod
     async def diagnosis(
-        session: AsyncSession, request: DiagnosisRequest, pakar_id: str | None = None
-    ):
-        user_gejala_ids = {g.id_gejala for g in request.gejala_user}
+        request: DiagnosisRequest,
+        pakar_id: str | None = None,
+        options: Optional[DiagnosisOptions] = None,
+    ) -> DiagnosisResult | DiagnosisSummaryResult:
+        """
+        Menjalankan diagnosis menggunakan KnowledgeBase yang sudah dikompilasi.
+
+        Database hanya disentuh jika KnowledgeBase perlu dibangun ulang.
+        """
+        kb = await knowledge_base.get()
+        if pakar_id is not None:
+            Diagnosis.validate_pakar(kb, pakar_id)
+
+        return Diagnosis.evaluate_cached(kb, request, pakar_id, options)
+
+    @staticmethod
+    def canonical_gejala(request: DiagnosisRequest) -> tuple[tuple[str, float], ...]:
+        """
+        Bentuk kanonik gejala pengguna: pasangan ``(id_gejala, cf_user)`` unik yang
+        diurutkan berdasarkan ID. Jika gejala diberikan lebih dari sekali, nilai
+        terakhir yang dipakai (sama seperti perhitungan diagnosis).
+        """
         user_cf_map = {g.id_gejala: g.cf_user for g in request.gejala_user}
+        return tuple(sorted(user_cf_map.items()))
+
+    @staticmethod
+    def evaluate_cached(
+        kb: KnowledgeBase,
+        request: DiagnosisRequest,
+        pakar_id: str | None = None,
+        options: Optional[DiagnosisOptions] = None,
+    ) -> DiagnosisResult | DiagnosisSummaryResult:
+        """
+        Sama seperti ``evaluate``, tetapi hasil disimpan di ``diagnosis_cache``.
+
+        Kasus selalu dievaluasi dalam bentuk kanonik, sehingga hasil dari cache
+        identik dengan hasil perhitungan ulang. Versi dan waktu pembangunan
+        KnowledgeBase menjadi bagian dari kunci: setiap perubahan data oleh
+        manager (atau pembangunan ulang karena umur) otomatis membuat entri lama
+        tidak terpakai. Base URL request ikut disertakan karena ``image_url``
+        penyakit bergantung padanya, begitu juga opsi hasil.
+        """
+        options = options or DiagnosisOptions()
+        gejala = Diagnosis.canonical_gejala(request)
+        http_request = request_object.get(None)
+        key = (
+            kb.version,
+            kb.built_at,
+            pakar_id,
+            gejala,
+            str(http_request.base_url) if http_request is not None else None,
+            options.top_k,
+            options.min_score,
+            options.detail,
+        )
+
+        cached = diagnosis_cache.get(key)
+        if cached is not None:
+            return cached
+
+        canonical_request = DiagnosisRequest(
+            gejala_user=[
+                UserGejalaInput(id_gejala=id_gejala, cf_user=cf_user)
+                for id_gejala, cf_user in gejala
+            ]
+        )
+        result = Diagnosis.evaluate(kb, canonical_request, pakar_id, options)
+        diagnosis_cache.set(key, result)
+        return result
+
+    @staticmethod
+    async def diagnosis_batch(batch: DiagnosisBatchRequest) -> DiagnosisBatchResult:
+        """
+        Menjalankan diagnosis untuk banyak kasus terhadap KnowledgeBase yang sama.
 
-        if not user_gejala_ids:
+        Setiap kasus divalidasi dan dievaluasi secara terpisah, sehingga kasus yang
+        gagal hanya menghasilkan error pada item tersebut tanpa menggagalkan batch.
+        """
+        kb = await knowledge_base.get()
+        if batch.id_pakar is not None:
+            Diagnosis.validate_pakar(kb, batch.id_pakar)
+
+        items: list[DiagnosisBatchItem] = []
+        for index, case in enumerate(batch.cases):
+            try:
+                request = DiagnosisRequest.model_validate(case)
+                result = Diagnosis.evaluate_cached(
+                    kb, request, batch.id_pakar, batch.options
+                )
+            except ValidationError as e:
+                items.append(
+                    DiagnosisBatchItem(
+                        index=index,
+                        error_code=ErrorCode.VALIDATION_ERROR,
+                        messages=[
+                            f"{'.'.join(map(str, err['loc']))}: {err['msg']}"
+                            for err in e.errors()
+                        ],
+                    )
+                )
+            except AppExceptionError as e:
+                items.append(
+                    DiagnosisBatchItem(
+                        index=index,
+                        error_code=str(e.error_code),
+                        messages=e.messages,
+                    )
+                )
+            except ValueError as e:
+                items.append(
+                    DiagnosisBatchItem(
+                        index=index,
+                        error_code=ErrorCode.APP_ERROR,
+                        messages=[str(e)],
+                    )
+                )
+            else:
+                items.append(DiagnosisBatchItem(index=index, result=result))
+
+        total_failed = sum(1 for item in items if item.result is None)
+        logger.info(
+            f"Diagnosis batch selesai: {len(items)} kasus, {total_failed} gagal."
+        )
+        return DiagnosisBatchResult(
+            results=items,
+            total_success=len(items) - total_failed,
+            total_failed=total_failed,
+        )
+
+    @staticmethod
+    async def consensus(request: DiagnosisRequest) -> DiagnosisConsensusResult:
+        """Menjalankan diagnosis konsensus seluruh pakar terhadap KnowledgeBase."""
+        kb = await knowledge_base.get()
+        return Diagnosis.evaluate_consensus(kb, request)
+
+    @staticmethod
+    def evaluate_consensus(
+        kb: KnowledgeBase, request: DiagnosisRequest
+    ) -> DiagnosisConsensusResult:
+        """
+        Menghitung skor setiap pakar dan skor rata-rata pakar untuk seluruh
+        penyakit dalam satu evaluasi CfMatrix atas semua kolom, beserta statistik
+        perbedaan pendapat antar pakar.
+
+        Penyakit dimasukkan jika minimal satu pakar (atau rata-rata pakar) memberi
+        skor positif. Statistik hanya dihitung dari pakar yang memiliki CF untuk
+        gejala yang cocok.
+        """
+        user_cf_map = {g.id_gejala: g.cf_user for g in request.gejala_user}
+        matrix = kb.cf_matrix
+        avg_column = matrix.column(None)
+        result = matrix.evaluate(user_cf_map, columns=range(avg_column + 1))
+
+        ranked_results: list[PenyakitConsensusResult] = []
+        for row, penyakit_id in enumerate(result.penyakit_ids):
+            cf_row, matched_row = result.cf[row], result.matched[row]
+            penyakit_obj = kb.penyakit.get(penyakit_id)
+            if penyakit_obj is None or not (cf_row[matched_row > 0] > 0).any():
+                continue
+
+            pakar_scores = [
+                PakarScore(
+                    id_pakar=pakar_id,
+                    nama=kb.pakar[pakar_id],
+                    certainty_score=(
+                        round(float(cf_row[i]) * 100, 2) if matched_row[i] else None
+                    ),
+                    matching_gejala_count=int(matched_row[i]),
+                )
+                for i, pakar_id in enumerate(matrix.pakar_ids)
+            ]
+            scores = cf_row[:avg_column][matched_row[:avg_column] > 0] * 100
+            mean_score = spread = score_range = None
+            if scores.size:
+                mean_score = round(float(scores.mean()), 2)
+                spread = round(float(scores.std()), 2)
+                score_range = round(float(scores.max() - scores.min()), 2)
+
+            ranked_results.append(
+                PenyakitConsensusResult(
+                    penyakit=PenyakitRead.model_validate(penyakit_obj),
+                    certainty_score=round(float(cf_row[avg_column]) * 100, 2),
+                    pakar_scores=pakar_scores,
+                    mean_score=mean_score,
+                    spread=spread,
+                    score_range=score_range,
+                )
+            )
+
+        ranked_results.sort(key=lambda p: p.certainty_score, reverse=True)
+        logger.info(
+            f"Diagnosis konsensus {len(matrix.pakar_ids)} pakar selesai. "
+            f"Ditemukan {len(ranked_results)} penyakit potensial."
+        )
+        return DiagnosisConsensusResult(ranked_results=ranked_results)
+
+    @staticmethod
+    async def next_questions(request: NextQuestionRequest) -> NextQuestionResult:
+        """Menyarankan gejala berikutnya berdasarkan KnowledgeBase yang aktif."""
+        kb = await knowledge_base.get()
+        if request.id_pakar is not None:
+            Diagnosis.validate_pakar(kb, request.id_pakar)
+
+        return Diagnosis.evaluate_next_questions(
+            kb,
+            {g.id_gejala: g.cf_user for g in request.gejala_user},
+            pakar_id=request.id_pakar,
+            limit=request.limit,
+            top_penyakit=request.top_penyakit,
+        )
+
+    @staticmethod
+    def evaluate_next_questions(
+        kb: KnowledgeBase,
+        user_cf_map: Mapping[str, float],
+        pakar_id: str | None = None,
+        limit: int = 3,
+        top_penyakit: int = 5,
+    ) -> NextQuestionResult:
+        """
+        Memilih gejala yang belum dijawab yang paling membedakan penyakit kandidat.
+
+        Penyakit kandidat adalah ``top_penyakit`` penyakit dengan CF gabungan
+        positif tertinggi dari jawaban saat ini (atau seluruh penyakit jika belum
+        ada yang positif). Daya pembeda sebuah gejala adalah simpangan baku CF
+        pakarnya terhadap penyakit kandidat, dihitung dari entri sparse CfMatrix
+        untuk semua gejala sekaligus.
+        """
+        matrix = kb.cf_matrix
+        column = matrix.column(pakar_id)
+        if not matrix.gejala_ids:
+            return NextQuestionResult(questions=[])
+
+        result = matrix.evaluate(user_cf_map, columns=[column])
+        scores = result.cf[:, 0]
+        positive = np.flatnonzero((scores > 0) & (result.matched[:, 0] > 0))
+        if positive.size:
+            ranked = positive[np.argsort(-scores[positive], kind="stable")]
+            candidate_ids = [result.penyakit_ids[i] for i in ranked[:top_penyakit]]
+            # Jika hanya satu penyakit positif, bandingkan dengan penyakit lain
+            # agar simpangan baku tetap bermakna.
+            if len(candidate_ids) < 2:
+                candidate_ids += [
+                    p for p in matrix.penyakit_ids if p not in candidate_ids
+                ][: top_penyakit - len(candidate_ids)]
+        else:
+            candidate_ids = list(matrix.penyakit_ids)
+
+        penyakit_position = {p: i for i, p in enumerate(matrix.penyakit_ids)}
+        candidates = [penyakit_position[p] for p in candidate_ids]
+        # Dibulatkan seperti skor pada hasil: gejala dengan skor sama diurutkan
+        # menurut urutan gejala, bukan menurut selisih pembulatan floating point
+        separation = np.round(matrix.separation(column, candidates), 4)
+
+        answered = [
+            matrix.gejala_index[g] for g in user_cf_map if g in matrix.gejala_index
+        ]
+        separation[answered] = 0.0
+
+        count = min(limit, int(np.count_nonzero(separation > 0)))
+        if count == 0:
+            return NextQuestionResult(
+                questions=[], candidate_penyakit_ids=candidate_ids
+            )
+        top = np.argsort(-separation, kind="stable")[:count]
+
+        return NextQuestionResult(
+            questions=[
+                NextQuestion(
+                    gejala=kb.gejala[matrix.gejala_ids[i]],
+                    score=float(separation[i]),
+                )
+                for i in top
+            ],
+            candidate_penyakit_ids=candidate_ids,
+        )
+
+    @staticmethod
+    def evaluate(
+        kb: KnowledgeBase,
+        request: DiagnosisRequest,
+        pakar_id: str | None = None,
+        options: Optional[DiagnosisOptions] = None,
+    ) -> DiagnosisResult | DiagnosisSummaryResult:
+        """
+        Mengevaluasi satu kasus diagnosis terhadap KnowledgeBase yang diberikan.
+        Pakar diasumsikan sudah divalidasi oleh pemanggil.
+        """
+        user_cf_map = {g.id_gejala: g.cf_user for g in request.gejala_user}
+
+        if not user_cf_map:
             # Logger Only
             if pakar_id is None:
                 logger.info("Tidak ada gejala yang diberikan untuk diagnosis.")
@@ -242,9 +648,9 @@ class Diagnosis:
                     "Tidak ada gejala yang diberikan untuk diagnosis oleh pakar "
                     f"{pakar_id}."
                 )
-            return DiagnosisResult(ranked_results=[])
+            return Diagnosis.format_diagnosis_results({}, options)
 
-        relevant_rules = await Diagnosis.fetch_relevant_rules(session, user_gejala_ids)
+        relevant_rules = kb.rules_for(user_cf_map)
         if not relevant_rules:
             if pakar_id is None:
                 logger.info(
@@ -255,13 +661,23 @@ class Diagnosis:
                     "Tidak ada aturan relevan untuk gejala yang diberikan "
                     f"(pakar: {pakar_id})."
                 )
-            return DiagnosisResult(ranked_results=[])
+            return Diagnosis.format_diagnosis_results({}, options)
 
-        penyakit_cf_data = Diagnosis.calculate_diagnosis_cf(
-            rules=list(relevant_rules), user_cf_map=user_cf_map, pakar_id_filter=pakar_id
-        )
+        if settings.DIAGNOSIS_ENGINE == "vectorized":
+            penyakit_cf_data = Diagnosis.calculate_diagnosis_cf_vectorized(
+                kb=kb, user_cf_map=user_cf_map, pakar_id_filter=pakar_id
+            )
+        else:
+            penyakit_cf_data = Diagnosis.calculate_diagnosis_cf(
+                rules=relevant_rules,
+                user_cf_map=user_cf_map,
+                penyakit_map=kb.penyakit,
+                pakar_id_filter=pakar_id,
+            )
 
-        diagnosis_result = Diagnosis.format_diagnosis_results(penyakit_cf_data)
+        diagnosis_result = Diagnosis.format_diagnosis_results(
+            penyakit_cf_data, options
+        )
 
         if pakar_id is None:
             logger.info(
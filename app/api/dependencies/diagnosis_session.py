@@ -0,0 +1,204 @@
+import contextlib
+import logging
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Optional
+
+from fastapi import WebSocket, status
+
+from app.api.dependencies.diagnosis import Diagnosis, _PenyakitCalculationDetail
+from app.api.dependencies.knowledge_base import KnowledgeBase, knowledge_base
+from app.core.config import settings
+from app.schemas.diagnosis import (
+    DiagnosisSessionRead,
+    NextQuestionResult,
+    UserGejalaInput,
+)
+from app.utils.cache import LRUCache
+from app.utils.common import ErrorCode
+from app.utils.exceptions import AppExceptionError
+
+logger = logging.getLogger(__name__)
+
+
+def _new_accumulator() -> dict[str, _PenyakitCalculationDetail]:
+    return defaultdict(_PenyakitCalculationDetail)
+
+
+@dataclass(slots=True)
+class DiagnosisSession:
+    """
+    Sesi diagnosis interaktif. Akumulator CF per penyakit disimpan sehingga setiap
+    jawaban baru cukup digabungkan dengan aturan milik gejala tersebut.
+    """
+
+    id: str
+    id_pakar: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+    answers: dict[str, float] = field(default_factory=dict)
+    accumulator: dict[str, _PenyakitCalculationDetail] = field(
+        default_factory=_new_accumulator
+    )
+    kb_key: Optional[tuple[int, datetime]] = None
+    subscribers: set[WebSocket] = field(default_factory=set)
+    # Payload JSON terakhir yang dibentuk dalam konteks request HTTP (image_url
+    # penyakit bergantung pada base URL request), dikirim ke WebSocket baru.
+    last_payload: Optional[dict] = None
+
+    def sync(self, kb: KnowledgeBase) -> None:
+        """Menghitung ulang akumulator jika KnowledgeBase sudah berganti."""
+        if self.kb_key != (kb.version, kb.built_at):
+            self.recompute(kb)
+
+    def recompute(self, kb: KnowledgeBase) -> None:
+        """Menghitung ulang akumulator dari seluruh jawaban sesuai urutannya."""
+        self.accumulator = Diagnosis.calculate_diagnosis_cf(
+            rules=kb.rules_for(self.answers),
+            user_cf_map=self.answers,
+            penyakit_map=kb.penyakit,
+            pakar_id_filter=self.id_pakar,
+        )
+        self.kb_key = (kb.version, kb.built_at)
+
+    def answer(self, kb: KnowledgeBase, gejala: UserGejalaInput) -> None:
+        """
+        Menambahkan jawaban. Jawaban baru digabungkan secara bertahap; jawaban
+        yang merevisi gejala yang sudah dijawab memicu perhitungan ulang karena
+        kombinasi CF tidak dapat dibatalkan.
+        """
+        self.sync(kb)
+        revised = gejala.id_gejala in self.answers
+        self.answers[gejala.id_gejala] = gejala.cf_user
+        if revised:
+            self.recompute(kb)
+        else:
+            Diagnosis.fold_rules(
+                self.accumulator,
+                kb.rules_by_gejala.get(gejala.id_gejala, ()),
+                self.answers,
+                kb.penyakit,
+                self.id_pakar,
+            )
+        self.updated_at = datetime.now(UTC)
+
+    def read(self) -> DiagnosisSessionRead:
+        session_read = DiagnosisSessionRead(
+            id=self.id,
+            id_pakar=self.id_pakar,
+            answers=[
+                UserGejalaInput(id_gejala=id_gejala, cf_user=cf_user)
+                for id_gejala, cf_user in self.answers.items()
+            ],
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            result=Diagnosis.format_diagnosis_results(self.accumulator),
+        )
+        self.last_payload = session_read.model_dump(mode="json")
+        return session_read
+
+
+class DiagnosisSessionStore:
+    """
+    Penyimpanan sesi diagnosis di memori proses. Jumlah sesi dibatasi (sesi yang
+    paling lama tidak dipakai dibuang lebih dulu) dan sesi yang tidak aktif
+    melebihi ``idle_timeout`` detik dihapus.
+    """
+
+    def __init__(self, max_sessions: int, idle_timeout: int):
+        self._sessions: LRUCache[str, DiagnosisSession] = LRUCache(
+            max_size=max_sessions, ttl=idle_timeout, sliding=True
+        )
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    async def create(self, id_pakar: Optional[str] = None) -> DiagnosisSession:
+        kb = await knowledge_base.get()
+        if id_pakar is not None:
+            Diagnosis.validate_pakar(kb, id_pakar)
+
+        now = datetime.now(UTC)
+        diagnosis_session = DiagnosisSession(
+            id=uuid.uuid4().hex, id_pakar=id_pakar, created_at=now, updated_at=now
+        )
+        diagnosis_session.recompute(kb)
+        self._sessions.set(diagnosis_session.id, diagnosis_session)
+        logger.info(f"Sesi diagnosis {diagnosis_session.id} dibuat.")
+        return diagnosis_session
+
+    def get_or_fail(self, session_id: str) -> DiagnosisSession:
+        diagnosis_session = self._sessions.get(session_id)
+        if diagnosis_session is None:
+            raise AppExceptionError(
+                f"Sesi diagnosis '{session_id}' tidak ditemukan atau sudah "
+                "berakhir.",
+                error_code=ErrorCode.DIAGNOSIS_SESSION_NOT_FOUND,
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+        return diagnosis_session
+
+    async def get(self, session_id: str) -> DiagnosisSession:
+        diagnosis_session = self.get_or_fail(session_id)
+        diagnosis_session.sync(await knowledge_base.get())
+        return diagnosis_session
+
+    async def next_questions(
+        self, session_id: str, limit: int, top_penyakit: int
+    ) -> NextQuestionResult:
+        diagnosis_session = self.get_or_fail(session_id)
+        kb = await knowledge_base.get()
+        return Diagnosis.evaluate_next_questions(
+            kb,
+            diagnosis_session.answers,
+            pakar_id=diagnosis_session.id_pakar,
+            limit=limit,
+            top_penyakit=top_penyakit,
+        )
+
+    async def answer(
+        self, session_id: str, gejala: UserGejalaInput
+    ) -> DiagnosisSessionRead:
+        diagnosis_session = self.get_or_fail(session_id)
+        kb = await knowledge_base.get()
+        if gejala.id_gejala not in kb.gejala:
+            raise AppExceptionError(
+                f"Gejala with ID '{gejala.id_gejala}' not found.",
+                error_code=ErrorCode.GEJALA_NOT_FOUND,
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        diagnosis_session.answer(kb, gejala)
+        session_read = diagnosis_session.read()
+        await self.publish(diagnosis_session)
+        return session_read
+
+    async def publish(self, diagnosis_session: DiagnosisSession) -> None:
+        """Mengirim peringkat terbaru ke semua WebSocket yang berlangganan."""
+        payload = diagnosis_session.last_payload
+        for websocket in list(diagnosis_session.subscribers):
+            try:
+                await websocket.send_json(payload)
+            except Exception:
+                logger.debug(
+                    f"Gagal mengirim ke WebSocket sesi {diagnosis_session.id}. "
+                    "Langganan dihapus."
+                )
+                diagnosis_session.subscribers.discard(websocket)
+
+    async def close(self, session_id: str) -> None:
+        diagnosis_session = self.get_or_fail(session_id)
+        self._sessions.pop(session_id)
+        for websocket in list(diagnosis_session.subscribers):
+            with contextlib.suppress(Exception):
+                await websocket.close()
+        diagnosis_session.subscribers.clear()
+        logger.info(f"Sesi diagnosis {diagnosis_session.id} ditutup.")
+
+
+diagnosis_sessions = DiagnosisSessionStore(
+    max_sessions=settings.DIAGNOSIS_SESSION_MAX,
+    idle_timeout=settings.DIAGNOSIS_SESSION_IDLE_TIMEOUT,
+)
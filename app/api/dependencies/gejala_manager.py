@@ -1,19 +1,25 @@
 import logging
-from typing import Any, Sequence
+from typing import Any
 
 from fastapi import Depends, status
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.dependencies.dashboard import invalidate_dashboard_stats
 from app.api.dependencies.kelompok_gejala_manager import KelompokGejalaManager
 from app.api.dependencies.kelompok_manager import KelompokManager
-from app.api.dependencies.sessions import get_async_session
+from app.api.dependencies.knowledge_base import knowledge_base
+from app.api.dependencies.sessions import (
+    get_async_read_session,
+    get_async_session,
+)
+from app.db import loaders
 from app.db.models.gejala import Gejala
+from app.db.models.kelompok_gejala import KelompokGejala
 from app.schemas.gejala import GejalaCreate, GejalaUpdate
 from app.utils.base_manager import BaseManager
 from app.utils.common import ErrorCode
 from app.utils.exceptions import (
-    DuplicateIDError,
-    DuplicateNamaError,
     NotValidIDError,
 )
 from app.utils.id_healper import IDConfig
@@ -24,6 +30,8 @@ logger = logging.getLogger(__name__)
 class GejalaManager(BaseManager[Gejala, GejalaCreate, GejalaUpdate]):
     """Manager for handling Gejala (Symptom) entities"""
 
+    read_options = loaders.GEJALA_READ
+
     def __init__(self, session: AsyncSession):
         super().__init__(
             session,
@@ -34,6 +42,9 @@ class GejalaManager(BaseManager[Gejala, GejalaCreate, GejalaUpdate]):
         )
         self.kelompok_manager = KelompokManager(session)
         self.kelompok_gejala_manager = KelompokGejalaManager(session)
+        # Kelompok yang disinkronkan saat save: (kelompok baru, kelompok saat
+        # ini atau None jika perlu dibaca)
+        self._kelompok_sync: tuple[set[int], set[int] | None] | None = None
 
     @property
     def error_codes(self):
@@ -44,6 +55,10 @@ class GejalaManager(BaseManager[Gejala, GejalaCreate, GejalaUpdate]):
             "not_valid_id": ErrorCode.NOT_VALID_ID_GEJALA,
         }
 
+    def after_commit(self) -> None:
+        knowledge_base.invalidate()
+        invalidate_dashboard_stats()
+
     async def create(self, input_data: GejalaCreate) -> Gejala:
         logger.info(
             f"Creating new {self._model_name} with data: "
@@ -54,13 +69,10 @@ class GejalaManager(BaseManager[Gejala, GejalaCreate, GejalaUpdate]):
         await self.validate_schema(input_data)
 
         db_item, kelompoks = await self.build(input_data)
-        self.session.add(db_item)
-        await self.save(db_item)
 
-        # Create relasi gejala dengan kelomook
-        await self.kelompok_gejala_manager.bulks(db_item.id, list(kelompoks))
-        await self.session.refresh(db_item)
-        return db_item
+        # Relasi gejala dengan kelompok ditulis dalam transaksi yang sama
+        self._kelompok_sync = (kelompoks, set())
+        return await self.save(db_item)
 
     async def update(self, *, item_id: Any, item_update: GejalaUpdate) -> Gejala:
         db_item = await self.get_by_id_or_fail(item_id)
@@ -72,15 +84,17 @@ class GejalaManager(BaseManager[Gejala, GejalaCreate, GejalaUpdate]):
             await self.kelompok_manager.is_valid_ids(kelompoks)
 
         valid_update_data = await self._validate_update(db_item, update_data)
-        print(update_data)
 
-        db_item = await self._update(db_item, valid_update_data)
         if kelompoks is not None:
-            await self.kelompok_gejala_manager.delete_all(db_item.id)
-            await self.kelompok_gejala_manager.bulks(db_item.id, kelompoks)
+            self._kelompok_sync = (set(kelompoks), None)
+        return await self._update(db_item, valid_update_data)
 
-        await self.session.refresh(db_item)
-        return db_item
+    async def before_save_commit(self, db_item: Gejala) -> None:
+        if self._kelompok_sync is None:
+            return
+        kelompoks, current = self._kelompok_sync
+        self._kelompok_sync = None
+        await self.kelompok_gejala_manager.sync(db_item.id, kelompoks, current)
 
     async def build(self, create_schema: GejalaCreate) -> tuple[Gejala, set[int]]:
         data = create_schema.model_dump(exclude_unset=True)
@@ -88,23 +102,45 @@ class GejalaManager(BaseManager[Gejala, GejalaCreate, GejalaUpdate]):
         return self.model(**data), set(kelompoks)
 
     async def validate_schema(self, item_in: GejalaCreate):
-        gejalas = await self.get_all(limit=200)
-        if item_in.id is None:
-            item_in.id = await self.create_id(gejalas)
+        await self.assign_id(item_in)
 
-        # validasi id
+        # validasi format id; duplikasi id dan nama ditolak oleh constraint
+        # database (lihat BaseManager.map_integrity_error)
         await self.is_valid_id(item_in.id)
 
-        # validasi nama gejala
-        await self.is_valid_nama(gejalas, item_in.nama)
-
         # validasi kelompoks
-        await self.kelompok_manager.is_valid_ids(item_in.kelompoks)
+        if item_in.kelompoks:
+            await self.kelompok_manager.is_valid_ids(item_in.kelompoks)
+
+    async def validate_bulk(self, items_in: list[GejalaCreate]):
+        await self.check_bulk_ids(items_in)
+        await self.check_bulk_unique(items_in, "nama")
+        kelompoks = {kelompok for item in items_in for kelompok in item.kelompoks}
+        if kelompoks:
+            await self.kelompok_manager.is_valid_ids(list(kelompoks))
+        await self.assign_bulk_ids(items_in)
+
+    def bulk_values(self, item_in: GejalaCreate) -> dict[str, Any]:
+        data = item_in.model_dump(exclude_unset=True)
+        data.pop("kelompoks", None)
+        return data
+
+    async def after_bulk_insert(
+        self, items_in: list[GejalaCreate], db_items: list[Gejala]
+    ) -> None:
+        # Relasi gejala dengan kelompok untuk seluruh batch dalam satu insert
+        rows = [
+            {"id_gejala": db_item.id, "id_kelompok": id_kelompok}
+            for item_in, db_item in zip(items_in, db_items, strict=True)
+            for id_kelompok in set(item_in.kelompoks)
+        ]
+        if rows:
+            await self.session.execute(insert(KelompokGejala), rows)
 
     async def is_valid_id(self, data_id: str) -> None:
         """
-        Validates a Gejala ID
-        Raises appropriate exceptions if validation fails
+        Validates the format of a Gejala ID
+        Raises NotValidIDError if validation fails
         """
         is_valid, error_message = self.id_helper.validate_format(data_id)
         if not is_valid:
@@ -115,39 +151,12 @@ class GejalaManager(BaseManager[Gejala, GejalaCreate, GejalaUpdate]):
                 status_code=status.HTTP_406_NOT_ACCEPTABLE,
             )
 
-        # Check for existing ID
-        already_exist = await self.get_by_id(data_id)
-        if already_exist:
-            raise DuplicateIDError(
-                f"ID: {data_id} telah terdaftar",
-                error_code=self.error_codes["duplicate_id"],
-                status_code=status.HTTP_406_NOT_ACCEPTABLE,
-            )
-
-    async def create_id(self, existing_items: Sequence[Gejala]) -> str:
-        """
-        Creates a new unique ID for a Gejala
-        """
-        existing_ids, nums_ids = self.id_helper.extract_numeric_ids(existing_items)
-        return self.id_helper.create_id(existing_ids, nums_ids)
 
-    async def is_valid_nama(self, items: Sequence[Gejala], nama: str) -> None:
-        """
-        Validates a Gejala name is unique
-        Args:
-            items: Existing items to check against
-            nama: Name to validate
-        Raises:
-            DuplicateNamaError: If name already exists
-        """
-        if any(item.nama == nama for item in items):
-            raise DuplicateNamaError(
-                f"Nama: {nama} telah terdaftar",
-                "Gunakan nama yang berbeda",
-                error_code=self.error_codes["duplicate_nama"],
-                status_code=status.HTTP_406_NOT_ACCEPTABLE,
-            )
+async def get_gejala_manager(session: AsyncSession = Depends(get_async_session)):
+    yield GejalaManager(session)
 
 
-async def get_gejala_manager(session: AsyncSession = Depends(get_async_session)):
+async def get_gejala_read_manager(
+    session: AsyncSession = Depends(get_async_read_session),
+):
     yield GejalaManager(session)
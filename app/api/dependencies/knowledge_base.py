@@ -0,0 +1,298 @@
+import asyncio
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.dependencies.cf_matrix import CfMatrix
+from app.core.config import settings
+from app.db.base import async_session_maker
+from app.db.models.gejala import Gejala
+from app.db.models.pakar import Pakar
+from app.db.models.penyakit import Penyakit
+from app.db.models.rule import Rule
+from app.db.models.rule_cf import RuleCf
+from app.db.models.rule_cf_aggregate import RuleCfAggregate
+from app.schemas.gejala import SimpleGejalaRead
+from app.schemas.monitoring import KnowledgeBaseInfo
+from app.schemas.penyakit import PenyakitRead
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRule:
+    """
+    Aturan yang sudah dikompilasi: relasi penyakit dan gejala sudah di-resolve dan
+    nilai CF pakar sudah diagregasi.
+    """
+
+    id: str
+    id_penyakit: str
+    id_gejala: str
+    gejala: SimpleGejalaRead
+    cf_pakar: Mapping[str, float]
+    cf_avg: Optional[float]
+
+
+@dataclass(frozen=True, slots=True)
+class KnowledgeBase:
+    """
+    Snapshot read-only dari basis pengetahuan (rule, rule_cf, gejala, penyakit)
+    yang digunakan oleh Diagnosis tanpa menyentuh database.
+    """
+
+    version: int
+    rules_by_gejala: Mapping[str, tuple[CompiledRule, ...]]
+    penyakit: Mapping[str, Mapping[str, Any]]
+    gejala: Mapping[str, SimpleGejalaRead]
+    pakar: Mapping[str, str]
+    cf_matrix: CfMatrix
+    built_at: datetime
+    build_time_ms: float
+    memory_bytes: int
+
+    @property
+    def rule_count(self) -> int:
+        return sum(len(rules) for rules in self.rules_by_gejala.values())
+
+    def rules_for(self, gejala_ids: Iterable[str]) -> list[CompiledRule]:
+        """
+        Mengambil aturan yang relevan dengan gejala yang diberikan, dengan urutan
+        mengikuti urutan gejala.
+        """
+        relevant: list[CompiledRule] = []
+        for gejala_id in gejala_ids:
+            relevant.extend(self.rules_by_gejala.get(gejala_id, ()))
+        return relevant
+
+    def info(self, *, stale: bool = False) -> KnowledgeBaseInfo:
+        return KnowledgeBaseInfo(
+            version=self.version,
+            built_at=self.built_at,
+            build_time_ms=round(self.build_time_ms, 3),
+            memory_bytes=self.memory_bytes,
+            total_rules=self.rule_count,
+            total_penyakit=len(self.penyakit),
+            total_gejala=len(self.gejala),
+            total_pakar=len(self.pakar),
+            stale=stale,
+        )
+
+
+def _deep_sizeof(obj: Any, seen: set[int] | None = None) -> int:
+    """Perkiraan ukuran memori (byte) sebuah objek beserta isinya."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool, datetime)) or obj is None:
+        return size
+    if isinstance(obj, (Mapping, MappingProxyType)):
+        size += sum(
+            _deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items()
+        )
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    elif isinstance(obj, BaseModel):
+        size += _deep_sizeof(obj.__dict__, seen)
+    elif hasattr(obj, "__slots__"):
+        size += sum(
+            _deep_sizeof(getattr(obj, name), seen)
+            for name in obj.__slots__
+            if hasattr(obj, name)
+        )
+    return size
+
+
+async def build_knowledge_base(session: AsyncSession, version: int) -> KnowledgeBase:
+    """
+    Membangun KnowledgeBase dari database.
+
+    Hanya kolom yang dibutuhkan yang diambil (tanpa memuat graf relasi ORM),
+    sehingga pembangunan memerlukan tepat lima query. Rata-rata CF pakar dibaca
+    dari tabel rule_cf_aggregate (satu baris per rule). Matriks CF untuk engine
+    vektor (CfMatrix) ikut dibangun dari aturan yang sama.
+    """
+    start = time.perf_counter()
+
+    penyakit_columns = [
+        Penyakit.__table__.c[name] for name in PenyakitRead.model_fields
+    ]
+    penyakit_rows = (await session.execute(select(*penyakit_columns))).all()
+    penyakit = {row.id: MappingProxyType(row._asdict()) for row in penyakit_rows}
+
+    gejala_columns = [
+        Gejala.__table__.c[name] for name in SimpleGejalaRead.model_fields
+    ]
+    gejala_rows = (await session.execute(select(*gejala_columns))).all()
+    gejala = {
+        row.id: SimpleGejalaRead.model_validate(row._asdict()) for row in gejala_rows
+    }
+
+    pakar_rows = (
+        await session.execute(select(Pakar.id, Pakar.nama).order_by(Pakar.id))
+    ).all()
+    pakar = {row.id: row.nama for row in pakar_rows}
+
+    cf_rows = (
+        await session.execute(select(RuleCf.id_rule, RuleCf.id_pakar, RuleCf.nilai))
+    ).all()
+    cf_by_rule: dict[str, dict[str, float]] = {}
+    for id_rule, id_pakar, nilai in cf_rows:
+        cf_by_rule.setdefault(id_rule, {})[id_pakar] = nilai
+
+    rule_rows = (
+        await session.execute(
+            select(Rule.id, Rule.id_penyakit, Rule.id_gejala, RuleCfAggregate.cf_avg)
+            .outerjoin(RuleCfAggregate, RuleCfAggregate.id_rule == Rule.id)
+            .order_by(Rule.id)
+        )
+    ).all()
+    rules_by_gejala: dict[str, list[CompiledRule]] = {}
+    for id_rule, id_penyakit, id_gejala, cf_aggregate_avg in rule_rows:
+        if id_gejala not in gejala:
+            logger.warning(
+                f"Aturan {id_rule} tidak memiliki objek gejala terkait. Dilewati."
+            )
+            continue
+        if id_penyakit not in penyakit:
+            logger.warning(
+                f"Aturan {id_rule} (gejala: {id_gejala}) tidak memiliki penyakit "
+                f"terkait (id_penyakit: {id_penyakit}). Dilewati."
+            )
+            continue
+
+        cf_pakar = cf_by_rule.get(id_rule, {})
+        cf_avg = cf_aggregate_avg
+        if cf_avg is None and cf_pakar:
+            logger.warning(
+                f"Agregat CF aturan {id_rule} tidak ditemukan; rata-rata dihitung "
+                "dari rule_cf. Jalankan: python -m app.rule_cf_aggregate check"
+            )
+            cf_avg = sum(cf_pakar.values()) / len(cf_pakar)
+        rules_by_gejala.setdefault(id_gejala, []).append(
+            CompiledRule(
+                id=id_rule,
+                id_penyakit=id_penyakit,
+                id_gejala=id_gejala,
+                gejala=gejala[id_gejala],
+                cf_pakar=MappingProxyType(cf_pakar),
+                cf_avg=cf_avg,
+            )
+        )
+
+    rules_by_gejala_frozen = MappingProxyType(
+        {id_gejala: tuple(rules) for id_gejala, rules in rules_by_gejala.items()}
+    )
+    penyakit_frozen = MappingProxyType(penyakit)
+    gejala_frozen = MappingProxyType(gejala)
+    pakar_frozen = MappingProxyType(pakar)
+    cf_matrix = CfMatrix.from_rules(
+        (
+            (rule.id_gejala, rule.id_penyakit, rule.cf_pakar, rule.cf_avg)
+            for rules in rules_by_gejala.values()
+            for rule in rules
+        ),
+        pakar_ids=pakar,
+    )
+    build_time_ms = (time.perf_counter() - start) * 1000
+
+    return KnowledgeBase(
+        version=version,
+        rules_by_gejala=rules_by_gejala_frozen,
+        penyakit=penyakit_frozen,
+        gejala=gejala_frozen,
+        pakar=pakar_frozen,
+        cf_matrix=cf_matrix,
+        built_at=datetime.now(UTC),
+        build_time_ms=build_time_ms,
+        memory_bytes=_deep_sizeof(
+            (rules_by_gejala_frozen, penyakit_frozen, gejala_frozen, pakar_frozen)
+        )
+        + cf_matrix.nbytes,
+    )
+
+
+class KnowledgeBaseStore:
+    """
+    Menyimpan KnowledgeBase yang aktif untuk proses ini.
+
+    Manager memanggil ``invalidate`` setelah menulis data basis pengetahuan;
+    pembangunan ulang dilakukan sekali pada akses berikutnya. Karena setiap
+    proses/instance memiliki salinannya sendiri, ``KNOWLEDGE_BASE_MAX_AGE``
+    membatasi umur snapshot agar perubahan dari instance lain tetap terbaca.
+
+    Snapshot selalu dibangun dari database utama (``session_maker``), bukan dari
+    replika baca: replika yang tertinggal akan menyimpan data lama di bawah
+    versi baru sampai invalidasi berikutnya.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        max_age: Optional[int] = None,
+    ):
+        self.session_maker = session_maker
+        self.max_age = max_age
+        self._kb: Optional[KnowledgeBase] = None
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def current(self) -> Optional[KnowledgeBase]:
+        return self._kb
+
+    def invalidate(self) -> None:
+        self._version += 1
+        logger.info(f"Knowledge base di-invalidate (versi {self._version}).")
+
+    def is_stale(self) -> bool:
+        if self._kb is None or self._kb.version != self._version:
+            return True
+        if self.max_age is None:
+            return False
+        age = (datetime.now(UTC) - self._kb.built_at).total_seconds()
+        return age > self.max_age
+
+    async def get(self) -> KnowledgeBase:
+        kb = self._kb
+        if kb is not None and not self.is_stale():
+            return kb
+        return await self.rebuild()
+
+    async def rebuild(self) -> KnowledgeBase:
+        async with self._lock:
+            # Request lain mungkin sudah membangun ulang selama menunggu lock.
+            if self._kb is not None and not self.is_stale():
+                return self._kb
+
+            version = self._version
+            async with self.session_maker() as session:
+                kb = await build_knowledge_base(session, version)
+            self._kb = kb
+            logger.info(
+                f"Knowledge base versi {version} dibangun dalam "
+                f"{kb.build_time_ms:.2f} ms ({kb.rule_count} aturan, "
+                f"{kb.memory_bytes} byte)."
+            )
+            return kb
+
+
+knowledge_base = KnowledgeBaseStore(
+    async_session_maker, max_age=settings.KNOWLEDGE_BASE_MAX_AGE
+)
@@ -1,31 +1,51 @@
 import logging
-from typing import Any, Sequence
 
 from fastapi import Depends, status
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies.sessions import get_async_session
+from app.api.dependencies.dashboard import invalidate_dashboard_stats
+from app.api.dependencies.knowledge_base import knowledge_base
+from app.api.dependencies.sessions import (
+    get_async_read_session,
+    get_async_session,
+)
 from app.db.models.pakar import Pakar
-from app.schemas.pakar import PakarCreate, PakarUpdate
+from app.db.models.rule import Rule
+from app.db.models.rule_cf import RuleCf
+from app.db.rule_cf_aggregate import refresh_rule_cf_aggregates
+from app.db.unit_of_work import on_commit, unit_of_work
+from app.schemas.pakar import (
+    PakarCfRejected,
+    PakarCfResult,
+    PakarCreate,
+    PakarUpdate,
+)
+from app.schemas.rule import CF_MAX, CF_MIN, CF_RANGE_MESSAGE
 from app.utils.base_manager import BaseManager
 from app.utils.common import ErrorCode
-from app.utils.exceptions import AppExceptionError, DuplicateNamaError
+from app.utils.exceptions import AppExceptionError
+from app.utils.id_healper import IDConfig
+from app.utils.upsert import upsert_statement
 
 logger = logging.getLogger(__name__)
 
 
 class PakarManager(BaseManager[Pakar, PakarCreate, PakarUpdate]):
     def __init__(self, session: AsyncSession):
-        super().__init__(session, Pakar)
+        super().__init__(
+            session,
+            Pakar,
+            id_config=IDConfig(
+                prefix="PKR", length=5, minimum_length_number=2, example="PKR01"
+            ),
+        )
 
     async def validate_schema(self, item_in: PakarCreate):
-        pakars = await self.get_all()
-
-        if item_in.id is None:
-            item_in.id = await self.create_id(pakars)
+        await self.assign_id(item_in)
 
+        # Duplikasi id dan nama ditolak oleh constraint database
         await self.is_valid_id(item_in.id)
-        await self.is_valid_nama(pakars, item_in.nama)
 
     @property
     def error_codes(self):
@@ -36,6 +56,84 @@ class PakarManager(BaseManager[Pakar, PakarCreate, PakarUpdate]):
             "not_valid_id": ErrorCode.NOT_VALID_ID_PAKAR,
         }
 
+    def after_commit(self) -> None:
+        # Menghapus pakar ikut menghapus rule_cf miliknya (cascade)
+        knowledge_base.invalidate()
+        invalidate_dashboard_stats()
+
+    async def before_delete_commit(self, db_item: Pakar) -> None:
+        # Agregat CF rule yang pernah dinilai pakar ini perlu dihitung ulang.
+        # rule_cf dihapus oleh ON DELETE CASCADE saat flush, jadi ID rule
+        # diambil sebelum penghapusan pakar di-flush.
+        with self.session.no_autoflush:
+            rule_ids = list(
+                await self.session.scalars(
+                    select(RuleCf.id_rule).where(RuleCf.id_pakar == db_item.id)
+                )
+            )
+        await refresh_rule_cf_aggregates(self.session, rule_ids)
+
+    async def set_cf_values(
+        self, pakar_id: str, cf_values: dict[str, float]
+    ) -> PakarCfResult:
+        """
+        Menulis nilai CF pakar untuk banyak rule sekaligus (``{id_rule: nilai}``).
+
+        Seluruh ID rule divalidasi dengan satu query yang sekaligus menandai CF
+        yang sudah ada, lalu nilai yang valid ditulis dengan satu upsert
+        multi-baris dalam satu transaksi. Rule yang tidak ditemukan atau nilai
+        di luar 0 hingga 1 dikembalikan sebagai ``rejected``.
+        """
+        await self.get_by_id_or_fail(pakar_id)
+        result = PakarCfResult()
+        if not cf_values:
+            return result
+
+        query = (
+            select(Rule.id, RuleCf.id_rule)
+            .outerjoin(
+                RuleCf, and_(RuleCf.id_rule == Rule.id, RuleCf.id_pakar == pakar_id)
+            )
+            .where(Rule.id.in_(cf_values))
+        )
+        rules = {
+            rule_id: cf_rule_id is not None
+            for rule_id, cf_rule_id in (await self.session.execute(query)).all()
+        }
+
+        rows = []
+        for rule_id, nilai in cf_values.items():
+            errors = []
+            if rule_id not in rules:
+                errors.append(f"Rule {rule_id} tidak ditemukan.")
+            if not CF_MIN <= nilai <= CF_MAX:
+                errors.append(CF_RANGE_MESSAGE)
+            if errors:
+                result.rejected.append(
+                    PakarCfRejected(id_rule=rule_id, nilai=nilai, errors=errors)
+                )
+                continue
+            rows.append({"id_rule": rule_id, "id_pakar": pakar_id, "nilai": nilai})
+            (result.updated if rules[rule_id] else result.inserted).append(rule_id)
+
+        if not rows:
+            return result
+
+        async with unit_of_work(self.session):
+            await self.session.execute(
+                upsert_statement(
+                    self.session,
+                    RuleCf,
+                    index_elements=("id_rule", "id_pakar"),
+                    update_columns=("nilai",),
+                ).values(rows)
+            )
+            await refresh_rule_cf_aggregates(
+                self.session, (row["id_rule"] for row in rows)
+            )
+        on_commit(self.session, self.after_commit)
+        return result
+
     async def is_valid_id(self, data_id: str):
         exception = AppExceptionError(
             "ID tidak balid",
@@ -55,63 +153,12 @@ class PakarManager(BaseManager[Pakar, PakarCreate, PakarUpdate]):
         if code != "PKR" or not num.isdigit():
             raise exception
 
-        already_exist = await self.get_by_id(data_id)
-        if already_exist:
-            raise AppExceptionError(
-                "ID di temukan sama",
-                f"ID: {data_id}",
-                status_code=status.HTTP_406_NOT_ACCEPTABLE,
-                error_code=self.error_codes["duplicate_id"],
-            )
-
-    async def create_id(self, pakars):
-        existing_ids = {pakar.id for pakar in pakars}
-
-        nums_ids = {int(pakar.id[3:]) for pakar in pakars}
-        expected = set(range(min(nums_ids), max(nums_ids) + 1))
-        missing_nums = expected - nums_ids
-
-        # Assign missing IDs
-        for num in sorted(missing_nums):
-            new_id = f"PKR{num:02d}"
-
-            if new_id not in existing_ids:
-                return new_id
-
-        # Assign new IDs for remaining entries
-        next_num = max(nums_ids, default=0) + 1
-        while True:
-            new_id = f"PKR{next_num:02d}"
-            if new_id not in existing_ids:
-                return new_id
-            next_num += 1
-
-    async def is_valid_nama(self, pakars: Sequence[Pakar], nama: str):
-        for pakar in pakars:
-            if pakar.nama == nama:
-                raise DuplicateNamaError(
-                    "Nama di temukan sama",
-                    f"Nama: {nama}",
-                    status_code=status.HTTP_406_NOT_ACCEPTABLE,
-                    error_code=self.error_codes["duplicate_nama"],
-                )
 
-    async def _validate_update(self, db_item: Pakar, update_data: dict[str, Any]):
-        validated_update_dict = {}
-        pakars = await self.get_all()
-        for field, value in update_data.items():
-            if not hasattr(db_item, field):
-                logger.warning(
-                    f"Field '{field}' not found on {self._model_name} during update."
-                )
-                continue
-
-            if field == "nama" and value != db_item.nama:
-                await self.is_valid_nama(pakars, value)
-                validated_update_dict[field] = value
-
-        return validated_update_dict
+async def get_pakar_manager(session: AsyncSession = Depends(get_async_session)):
+    yield PakarManager(session)
 
 
-async def get_pakar_manager(session: AsyncSession = Depends(get_async_session)):
+async def get_pakar_read_manager(
+    session: AsyncSession = Depends(get_async_read_session),
+):
     yield PakarManager(session)
@@ -0,0 +1,20 @@
+from typing import Any
+
+from fastapi import Depends
+
+from app.db.query_log import query_log
+
+
+def query_budget(max_queries: int) -> Any:
+    """
+    Dependency route yang menetapkan jumlah query SQL maksimum untuk request.
+    Diperiksa oleh QueryBudgetMiddleware jika ``DB_QUERY_BUDGET`` tidak "off".
+
+    Contoh: ``@r.get("/gejala", dependencies=[query_budget(3)])``
+    """
+
+    def set_query_budget() -> None:
+        if (log := query_log.get()) is not None:
+            log.budget = max_queries
+
+    return Depends(set_query_budget)
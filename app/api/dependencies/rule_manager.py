@@ -1,25 +1,42 @@
 import logging
-from typing import Sequence
+from collections import Counter
+from typing import Any
 
 from fastapi import Depends, status
+from sqlalchemy import exc, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.api.dependencies.dashboard import invalidate_dashboard_stats
 from app.api.dependencies.gejala_manager import GejalaManager
+from app.api.dependencies.knowledge_base import knowledge_base
 from app.api.dependencies.pakar_manager import PakarManager
 from app.api.dependencies.penyakit_manager import PenyakitManager
-from app.api.dependencies.sessions import get_async_session
+from app.api.dependencies.sessions import (
+    get_async_read_session,
+    get_async_session,
+)
+from app.db import loaders
+from app.db.models.gejala import Gejala
+from app.db.models.penyakit import Penyakit
 from app.db.models.rule import Rule
 from app.db.models.rule_cf import RuleCf
+from app.db.rule_cf_aggregate import refresh_rule_cf_aggregates
+from app.db.unit_of_work import on_commit, unit_of_work
 from app.schemas.rule import RuleCfCreate, RuleCreate, RuleUpdate
 from app.utils.base_manager import BaseManager
-from app.utils.exceptions import AppExceptionError, DuplicateIDError, NotValidIDError
+from app.utils.common import ErrorCode
+from app.utils.exceptions import AppExceptionError, NotValidIDError
 from app.utils.id_healper import IDConfig
+from app.utils.integrity import classify_integrity_error
+from app.utils.upsert import upsert_statement
 
 logger = logging.getLogger(__name__)
 
 
 class RuleManager(BaseManager[Rule, RuleCreate, RuleUpdate]):
+    read_options = loaders.RULE_READ
+
     def __init__(self, session: AsyncSession):
         super().__init__(
             session,
@@ -31,57 +48,127 @@ class RuleManager(BaseManager[Rule, RuleCreate, RuleUpdate]):
         self.gejala_manager = GejalaManager(session)
         self.pakar_manager = PakarManager(session)
 
+    def after_commit(self) -> None:
+        knowledge_base.invalidate()
+        invalidate_dashboard_stats()
+
     async def create(self, input_data: RuleCreate) -> Rule:
-        # Validasi bahwa Penyakit dan Gejala ada
-        await self.penyakit_manager.get_by_id_or_fail(input_data.id_penyakit)
-        await self.gejala_manager.get_by_id_or_fail(input_data.id_gejala)
-
-        # Cek duplikasi rule (gejala dan penyakit yang sama)
-        query = select(Rule).where(
-            Rule.id_penyakit == input_data.id_penyakit,
-            Rule.id_gejala == input_data.id_gejala,
+        """
+        Membuat rule dengan satu ``INSERT ... ON CONFLICT (id_gejala,
+        id_penyakit) DO NOTHING RETURNING``. Keberadaan penyakit dan gejala
+        dijamin foreign key dan duplikasi oleh unique constraint; pelanggarannya
+        diterjemahkan ke error HTTP yang sama dengan validasi sebelumnya.
+        """
+        await self.assign_id(input_data)
+        await self.is_valid_id(input_data.id)  # type: ignore[arg-type]
+
+        query = (
+            upsert_statement(
+                self.session, Rule, index_elements=("id_gejala", "id_penyakit")
+            )
+            .values(**input_data.model_dump())
+            .returning(Rule)
         )
-        existing_rule = (await self.session.execute(query)).scalars().first()
-        if existing_rule:
-            raise AppExceptionError(
-                "Aturan dengan gejala dan penyakit yang sama sudah ada.",
-                status_code=status.HTTP_409_CONFLICT,
+        try:
+            async with unit_of_work(self.session):
+                db_item = await self.session.scalar(query)
+                if db_item is None:
+                    # Baris tidak ditulis: pasangan gejala-penyakit sudah ada
+                    raise self._duplicate_rule_error()
+        except exc.IntegrityError as e:
+            raise await self._create_error(e, input_data) from None
+
+        on_commit(self.session, self.after_commit)
+        return await self.reload(db_item)
+
+    def map_integrity_error(
+        self, error: exc.IntegrityError, values: dict[str, Any] | None = None
+    ) -> AppExceptionError | None:
+        violation = classify_integrity_error(error, Rule.__table__)
+        if violation.kind == "unique" and violation.columns == {
+            "id_gejala",
+            "id_penyakit",
+        }:
+            return self._duplicate_rule_error()
+        return super().map_integrity_error(error, values)
+
+    async def _create_error(
+        self, error: exc.IntegrityError, input_data: RuleCreate
+    ) -> AppExceptionError:
+        mapped = self.map_integrity_error(error, input_data.model_dump())
+        if mapped is not None:
+            return mapped
+
+        if classify_integrity_error(error, Rule.__table__).kind == "foreign_key":
+            # SQLite tidak menyebut foreign key yang dilanggar, jadi dicek di
+            # jalur error ini saja
+            found = await self.find_existing(
+                {
+                    "penyakit": Penyakit.id == input_data.id_penyakit,
+                    "gejala": Gejala.id == input_data.id_gejala,
+                }
             )
+            for name, manager, item_id in (
+                ("penyakit", self.penyakit_manager, input_data.id_penyakit),
+                ("gejala", self.gejala_manager, input_data.id_gejala),
+            ):
+                if name not in found:
+                    return NotValidIDError(
+                        f"{manager.model.__name__} with ID '{item_id}' not found.",
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        error_code=manager.error_codes["not_valid_id"],
+                    )
+
+        logger.error(f"Integrity error creating Rule: {error}", exc_info=True)
+        return AppExceptionError(
+            "Failed to create Rule.",
+            f"Data may conflict. Detail: {error.orig}",
+            status_code=status.HTTP_409_CONFLICT,
+            error_code=ErrorCode.INTEGRITY_ERROR,
+        )
 
-        # Generate ID unik untuk Rule
-        if input_data.id is None:
-            input_data.id = await self.create_id(await self.get_all())
-
-        # validasi id
-        await self.is_valid_id(input_data.id)
-
-        return await super().create(input_data)
-
-    async def validate_schema(self, input_data: RuleCreate):
-        # Validasi bahwa Penyakit dan Gejala ada
-        await self.penyakit_manager.get_by_id_or_fail(input_data.id_penyakit)
-        await self.gejala_manager.get_by_id_or_fail(input_data.id_gejala)
+    @staticmethod
+    def _duplicate_rule_error() -> AppExceptionError:
+        return AppExceptionError(
+            "Aturan dengan gejala dan penyakit yang sama sudah ada.",
+            status_code=status.HTTP_409_CONFLICT,
+        )
 
-        # Cek duplikasi rule (gejala dan penyakit yang sama)
-        query = select(Rule).where(
-            Rule.id_penyakit == input_data.id_penyakit,
-            Rule.id_gejala == input_data.id_gejala,
+    async def validate_bulk(self, items_in: list[RuleCreate]):
+        await self.check_bulk_ids(items_in)
+
+        # Validasi bahwa seluruh Penyakit dan Gejala ada
+        for manager, ids in (
+            (self.penyakit_manager, {item.id_penyakit for item in items_in}),
+            (self.gejala_manager, {item.id_gejala for item in items_in}),
+        ):
+            missing = ids - await self._existing(manager.model.id, list(ids))
+            if missing:
+                raise NotValidIDError(
+                    f"{manager.model.__name__} dengan ID "
+                    f"{', '.join(sorted(missing))} tidak ditemukan.",
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    error_code=manager.error_codes["not_valid_id"],
+                    data=sorted(missing),
+                )
+
+        # Cek duplikasi rule di dalam batch maupun dengan rule yang sudah ada
+        pairs = [(item.id_gejala, item.id_penyakit) for item in items_in]
+        query = select(Rule.id_gejala, Rule.id_penyakit).where(
+            tuple_(Rule.id_gejala, Rule.id_penyakit).in_(set(pairs))
         )
-        existing_rule = (await self.session.execute(query)).scalars().first()
-        if existing_rule:
+        existing = {tuple(row) for row in (await self._execute_query(query)).all()}
+        duplicates = existing | {
+            pair for pair, count in Counter(pairs).items() if count > 1
+        }
+        if duplicates:
             raise AppExceptionError(
                 "Aturan dengan gejala dan penyakit yang sama sudah ada.",
                 status_code=status.HTTP_409_CONFLICT,
+                data=[f"{g}-{p}" for g, p in sorted(duplicates)],
             )
 
-        # Generate ID unik untuk Rule
-        if input_data.id is None:
-            all_rules = await self.get_all(limit=9999)
-            existing_ids = {r.id for r in all_rules}
-            next_num = len(existing_ids) + 1
-            while f"RULE{next_num:04d}" in existing_ids:
-                next_num += 1
-            input_data.id = f"RULE{next_num:04d}"
+        await self.assign_bulk_ids(items_in)
 
     async def add_or_update_cf(self, rule_id: str, cf_data: RuleCfCreate) -> Rule:
         """
@@ -97,25 +184,27 @@ class RuleManager(BaseManager[Rule, RuleCreate, RuleUpdate]):
         )
         existing_cf = (await self.session.execute(query)).scalars().first()
 
-        if existing_cf:
-            # Update jika sudah ada
-            existing_cf.nilai = cf_data.nilai
-            self.session.add(existing_cf)
-        else:
-            # Buat baru jika belum ada
-            new_cf = RuleCf(
-                id_rule=rule_id, id_pakar=cf_data.id_pakar, nilai=cf_data.nilai
-            )
-            self.session.add(new_cf)
-
-        await self.session.commit()
-        await self.session.refresh(rule)
+        async with unit_of_work(self.session):
+            if existing_cf:
+                # Update jika sudah ada
+                existing_cf.nilai = cf_data.nilai
+                self.session.add(existing_cf)
+            else:
+                # Buat baru jika belum ada
+                new_cf = RuleCf(
+                    id_rule=rule_id, id_pakar=cf_data.id_pakar, nilai=cf_data.nilai
+                )
+                self.session.add(new_cf)
+
+            await refresh_rule_cf_aggregates(self.session, [rule_id])
+        on_commit(self.session, self.after_commit)
+        await self.reload(rule)
         return rule
 
     async def is_valid_id(self, data_id: str) -> None:
         """
-        Validates a Gejala ID
-        Raises appropriate exceptions if validation fails
+        Validates the format of a Rule ID
+        Raises NotValidIDError if validation fails
         """
         is_valid, error_message = self.id_helper.validate_format(data_id)
         if not is_valid:
@@ -126,22 +215,12 @@ class RuleManager(BaseManager[Rule, RuleCreate, RuleUpdate]):
                 status_code=status.HTTP_406_NOT_ACCEPTABLE,
             )
 
-        # Check for existing ID
-        already_exist = await self.get_by_id(data_id)
-        if already_exist:
-            raise DuplicateIDError(
-                f"ID: {data_id} telah terdaftar",
-                error_code=self.error_codes["duplicate_id"],
-                status_code=status.HTTP_406_NOT_ACCEPTABLE,
-            )
 
-    async def create_id(self, existing_items: Sequence[Rule]) -> str:
-        """
-        Creates a new unique ID for a Gejala
-        """
-        existing_ids, nums_ids = self.id_helper.extract_numeric_ids(existing_items)
-        return self.id_helper.create_id(existing_ids, nums_ids)
+async def get_rule_manager(session: AsyncSession = Depends(get_async_session)):
+    yield RuleManager(session)
 
 
-async def get_rule_manager(session: AsyncSession = Depends(get_async_session)):
+async def get_rule_read_manager(
+    session: AsyncSession = Depends(get_async_read_session),
+):
     yield RuleManager(session)
@@ -2,12 +2,30 @@ from typing import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.base import async_session_maker
+from app.db.base import async_read_session_maker, async_session_maker
+from app.db.consistency import reads_from_primary
+from app.db.unit_of_work import unit_of_work
 
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """Get an async session.
     This function is used to create a new async session for each request.
+    The request runs as one unit of work: managers only flush (inside
+    savepoints), the transaction is committed once after the route returns
+    and rolled back as a whole if it raises.
     """
-    async with async_session_maker() as session:
+    async with async_session_maker() as session, unit_of_work(session):
+        yield session
+
+
+async def get_async_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Get an async session for read-only work.
+    Uses the read replica when one is configured, unless the client wrote
+    recently (read-your-writes), in which case the primary is used.
+    """
+    if reads_from_primary():
+        session_maker = async_session_maker
+    else:
+        session_maker = async_read_session_maker
+    async with session_maker() as session:
         yield session
@@ -3,12 +3,15 @@ from fastapi import APIRouter
 from app.core.config import settings
 
 from . import (
+    bulk_import,
     cf_term,
     dashboard,
     diagnosis,
+    diagnosis_session,
     docs,
     gejala,
     kelompok,
+    monitoring,
     pakar,
     penyakit,
     rule,
@@ -21,9 +24,14 @@ router.include_router(penyakit.router)
 router.include_router(gejala.router)
 router.include_router(kelompok.router)
 router.include_router(rule.router)
+router.include_router(bulk_import.router)
+# Didaftarkan sebelum diagnosis agar /diagnosis/sessions tidak tertangkap oleh
+# /diagnosis/{pakar_id}.
+router.include_router(diagnosis_session.router)
 router.include_router(diagnosis.router)
 router.include_router(cf_term.router)
 router.include_router(dashboard.router)
+router.include_router(monitoring.router)
 
 
 @router.get("/ping")
@@ -0,0 +1,90 @@
+from fastapi import APIRouter, Depends, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.bulk_import import (
+    BulkImporter,
+    GejalaImporter,
+    PenyakitImporter,
+    RuleCfImporter,
+    RuleImporter,
+    read_rows,
+)
+from app.api.dependencies.sessions import get_async_session
+from app.schemas.bulk_import import ImportResult
+
+r = router = APIRouter(prefix="/import", tags=["Impor Massal"])
+
+_DESCRIPTION = """
+File CSV (format sama dengan `app/db/factories/file/*.csv`), JSON berisi array
+objek dengan kunci yang sama, atau JSON Lines. Baris yang sudah ada (berdasarkan
+ID) diperbarui. Jika ada baris tidak valid, seluruh impor dibatalkan dan respons
+422 berisi kesalahan per baris; dengan `skip_invalid=true` baris tersebut
+dilewati dan sisanya tetap diimpor.
+"""
+
+
+async def _import(
+    importer: type[BulkImporter],
+    file: UploadFile,
+    skip_invalid: bool,
+    session: AsyncSession,
+) -> ImportResult:
+    return await importer(session, skip_invalid).run(read_rows(file))
+
+
+@r.post(
+    "/penyakit",
+    response_model=ImportResult,
+    summary="Impor Penyakit",
+    description="Kolom: kode_penyakit, nama_penyakit, deskripsi, solusi, "
+    "pencegahan." + _DESCRIPTION,
+)
+async def import_penyakit(
+    file: UploadFile,
+    skip_invalid: bool = False,
+    session: AsyncSession = Depends(get_async_session),
+):
+    return await _import(PenyakitImporter, file, skip_invalid, session)
+
+
+@r.post(
+    "/gejala",
+    response_model=ImportResult,
+    summary="Impor Gejala",
+    description="Kolom: kode_gejala, nama_gejala, deskripsi, id_kelompok "
+    "(dipisah `;`), pertanyaan (opsional)." + _DESCRIPTION,
+)
+async def import_gejala(
+    file: UploadFile,
+    skip_invalid: bool = False,
+    session: AsyncSession = Depends(get_async_session),
+):
+    return await _import(GejalaImporter, file, skip_invalid, session)
+
+
+@r.post(
+    "/rules",
+    response_model=ImportResult,
+    summary="Impor Rule",
+    description="Kolom: id_rule, kode_penyakit, kode_gejala_terkait." + _DESCRIPTION,
+)
+async def import_rules(
+    file: UploadFile,
+    skip_invalid: bool = False,
+    session: AsyncSession = Depends(get_async_session),
+):
+    return await _import(RuleImporter, file, skip_invalid, session)
+
+
+@r.post(
+    "/cf",
+    response_model=ImportResult,
+    summary="Impor Nilai CF",
+    description="Kolom: id_rule, id_pakar, nilai_cf (-1 hingga 1)." + _DESCRIPTION,
+)
+async def import_cf(
+    file: UploadFile,
+    skip_invalid: bool = False,
+    session: AsyncSession = Depends(get_async_session),
+):
+    return await _import(RuleCfImporter, file, skip_invalid, session)
@@ -1,25 +1,45 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
 
 from app.api.dependencies.diagnosis import Diagnosis, logger
-from app.api.dependencies.pakar_manager import PakarManager, get_pakar_manager
-from app.api.dependencies.sessions import get_async_session
 from app.schemas.diagnosis import (
+    DiagnosisBatchRequest,
+    DiagnosisBatchResult,
+    DiagnosisConsensusResult,
+    DiagnosisOptions,
     DiagnosisRequest,
     DiagnosisResult,
+    DiagnosisSummaryResult,
+    NextQuestionRequest,
+    NextQuestionResult,
 )
 
 r = router = APIRouter(tags=["Diagnosis"])
 
 
+def get_diagnosis_options(
+    top_k: int | None = Query(
+        None, ge=1, description="Jumlah penyakit teratas. Kosong: semua penyakit."
+    ),
+    min_score: float = Query(
+        0, ge=0, le=100, description="Skor keyakinan minimum (%) yang ditampilkan."
+    ),
+    detail: Literal["summary", "full"] = Query(
+        "full", description="summary: hanya ID, nama dan skor penyakit."
+    ),
+) -> DiagnosisOptions:
+    return DiagnosisOptions(top_k=top_k, min_score=min_score, detail=detail)
+
+
 @r.post(
     "/diagnosis",
-    response_model=DiagnosisResult,
+    response_model=DiagnosisResult | DiagnosisSummaryResult,
     summary="Lakukan Diagnosis (Rata-rata Pakar)",
 )
 async def perform_diagnosis_v2(
     request: DiagnosisRequest,
-    session: AsyncSession = Depends(get_async_session),
+    options: DiagnosisOptions = Depends(get_diagnosis_options),
 ):
     """
     Melakukan diagnosis penyakit berdasarkan gejala yang diberikan pengguna.
@@ -27,19 +47,70 @@ async def perform_diagnosis_v2(
     logger.info(
         f"Memulai diagnosis (rata-rata pakar) untuk {len(request.gejala_user)} gejala."
     )
-    return await Diagnosis.diagnosis(session, request, pakar_id=None)
+    return await Diagnosis.diagnosis(request, pakar_id=None, options=options)
+
+
+@r.post(
+    "/diagnosis/batch",
+    response_model=DiagnosisBatchResult,
+    summary="Lakukan Diagnosis untuk Banyak Kasus",
+)
+async def perform_diagnosis_batch(
+    batch: DiagnosisBatchRequest,
+):
+    """
+    Melakukan diagnosis untuk banyak kasus sekaligus terhadap basis aturan yang
+    sama. Hasil dikembalikan sesuai urutan kasus; kasus yang tidak valid hanya
+    menghasilkan error pada item tersebut.
+    """
+    logger.info(f"Memulai diagnosis batch untuk {len(batch.cases)} kasus.")
+    return await Diagnosis.diagnosis_batch(batch)
+
+
+@r.post(
+    "/diagnosis/consensus",
+    response_model=DiagnosisConsensusResult,
+    summary="Lakukan Diagnosis (Konsensus Semua Pakar)",
+)
+async def perform_diagnosis_consensus(
+    request: DiagnosisRequest,
+):
+    """
+    Melakukan diagnosis dengan CF **setiap pakar** sekaligus dalam satu evaluasi.
+    Setiap penyakit berisi skor per pakar, skor rata-rata pakar, serta statistik
+    perbedaan pendapat antar pakar (simpangan baku dan selisih max-min).
+    """
+    logger.info(
+        f"Memulai diagnosis konsensus pakar untuk {len(request.gejala_user)} gejala."
+    )
+    return await Diagnosis.consensus(request)
+
+
+@r.post(
+    "/diagnosis/next-questions",
+    response_model=NextQuestionResult,
+    summary="Sarankan Gejala Berikutnya",
+)
+async def suggest_next_questions(
+    request: NextQuestionRequest,
+):
+    """
+    Menyarankan gejala berikutnya yang paling membedakan penyakit dengan skor
+    tertinggi saat ini, lengkap dengan ``pertanyaan`` gejala tersebut. Gejala
+    yang sudah dijawab tidak disarankan lagi.
+    """
+    return await Diagnosis.next_questions(request)
 
 
 @r.post(
     "/diagnosis/{pakar_id}",
-    response_model=DiagnosisResult,
+    response_model=DiagnosisResult | DiagnosisSummaryResult,
     summary="Lakukan Diagnosis (Pakar Spesifik)",
 )
 async def perform_diagnosis_by_pakar(
     pakar_id: str,
     request: DiagnosisRequest,
-    session: AsyncSession = Depends(get_async_session),
-    pakar_manager: PakarManager = Depends(get_pakar_manager),
+    options: DiagnosisOptions = Depends(get_diagnosis_options),
 ):
     """
     Melakukan diagnosis penyakit berdasarkan gejala dari pengguna, menggunakan
@@ -49,6 +120,5 @@ async def perform_diagnosis_by_pakar(
         f"Memulai diagnosis oleh pakar spesifik ID: {pakar_id} untuk "
         f"{len(request.gejala_user)} gejala."
     )
-    # Validasi pakar
-    await pakar_manager.get_by_id_or_fail(pakar_id)
-    return await Diagnosis.diagnosis(session, request, pakar_id=pakar_id)
+    # Validasi pakar dilakukan terhadap basis pengetahuan di dalam Diagnosis
+    return await Diagnosis.diagnosis(request, pakar_id=pakar_id, options=options)
@@ -0,0 +1,113 @@
+from fastapi import (
+    APIRouter,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+
+from app.api.dependencies.diagnosis_session import diagnosis_sessions
+from app.schemas.diagnosis import (
+    DiagnosisSessionCreate,
+    DiagnosisSessionRead,
+    NextQuestionResult,
+    UserGejalaInput,
+)
+from app.utils.exceptions import AppExceptionError
+
+r = router = APIRouter(tags=["Diagnosis"])
+
+
+@r.post(
+    "/diagnosis/sessions",
+    status_code=status.HTTP_201_CREATED,
+    response_model=DiagnosisSessionRead,
+    summary="Buat Sesi Diagnosis Interaktif",
+)
+async def create_diagnosis_session(
+    data: DiagnosisSessionCreate,
+):
+    """
+    Membuat sesi diagnosis interaktif. Jawaban gejala dikirim satu per satu dan
+    peringkat penyakit diperbarui secara bertahap tanpa menghitung ulang seluruh
+    jawaban sebelumnya.
+    """
+    diagnosis_session = await diagnosis_sessions.create(data.id_pakar)
+    return diagnosis_session.read()
+
+
+@r.get(
+    "/diagnosis/sessions/{session_id}",
+    response_model=DiagnosisSessionRead,
+    summary="Dapatkan Peringkat Sesi Diagnosis",
+)
+async def get_diagnosis_session(
+    session_id: str,
+):
+    diagnosis_session = await diagnosis_sessions.get(session_id)
+    return diagnosis_session.read()
+
+
+@r.post(
+    "/diagnosis/sessions/{session_id}/answers",
+    response_model=DiagnosisSessionRead,
+    summary="Tambah Jawaban pada Sesi Diagnosis",
+)
+async def answer_diagnosis_session(
+    session_id: str,
+    gejala: UserGejalaInput,
+):
+    """
+    Menambahkan jawaban satu gejala. Jika gejala sudah pernah dijawab, nilai
+    ``cf_user`` diganti dan peringkat dihitung ulang.
+    """
+    return await diagnosis_sessions.answer(session_id, gejala)
+
+
+@r.get(
+    "/diagnosis/sessions/{session_id}/next-questions",
+    response_model=NextQuestionResult,
+    summary="Sarankan Gejala Berikutnya untuk Sesi Diagnosis",
+)
+async def suggest_diagnosis_session_questions(
+    session_id: str,
+    limit: int = Query(3, ge=1, le=20),
+    top_penyakit: int = Query(5, ge=2, le=50),
+):
+    """
+    Menyarankan gejala berikutnya berdasarkan jawaban sesi, lengkap dengan
+    ``pertanyaan`` gejala tersebut.
+    """
+    return await diagnosis_sessions.next_questions(session_id, limit, top_penyakit)
+
+
+@r.delete("/diagnosis/sessions/{session_id}", status_code=status.HTTP_202_ACCEPTED)
+async def close_diagnosis_session(session_id: str):
+    await diagnosis_sessions.close(session_id)
+    return {"message": f"success close diagnosis session id {session_id}"}
+
+
+@r.websocket("/diagnosis/sessions/{session_id}/ws")
+async def diagnosis_session_updates(websocket: WebSocket, session_id: str):
+    """
+    Mengirim peringkat terbaru setiap kali jawaban ditambahkan ke sesi. Peringkat
+    terakhir dikirim segera setelah koneksi dibuka.
+    """
+    try:
+        diagnosis_session = diagnosis_sessions.get_or_fail(session_id)
+    except AppExceptionError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    diagnosis_session.subscribers.add(websocket)
+    try:
+        if diagnosis_session.last_payload is not None:
+            await websocket.send_json(diagnosis_session.last_payload)
+        while True:
+            # Pesan dari klien diabaikan; jawaban dikirim melalui HTTP.
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        diagnosis_session.subscribers.discard(websocket)
@@ -3,8 +3,14 @@ from fastapi_utils.cbv import cbv
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies.gejala_manager import GejalaManager, get_gejala_manager
-from app.api.dependencies.sessions import get_async_session
+from app.api.dependencies.gejala_manager import (
+    GejalaManager,
+    get_gejala_manager,
+    get_gejala_read_manager,
+)
+from app.api.dependencies.query_budget import query_budget
+from app.api.dependencies.sessions import get_async_read_session
+from app.db import loaders
 from app.db.models.gejala import Gejala
 from app.db.models.kelompok import Kelompok
 from app.db.models.rule import Rule
@@ -12,15 +18,16 @@ from app.schemas.gejala import GejalaCreate, GejalaRead, GejalaUpdate
 from app.schemas.kelompok import KelompokRead
 from app.schemas.pagination import PaginationSchema
 from app.schemas.rule import RuleByGejalaRead
-from app.utils.pagination import paginate
+from app.utils.pagination import CountMode, paginate
 
 r = router = APIRouter(tags=["Gejala"])
 
 
 @cbv(router)
 class _Pakar:
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_async_read_session)
     manager: GejalaManager = Depends(get_gejala_manager)
+    reader: GejalaManager = Depends(get_gejala_read_manager)
 
     @r.post(
         "/gejala",
@@ -30,9 +37,18 @@ class _Pakar:
     async def create_gejala(self, gejala: GejalaCreate):
         return await self.manager.create(gejala)
 
-    @r.get("/gejala", response_model=PaginationSchema[GejalaRead])
+    @r.get(
+        "/gejala",
+        response_model=PaginationSchema[GejalaRead],
+        dependencies=[query_budget(3)],
+    )
     async def get_all_gejala(
-        self, kelompok_id: int | None = None, page: int = 1, per_page: int = 200
+        self,
+        kelompok_id: int | None = None,
+        page: int = 1,
+        per_page: int = 200,
+        cursor: str | None = None,
+        count: CountMode = "exact",
     ):
         if kelompok_id:
             query = (
@@ -42,11 +58,16 @@ class _Pakar:
             )
         else:
             query = select(Gejala)
-        return await paginate(self.session, query, page, per_page)
+        query = query.options(*loaders.GEJALA_READ)
+        return await paginate(self.session, query, page, per_page, cursor, count)
 
-    @r.get("/gejala/{gejala_id}", response_model=GejalaRead)
+    @r.get(
+        "/gejala/{gejala_id}",
+        response_model=GejalaRead,
+        dependencies=[query_budget(2)],
+    )
     async def get_gejala_by_id(self, gejala_id: str):
-        return await self.manager.get_by_id_or_fail(gejala_id)
+        return await self.reader.get_by_id_or_fail(gejala_id, loaders.GEJALA_READ)
 
     @r.put("/gejala/{gejala_id}", response_model=GejalaRead)
     async def update_gejala(self, gejala_id: str, new_data: GejalaUpdate):
@@ -61,29 +82,45 @@ class _Pakar:
         "/gejala/{gejala_id}/kelompoks",
         response_model=PaginationSchema[KelompokRead],
         status_code=status.HTTP_200_OK,
+        dependencies=[query_budget(2)],
     )
     async def get_detail_kelompoks_by_gejala(
-        self, gejala_id: str, page: int = 1, per_page: int = 200
+        self,
+        gejala_id: str,
+        page: int = 1,
+        per_page: int = 200,
+        cursor: str | None = None,
+        count: CountMode = "exact",
     ):
         query = (
             select(Kelompok).join(Kelompok.gejalas).filter(Gejala.id == gejala_id)
         )
 
-        return await paginate(self.session, query, page, per_page)
+        return await paginate(self.session, query, page, per_page, cursor, count)
 
     @r.get(
         "/gejala/{gejala_id}/rules",
         response_model=PaginationSchema[RuleByGejalaRead],
         summary="Get Rules by Gejala ID",
+        dependencies=[query_budget(5)],
     )
     async def get_rules_by_gejala(
-        self, gejala_id: str, page: int = 1, per_page: int = 20
+        self,
+        gejala_id: str,
+        page: int = 1,
+        per_page: int = 20,
+        cursor: str | None = None,
+        count: CountMode = "exact",
     ):
         """
         Mengambil daftar semua aturan (rule) di mana gejala ini digunakan.
         """
         # Validasi gejala ada
-        await self.manager.get_by_id_or_fail(gejala_id)
+        await self.reader.get_by_id_or_fail(gejala_id)
 
-        query = select(Rule).where(Rule.id_gejala == gejala_id)
-        return await paginate(self.session, query, page, per_page)
+        query = (
+            select(Rule)
+            .where(Rule.id_gejala == gejala_id)
+            .options(*loaders.RULE_CFS)
+        )
+        return await paginate(self.session, query, page, per_page, cursor, count)
@@ -8,7 +8,8 @@ from app.api.dependencies.kelompok_manager import (
     KelompokManager,
     get_kelompok_manager,
 )
-from app.api.dependencies.sessions import get_async_session
+from app.api.dependencies.query_budget import query_budget
+from app.api.dependencies.sessions import get_async_read_session
 from app.db.models.kelompok import Kelompok
 from app.schemas.kelompok import (
     KelompokCreate,
@@ -16,14 +17,14 @@ from app.schemas.kelompok import (
     KelompokUpdate,
 )
 from app.schemas.pagination import PaginationSchema
-from app.utils.pagination import paginate
+from app.utils.pagination import CountMode, paginate
 
 r = router = APIRouter(tags=["Kelompok"])
 
 
 @cbv(router)
 class _Kelompok:
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_async_read_session)
     manager: KelompokManager = Depends(get_kelompok_manager)
 
     @r.post(
@@ -34,9 +35,16 @@ class _Kelompok:
     async def create_kelompok(self, kelompok: KelompokCreate):
         return await self.manager.create(kelompok)
 
-    @r.get("/kelompok", response_model=PaginationSchema[KelompokRead])
-    async def get_all_kelompok(self):
-        return await paginate(self.session, select(Kelompok), 1, 9999999)
+    @r.get(
+        "/kelompok",
+        response_model=PaginationSchema[KelompokRead],
+        dependencies=[query_budget(2)],
+    )
+    async def get_all_kelompok(
+        self, cursor: str | None = None, count: CountMode = "exact"
+    ):
+        query = select(Kelompok)
+        return await paginate(self.session, query, 1, 9999999, cursor, count)
 
     # @r.get("/kelompok/{kelompok_id}", response_model=KelompokRead)
     # async def get_kelompok_by_id(self, kelompok_id: int):
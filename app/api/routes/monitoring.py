@@ -0,0 +1,90 @@
+from fastapi import APIRouter
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from app.api.dependencies.diagnosis import diagnosis_cache
+from app.api.dependencies.knowledge_base import knowledge_base
+from app.core.config import settings
+from app.db.base import engine, read_engine
+from app.db.pool import pool_capacity
+from app.schemas.monitoring import CacheInfo, DbPoolInfo, KnowledgeBaseInfo
+
+r = router = APIRouter(tags=["Monitoring"])
+
+
+@r.get(
+    "/monitoring/knowledge-base",
+    response_model=KnowledgeBaseInfo,
+    summary="Dapatkan Status Basis Pengetahuan",
+)
+async def get_knowledge_base_info():
+    """
+    Mengembalikan versi, waktu pembangunan, dan perkiraan ukuran memori basis
+    pengetahuan yang digunakan oleh diagnosis.
+    """
+    kb = knowledge_base.current or await knowledge_base.get()
+    return kb.info(stale=knowledge_base.is_stale())
+
+
+@r.get(
+    "/monitoring/diagnosis-cache",
+    response_model=CacheInfo,
+    summary="Dapatkan Statistik Cache Diagnosis",
+)
+async def get_diagnosis_cache_info():
+    """
+    Mengembalikan jumlah entri serta counter hits, misses, evictions, dan
+    expirations dari cache hasil diagnosis.
+    """
+    stats = diagnosis_cache.stats
+    return CacheInfo(
+        size=len(diagnosis_cache),
+        max_size=diagnosis_cache.max_size,
+        ttl=diagnosis_cache.ttl,
+        hits=stats.hits,
+        misses=stats.misses,
+        evictions=stats.evictions,
+        expirations=stats.expirations,
+        hit_ratio=round(stats.hit_ratio, 4),
+    )
+
+
+@r.get(
+    "/monitoring/db-pool",
+    response_model=DbPoolInfo,
+    summary="Dapatkan Statistik Pool Koneksi Database",
+)
+async def get_db_pool_info():
+    """
+    Mengembalikan ukuran, tingkat kejenuhan, dan waktu tunggu checkout pool
+    koneksi database pada proses ini, termasuk pool replika baca jika ada.
+    """
+    pool_info = _pool_info(engine.sync_engine.pool)
+    if read_engine is not engine:
+        pool_info.read_pool = _pool_info(read_engine.sync_engine.pool)
+    return pool_info
+
+
+def _pool_info(pool: Pool) -> DbPoolInfo:
+    stats = pool.stats  # type: ignore[attr-defined]
+    queue_pool = isinstance(pool, AsyncAdaptedQueuePool)
+    capacity = pool_capacity(pool)
+    return DbPoolInfo(
+        mode=settings.db_pool_mode,
+        pool_class=type(pool).__name__,
+        size=pool.size() if queue_pool else None,
+        max_overflow=pool._max_overflow if queue_pool else None,  # noqa: SLF001
+        capacity=capacity,
+        checked_out=stats.checked_out,
+        idle=pool.checkedin() if queue_pool else None,
+        overflow=max(pool.overflow(), 0) if queue_pool else None,
+        saturation=(round(stats.checked_out / capacity, 4) if capacity else None),
+        peak_checked_out=stats.peak_checked_out,
+        checkouts=stats.checkouts,
+        connects=stats.connects,
+        timeouts=stats.timeouts,
+        wait_avg_ms=round(stats.total_wait_ms / max(stats.checkouts, 1), 3),
+        wait_p50_ms=round(stats.wait_percentile(50), 3),
+        wait_p95_ms=round(stats.wait_percentile(95), 3),
+        wait_p99_ms=round(stats.wait_percentile(99), 3),
+        wait_max_ms=round(stats.max_wait_ms, 3),
+    )
@@ -3,20 +3,26 @@ from fastapi_utils.cbv import cbv
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies.pakar_manager import PakarManager, get_pakar_manager
-from app.api.dependencies.sessions import get_async_session
+from app.api.dependencies.pakar_manager import (
+    PakarManager,
+    get_pakar_manager,
+    get_pakar_read_manager,
+)
+from app.api.dependencies.query_budget import query_budget
+from app.api.dependencies.sessions import get_async_read_session
 from app.db.models.pakar import Pakar
 from app.schemas.pagination import PaginationSchema
-from app.schemas.pakar import PakarCreate, PakarRead, PakarUpdate
-from app.utils.pagination import paginate
+from app.schemas.pakar import PakarCfResult, PakarCreate, PakarRead, PakarUpdate
+from app.utils.pagination import CountMode, paginate
 
 r = router = APIRouter(tags=["Pakar"])
 
 
 @cbv(router)
 class _Pakar:
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_async_read_session)
     manager: PakarManager = Depends(get_pakar_manager)
+    reader: PakarManager = Depends(get_pakar_read_manager)
 
     @r.post(
         "/pakar",
@@ -26,14 +32,35 @@ class _Pakar:
     async def create_pakar(self, pakar: PakarCreate):
         return await self.manager.create(pakar)
 
-    @r.get("/pakar", response_model=PaginationSchema[PakarRead])
-    async def get_all_pakar(self):
-        return await paginate(self.session, select(Pakar), 1, 9999999)
+    @r.get(
+        "/pakar",
+        response_model=PaginationSchema[PakarRead],
+        dependencies=[query_budget(2)],
+    )
+    async def get_all_pakar(
+        self, cursor: str | None = None, count: CountMode = "exact"
+    ):
+        query = select(Pakar)
+        return await paginate(self.session, query, 1, 9999999, cursor, count)
 
-    @r.get("/pakar/{pakar_id}", response_model=PakarRead)
+    @r.get(
+        "/pakar/{pakar_id}",
+        response_model=PakarRead,
+        dependencies=[query_budget(1)],
+    )
     async def get_pakar_by_id(self, pakar_id: str):
-        return await self.manager.get_by_id_or_fail(pakar_id)
+        return await self.reader.get_by_id_or_fail(pakar_id)
 
     @r.put("/pakar/{pakar_id}", response_model=PakarRead)
     async def update_pakar(self, pakar_id: str, new_data: PakarUpdate):
         return await self.manager.update(item_id=pakar_id, item_update=new_data)
+
+    @r.put("/pakar/{pakar_id}/cf", response_model=PakarCfResult)
+    async def set_pakar_cf(self, pakar_id: str, cf_values: dict[str, float]):
+        """
+        Menyimpan nilai CF pakar untuk banyak rule sekaligus dalam bentuk
+        ``{id_rule: nilai}``. CF yang sudah ada diperbarui, yang belum ada
+        ditambahkan; rule yang tidak ditemukan atau nilai di luar 0 hingga 1
+        dikembalikan pada ``rejected`` tanpa membatalkan nilai lainnya.
+        """
+        return await self.manager.set_cf_values(pakar_id, cf_values)
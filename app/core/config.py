@@ -1,3 +1,6 @@
+import os
+from typing import Literal
+
 from pydantic import PostgresDsn, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -8,27 +11,108 @@ class Settings(BaseSettings):
     PROJECT_NAME: str
     API_V1_STR: str = "v1"
 
-    DB_DRIVER: str
-    DB_SERVER: str
-    DB_PORT: int
-    DB_DATABASE: str
-    DB_USERNAME: str
-    DB_PASSWORD: str
-    DB_SSLMODE: str
-    DB_SSLROOTCERT: str
+    DB_DRIVER: str | None = None
+    DB_SERVER: str | None = None
+    DB_PORT: int | None = None
+    DB_DATABASE: str | None = None
+    DB_USERNAME: str | None = None
+    DB_PASSWORD: str | None = None
+    DB_SSLMODE: str | None = None
+    DB_SSLROOTCERT: str | None = None
+
+    # URL database utama lengkap, mis. "sqlite+aiosqlite:///./primary.db". Jika
+    # diisi, menggantikan URL yang dibangun dari DB_*.
+    DATABASE_URL: str | None = None
+    # URL replika baca (opsional). Route baca memakai engine ini; basis
+    # pengetahuan diagnosis selalu dibangun dari database utama. Jika kosong,
+    # semua pembacaan memakai database utama.
+    DATABASE_READ_URL: str | None = None
+    # Lama (detik) klien membaca dari database utama setelah request yang
+    # menulis, agar tulisannya langsung terbaca (read-your-writes) meskipun
+    # replika tertinggal. 0 menonaktifkan.
+    DB_READ_YOUR_WRITES_WINDOW: int = 5
+
+    # Pemeriksaan batas jumlah query per route (lihat dependency query_budget):
+    # - "off": tidak dihitung.
+    # - "warn": jumlah query dikirim di header X-DB-Query-Count dan pelanggaran
+    #   dicatat di log.
+    # - "enforce": seperti "warn", dan route yang melebihi batas menghasilkan 500.
+    DB_QUERY_BUDGET: Literal["off", "warn", "enforce"] = "off"
+
+    # Cara menghitung total paginasi offset (count="exact"):
+    # - "subquery": COUNT(*) terpisah, lalu query halaman (dua query).
+    # - "window": total diambil bersama halaman dengan count(*) OVER () dalam satu
+    #   query; COUNT(*) terpisah hanya dijalankan jika halaman kosong.
+    #   Menghemat satu round trip, tetapi database harus membaca seluruh hasil
+    #   query; hanya menguntungkan untuk hasil kecil dengan latensi jaringan tinggi
+    #   (ukur dengan `python -m app.pagination_benchmark run`).
+    PAGINATION_COUNT_STRATEGY: Literal["subquery", "window"] = "subquery"
+
+    # Mode koneksi database:
+    # - "pool": koneksi dipakai ulang (AsyncAdaptedQueuePool), untuk server biasa.
+    # - "serverless": tanpa pool (NullPool), untuk deployment seperti Vercel di
+    #   mana proses tidak bertahan lama.
+    # - "auto": "serverless" jika berjalan di Vercel (env VERCEL), selain itu "pool".
+    DB_POOL_MODE: Literal["auto", "pool", "serverless"] = "auto"
+    DB_POOL_SIZE: int = 5
+    DB_POOL_MAX_OVERFLOW: int = 10
+    # Lama maksimum (detik) menunggu koneksi dari pool sebelum error.
+    DB_POOL_TIMEOUT: float = 30
+    # Koneksi yang lebih tua dari nilai ini (detik) dibuat ulang. -1: tidak pernah.
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Umur maksimum (detik) snapshot basis pengetahuan diagnosis sebelum dibangun
+    # ulang. None berarti hanya dibangun ulang ketika ada perubahan data.
+    KNOWLEDGE_BASE_MAX_AGE: int | None = 300
+
+    # Lama (detik) statistik dashboard disimpan di cache. Manager mengosongkan cache
+    # setelah menulis; TTL membatasi umur data dari instance lain. 0 menonaktifkan.
+    DASHBOARD_STATS_TTL: int = 30
+
+    # Engine perhitungan CF diagnosis: "scalar" (referensi, berurutan per aturan)
+    # atau "vectorized" (NumPy, satu kali evaluasi untuk semua penyakit).
+    DIAGNOSIS_ENGINE: Literal["scalar", "vectorized"] = "scalar"
+
+    # Jumlah maksimum kasus dalam satu request POST /diagnosis/batch.
+    DIAGNOSIS_BATCH_MAX_SIZE: int = 1000
+
+    # Cache hasil diagnosis (LRU). Ukuran 0 menonaktifkan cache; TTL dalam detik,
+    # None berarti entri hanya dibuang ketika cache penuh.
+    DIAGNOSIS_CACHE_SIZE: int = 1024
+    DIAGNOSIS_CACHE_TTL: int | None = 300
+
+    # Jumlah maksimum sesi diagnosis interaktif yang disimpan di memori, dan lama
+    # (detik) sesi boleh tidak aktif sebelum dihapus.
+    DIAGNOSIS_SESSION_MAX: int = 1000
+    DIAGNOSIS_SESSION_IDLE_TIMEOUT: int = 1800
+
+    @property
+    def db_pool_mode(self) -> Literal["pool", "serverless"]:
+        if self.DB_POOL_MODE != "auto":
+            return self.DB_POOL_MODE
+        return "serverless" if os.environ.get("VERCEL") else "pool"
 
     @computed_field
     @property
-    def db_url(self) -> PostgresDsn:
-        return PostgresDsn.build(
-            scheme=self.DB_DRIVER,
-            username=self.DB_USERNAME,
-            password=self.DB_PASSWORD,
-            host=self.DB_SERVER,
-            port=self.DB_PORT,
-            path=self.DB_DATABASE,
+    def db_url(self) -> str:
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
+        return str(
+            PostgresDsn.build(
+                scheme=self.DB_DRIVER,  # type: ignore[arg-type]
+                username=self.DB_USERNAME,
+                password=self.DB_PASSWORD,
+                host=self.DB_SERVER,  # type: ignore[arg-type]
+                port=self.DB_PORT,
+                path=self.DB_DATABASE,
+            )
         )
 
+    @property
+    def db_read_url(self) -> str | None:
+        return self.DATABASE_READ_URL or None
+
 
 def _singleton(cls):
     _instances = {}
@@ -1,13 +1,94 @@
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
+from app.db.consistency import mark_write
 from app.db.meta import meta
+from app.db.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedNullPool,
+    instrument_engine,
+)
+from app.db.query_log import instrument_query_log
+
+
+def get_pool_options() -> dict[str, Any]:
+    """Opsi pool engine sesuai ``settings.db_pool_mode``."""
+    if settings.db_pool_mode == "serverless":
+        return {"poolclass": InstrumentedNullPool}
+    return {
+        "poolclass": InstrumentedAsyncAdaptedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_POOL_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def create_engine(url: str) -> AsyncEngine:
+    """Membuat engine async dengan pool yang terinstrumentasi."""
+    new_engine = create_async_engine(url, future=True, **get_pool_options())
+    instrument_engine(new_engine.sync_engine)
+    instrument_query_log(new_engine.sync_engine)
+    if new_engine.dialect.name == "sqlite":
+        # Relasi memakai passive_deletes: penghapusan berantai diserahkan ke
+        # ON DELETE CASCADE, yang di SQLite harus diaktifkan per koneksi.
+        event.listen(new_engine.sync_engine, "connect", _configure_sqlite_connection)
+        # Unit of work memakai savepoint; driver sqlite3 baru membuka transaksi
+        # sebelum DML sehingga SAVEPOINT pertama akan menjadi transaksi terluar
+        # (RELEASE-nya langsung commit). Transaksi dibuka sendiri dengan BEGIN.
+        event.listen(new_engine.sync_engine, "begin", _begin_sqlite_transaction)
+    return new_engine
+
+
+def _configure_sqlite_connection(dbapi_connection, _connection_record) -> None:
+    # Mematikan pengelolaan transaksi bawaan sqlite3, lihat
+    # _begin_sqlite_transaction
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
 
-engine = create_async_engine(str(settings.db_url), future=True, poolclass=NullPool)
+
+def _begin_sqlite_transaction(connection) -> None:
+    # Langsung lewat cursor driver (seperti BEGIN di asyncpg), sehingga tidak
+    # ikut dihitung di query log
+    cursor = connection.connection.cursor()
+    cursor.execute("BEGIN")
+    cursor.close()
+
+
+engine = create_engine(settings.db_url)
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 
+# Engine baca: replika jika DATABASE_READ_URL diisi, selain itu database utama.
+read_engine = create_engine(settings.db_read_url) if settings.db_read_url else engine
+async_read_session_maker = async_sessionmaker(read_engine, expire_on_commit=False)
+
+if read_engine is not engine:
+    # Commit di database utama menandai request sebagai penulis, sehingga
+    # pembacaan berikutnya diarahkan ke database utama (read-your-writes).
+    event.listen(engine.sync_engine, "commit", lambda _conn: mark_write())
+
+
+async def dispose_engines() -> None:
+    """
+    Menutup koneksi pool engine utama dan engine baca. Perintah CLI harus
+    memanggilnya sebelum selesai: koneksi aiosqlite yang tersisa di pool
+    menahan proses agar tidak keluar.
+    """
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+
 
 class Base(DeclarativeBase):
     """Base for all models."""
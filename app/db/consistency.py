@@ -0,0 +1,34 @@
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class ReadConsistency:
+    """
+    Per-request routing state for read sessions.
+
+    ``prefer_primary`` is set when the client wrote recently (read-your-writes
+    window); ``wrote`` is set when this request commits on the primary.
+    """
+
+    prefer_primary: bool = False
+    wrote: bool = False
+
+
+read_consistency: ContextVar[ReadConsistency | None] = ContextVar(
+    "read_consistency", default=None
+)
+
+
+def mark_write() -> None:
+    """Records that the current request committed on the primary."""
+    if (consistency := read_consistency.get()) is not None:
+        consistency.wrote = True
+
+
+def reads_from_primary() -> bool:
+    """Whether read sessions of the current request must use the primary."""
+    consistency = read_consistency.get()
+    return consistency is not None and (
+        consistency.prefer_primary or consistency.wrote
+    )
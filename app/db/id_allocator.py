@@ -0,0 +1,197 @@
+import zlib
+from typing import Any, Generic, Iterable, TypeVar
+
+from fastapi import status
+from sqlalchemy import case, delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.id_counter import IdCounter
+from app.db.models.id_free import IdFree
+from app.utils.common import ErrorCode
+from app.utils.exceptions import AppExceptionError
+from app.utils.id_healper import IDHelper
+from app.utils.upsert import upsert
+
+ModelType = TypeVar("ModelType")
+
+
+class IdAllocator(Generic[ModelType]):
+    """
+    Mengalokasikan ID berurutan (``G001``, ``P0001``, ``R0000001``, ``PKR01``)
+    dari counter per prefix di tabel id_counter, tanpa membaca seluruh tabel.
+
+    Counter dinaikkan dengan satu ``UPDATE ... RETURNING`` di dalam transaksi
+    pemanggil. Baris counter terkunci sampai transaksi selesai, sehingga create
+    yang berjalan bersamaan tidak pernah mendapat ID yang sama (di SQLite
+    penulisan memang sudah berurutan). Jika ``IDConfig.reuse_freed`` aktif,
+    nomor milik data yang dihapus (tabel id_free) dipakai lebih dulu; di
+    PostgreSQL diambil dengan ``FOR UPDATE SKIP LOCKED`` agar transaksi lain
+    tidak saling menunggu.
+
+    Migrasi b3f1c7d2e950 mengisi counter dan id_free dari data yang sudah ada.
+    Untuk database tanpa migrasi tersebut (mis. dibuat dengan ``create_all``)
+    baris counter dibuat pada alokasi pertama dari nomor terbesar yang sudah
+    tersimpan, dan celah di bawahnya dimasukkan ke id_free.
+    """
+
+    def __init__(
+        self, session: AsyncSession, model: type[ModelType], helper: IDHelper
+    ):
+        self.session = session
+        self.model = model
+        self.helper = helper
+        self.config = helper.config
+
+    async def allocate(self, count: int = 1) -> list[str]:
+        """Mengalokasikan ``count`` ID baru, berurutan dari nomor terkecil."""
+        numbers = await self._pop_free(count) if self.config.reuse_freed else []
+        remaining = count - len(numbers)
+        if remaining:
+            last = await self._advance(remaining)
+            if last is None:
+                await self._initialize()
+                return [
+                    *map(self.helper.format_id, numbers),
+                    *await self.allocate(remaining),
+                ]
+            numbers.extend(range(last - remaining + 1, last + 1))
+
+        ids = [self.helper.format_id(number) for number in numbers]
+        if ids and len(ids[-1]) > self.config.length:
+            raise AppExceptionError(
+                self.config.error_messages["exhausted"].format(
+                    prefix=self.config.prefix
+                ),
+                error_code=ErrorCode.ID_EXHAUSTED,
+                status_code=status.HTTP_409_CONFLICT,
+            )
+        return ids
+
+    async def claim(self, ids: Iterable[str]) -> None:
+        """
+        Mencatat ID yang diberikan secara eksplisit agar tidak dialokasikan
+        lagi: counter dinaikkan ke nomor terbesar dan nomor tersebut dihapus
+        dari id_free. ID dengan format tidak valid diabaikan.
+        """
+        numbers = self._numbers(ids)
+        if not numbers:
+            return
+
+        highest = max(numbers)
+        query = (
+            update(IdCounter)
+            .where(IdCounter.prefix == self.config.prefix)
+            .values(
+                last_value=case(
+                    (IdCounter.last_value < highest, highest),
+                    else_=IdCounter.last_value,
+                )
+            )
+            .returning(IdCounter.last_value)
+            .execution_options(synchronize_session=False)
+        )
+        if await self.session.scalar(query) is None:
+            await self._initialize()
+            await self.session.execute(query)
+
+        if self.config.reuse_freed:
+            await self.session.execute(
+                delete(IdFree)
+                .where(
+                    IdFree.prefix == self.config.prefix, IdFree.value.in_(numbers)
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+    async def release(self, ids: Iterable[str]) -> None:
+        """Mengembalikan ID data yang dihapus ke id_free untuk dipakai ulang."""
+        numbers = self._numbers(ids)
+        if not numbers or not self.config.reuse_freed:
+            return
+        await upsert(
+            self.session,
+            IdFree,
+            [{"prefix": self.config.prefix, "value": number} for number in numbers],
+            index_elements=("prefix", "value"),
+        )
+
+    def _numbers(self, ids: Iterable[str]) -> set[int]:
+        return {
+            self.helper.parse_number(data_id)  # type: ignore[misc]
+            for data_id in map(str.strip, ids)
+            if self.helper.validate_format(data_id)[0]
+        }
+
+    async def _pop_free(self, count: int) -> list[int]:
+        candidates = (
+            select(IdFree.value)
+            .where(IdFree.prefix == self.config.prefix)
+            .order_by(IdFree.value)
+            .limit(count)
+            .with_for_update(skip_locked=True)
+        )
+        query = (
+            delete(IdFree)
+            .where(IdFree.prefix == self.config.prefix, IdFree.value.in_(candidates))
+            .returning(IdFree.value)
+            .execution_options(synchronize_session=False)
+        )
+        return sorted(await self.session.scalars(query))
+
+    async def _advance(self, count: int) -> int | None:
+        """Menaikkan counter sebanyak ``count``; None jika counter belum ada."""
+        return await self.session.scalar(
+            update(IdCounter)
+            .where(IdCounter.prefix == self.config.prefix)
+            .values(last_value=IdCounter.last_value + count)
+            .returning(IdCounter.last_value)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _initialize(self) -> None:
+        """
+        Membuat counter dari ID yang sudah tersimpan (sekali per prefix).
+
+        Dijalankan di bawah lock per prefix, lalu memeriksa ulang apakah counter
+        sudah dibuat transaksi lain selama menunggu: hasil pemindaian sebelum
+        lock bisa sudah usang (nomor di id_free mungkin sudah dipakai).
+        """
+        await self._lock()
+        existing = await self.session.scalar(
+            select(IdCounter.last_value).where(
+                IdCounter.prefix == self.config.prefix
+            )
+        )
+        if existing is not None:
+            return
+
+        column: Any = getattr(self.model, self.helper.field_id)
+        numbers = self._numbers(await self.session.scalars(select(column)))
+        last = max(numbers, default=0)
+        await upsert(
+            self.session,
+            IdCounter,
+            [{"prefix": self.config.prefix, "last_value": last}],
+            index_elements=("prefix",),
+        )
+        if self.config.reuse_freed:
+            await upsert(
+                self.session,
+                IdFree,
+                [
+                    {"prefix": self.config.prefix, "value": number}
+                    for number in sorted(set(range(1, last + 1)) - numbers)
+                ],
+                index_elements=("prefix", "value"),
+            )
+
+    async def _lock(self) -> None:
+        """
+        Lock transaksi untuk prefix ini. Di PostgreSQL memakai advisory lock
+        karena baris counter yang akan dikunci belum ada; SQLite sudah memegang
+        lock tulis database sejak ``_advance``.
+        """
+        if self.session.get_bind().dialect.name != "postgresql":
+            return
+        key = zlib.crc32(f"id_counter:{self.config.prefix}".encode())
+        await self.session.execute(select(func.pg_advisory_xact_lock(key)))
@@ -0,0 +1,33 @@
+"""
+Profil loader relasi.
+
+Semua relasi model dideklarasikan ``lazy="raise_on_sql"``: tidak ada relasi yang
+dimuat kecuali diminta secara eksplisit. Setiap route/manager memilih profil
+yang sesuai dengan skema respons yang dikembalikan, sehingga jumlah query per
+endpoint tetap dan dapat diprediksi.
+"""
+
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.base import ExecutableOption
+
+from app.db.models.gejala import Gejala
+from app.db.models.rule import Rule
+from app.db.models.rule_cf import RuleCf
+
+LoaderProfile = tuple[ExecutableOption, ...]
+
+# Tanpa relasi: PenyakitRead, PakarRead, KelompokRead, SimpleGejalaRead
+NONE: LoaderProfile = ()
+
+# GejalaRead
+GEJALA_READ: LoaderProfile = (selectinload(Gejala.kelompoks),)
+
+# RuleByGejalaRead, RuleByPenyakitRead
+RULE_CFS: LoaderProfile = (selectinload(Rule.rule_cfs).selectinload(RuleCf.pakar),)
+
+# RuleRead
+RULE_READ: LoaderProfile = (
+    selectinload(Rule.penyakit),
+    selectinload(Rule.gejala).selectinload(Gejala.kelompoks),
+    *RULE_CFS,
+)
@@ -0,0 +1,48 @@
+"""add rule cf aggregate
+
+Revision ID: 046c88319ee7
+Revises: ab951e818105
+Create Date: 2026-10-16 09:12:41.507318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '046c88319ee7'
+down_revision: Union[str, None] = 'ab951e818105'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rule_cf_aggregate',
+    sa.Column('id_rule', sa.VARCHAR(length=8), nullable=False),
+    sa.Column('cf_count', sa.Integer(), nullable=False),
+    sa.Column('cf_sum', sa.Double(precision=53), nullable=False),
+    sa.Column('cf_avg', sa.Double(precision=53), nullable=False),
+    sa.Column('cf_min', sa.Double(precision=53), nullable=False),
+    sa.Column('cf_max', sa.Double(precision=53), nullable=False),
+    sa.ForeignKeyConstraint(['id_rule'], ['rule.id'], name=op.f('fk_rule_cf_aggregate_id_rule_rule'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id_rule', name=op.f('pk_rule_cf_aggregate'))
+    )
+
+    # Backfill dari data rule_cf yang sudah ada
+    op.execute(
+        """
+        INSERT INTO rule_cf_aggregate
+            (id_rule, cf_count, cf_sum, cf_avg, cf_min, cf_max)
+        SELECT id_rule, COUNT(*), SUM(nilai), AVG(nilai), MIN(nilai), MAX(nilai)
+        FROM rule_cf
+        GROUP BY id_rule
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rule_cf_aggregate')
@@ -0,0 +1,58 @@
+"""add rule, rule_cf and kelompok_gejala indexes
+
+Revision ID: 70cf6ab3d86e
+Revises: 046c88319ee7
+Create Date: 2026-10-16 10:41:08.215942
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '70cf6ab3d86e'
+down_revision: Union[str, None] = '046c88319ee7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not context.is_offline_mode():
+        _check_duplicate_rules()
+
+    op.create_unique_constraint(op.f('uq_rule_id_gejala'), 'rule', ['id_gejala', 'id_penyakit'])
+    op.create_index(op.f('ix_rule_id_penyakit'), 'rule', ['id_penyakit'], unique=False)
+    op.create_index(op.f('ix_rule_cf_id_pakar'), 'rule_cf', ['id_pakar'], unique=False)
+    op.create_index(op.f('ix_kelompok_gejala_id_kelompok'), 'kelompok_gejala', ['id_kelompok'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_kelompok_gejala_id_kelompok'), table_name='kelompok_gejala')
+    op.drop_index(op.f('ix_rule_cf_id_pakar'), table_name='rule_cf')
+    op.drop_index(op.f('ix_rule_id_penyakit'), table_name='rule')
+    op.drop_constraint(op.f('uq_rule_id_gejala'), 'rule', type_='unique')
+
+
+def _check_duplicate_rules() -> None:
+    # Unique constraint gagal dibuat jika masih ada aturan ganda; tampilkan
+    # pasangan yang perlu dibereskan lebih dulu.
+    duplicates = op.get_bind().execute(
+        sa.text(
+            """
+            SELECT id_gejala, id_penyakit, COUNT(*)
+            FROM rule
+            GROUP BY id_gejala, id_penyakit
+            HAVING COUNT(*) > 1
+            """
+        )
+    ).all()
+    if duplicates:
+        pairs = ', '.join(f'{g}-{p} ({n}x)' for g, p, n in duplicates)
+        raise RuntimeError(
+            f'Aturan ganda untuk pasangan gejala-penyakit: {pairs}. '
+            'Hapus aturan ganda sebelum menjalankan migrasi ini.'
+        )
@@ -0,0 +1,72 @@
+"""add id_counter and id_free
+
+Revision ID: b3f1c7d2e950
+Revises: 70cf6ab3d86e
+Create Date: 2026-10-16 13:05:22.418390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f1c7d2e950'
+down_revision: Union[str, None] = '70cf6ab3d86e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (prefix, tabel, panjang ID maksimum) setiap seri ID, sesuai IDConfig manager
+ID_SERIES = [
+    ('G', 'gejala', 5),
+    ('P', 'penyakit', 5),
+    ('PKR', 'pakar', 5),
+    ('R', 'rule', 8),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    id_counter = op.create_table('id_counter',
+    sa.Column('prefix', sa.VARCHAR(length=5), nullable=False),
+    sa.Column('last_value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('prefix', name=op.f('pk_id_counter'))
+    )
+    id_free = op.create_table('id_free',
+    sa.Column('prefix', sa.VARCHAR(length=5), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('prefix', 'value', name=op.f('pk_id_free'))
+    )
+
+    # Backfill dari ID yang sudah ada: counter berisi nomor terbesar dan celah
+    # di bawahnya masuk id_free (sama seperti IdAllocator._initialize), agar
+    # create pertama setelah deploy tidak membangunnya secara bersamaan.
+    conn = op.get_bind()
+    counters = []
+    free = []
+    for prefix, table, length in ID_SERIES:
+        numbers = set()
+        for (raw_id,) in conn.execute(sa.text(f"SELECT id FROM {table}")):
+            data_id = raw_id.strip()
+            digits = data_id[len(prefix):]
+            if (
+                len(data_id) <= length
+                and data_id.startswith(prefix)
+                and digits.isdigit()
+            ):
+                numbers.add(int(digits))
+        last = max(numbers, default=0)
+        counters.append({'prefix': prefix, 'last_value': last})
+        free.extend(
+            {'prefix': prefix, 'value': number}
+            for number in sorted(set(range(1, last + 1)) - numbers)
+        )
+    op.bulk_insert(id_counter, counters)
+    op.bulk_insert(id_free, free)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('id_free')
+    op.drop_table('id_counter')
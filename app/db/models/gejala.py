@@ -26,12 +26,14 @@ class Gejala(TimeStampMixin, Base):
         "Rule",
         back_populates="gejala",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
     kelompoks = relationship(
         "Kelompok",
         secondary=KelompokGejala.__table__,
         back_populates="gejalas",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
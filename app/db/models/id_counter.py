@@ -0,0 +1,17 @@
+from sqlalchemy import VARCHAR, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class IdCounter(Base):
+    """
+    Nomor terakhir yang dialokasikan untuk setiap prefix ID (mis. ``G`` untuk
+    gejala). Dinaikkan dengan ``UPDATE ... RETURNING`` oleh
+    ``app.db.id_allocator``.
+    """
+
+    __tablename__ = "id_counter"
+
+    prefix: Mapped[str] = mapped_column(VARCHAR(5), primary_key=True)
+    last_value: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -0,0 +1,13 @@
+from sqlalchemy import VARCHAR, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class IdFree(Base):
+    """Nomor ID yang telah dibebaskan dan dapat dialokasikan kembali."""
+
+    __tablename__ = "id_free"
+
+    prefix: Mapped[str] = mapped_column(VARCHAR(5), primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, primary_key=True)
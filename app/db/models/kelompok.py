@@ -19,5 +19,6 @@ class Kelompok(TimeStampMixin, Base):
         "Gejala",
         secondary=KelompokGejala.__table__,
         back_populates="kelompoks",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
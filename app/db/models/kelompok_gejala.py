@@ -21,4 +21,5 @@ class KelompokGejala(Base):
         primary_key=True,
         autoincrement=False,
         nullable=False,
+        index=True,
     )
@@ -19,5 +19,6 @@ class Pakar(TimeStampMixin, Base):
         "RuleCf",
         back_populates="pakar",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
@@ -28,5 +28,6 @@ class Penyakit(TimeStampMixin, Base):
         "Rule",
         back_populates="penyakit",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
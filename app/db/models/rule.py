@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import VARCHAR, ForeignKey
+from sqlalchemy import VARCHAR, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -11,6 +11,9 @@ if TYPE_CHECKING:
 
 class Rule(Base):
     __tablename__ = "rule"
+    # Satu aturan per pasangan gejala-penyakit. Kolom pertama id_gejala sehingga
+    # indeks yang sama melayani filter ``id_gejala IN (...)``.
+    __table_args__ = (UniqueConstraint("id_gejala", "id_penyakit"),)
 
     id: Mapped[str] = mapped_column(
         VARCHAR(8), primary_key=True, autoincrement=False, nullable=False
@@ -19,18 +22,20 @@ class Rule(Base):
         VARCHAR(5),
         ForeignKey("penyakit.id", ondelete="CASCADE"),
         nullable=True,
+        index=True,
     )
     id_gejala: Mapped[str] = mapped_column(
         VARCHAR(5), ForeignKey("gejala.id", ondelete="CASCADE"), nullable=True
     )
 
-    penyakit = relationship("Penyakit", back_populates="rules", lazy="selectin")
+    penyakit = relationship("Penyakit", back_populates="rules", lazy="raise_on_sql")
 
-    gejala = relationship("Gejala", back_populates="rules", lazy="selectin")
+    gejala = relationship("Gejala", back_populates="rules", lazy="raise_on_sql")
 
     rule_cfs = relationship(
         "RuleCf",
         back_populates="rule",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
@@ -23,8 +23,9 @@ class RuleCf(Base):
         ForeignKey("pakar.id", ondelete="CASCADE"),
         primary_key=True,
         nullable=False,
+        index=True,
     )
     nilai: Mapped[float] = mapped_column(Double(precision=53), nullable=False)
 
-    rule = relationship("Rule", back_populates="rule_cfs", lazy="selectin")
-    pakar = relationship("Pakar", back_populates="rule_cfs", lazy="selectin")
+    rule = relationship("Rule", back_populates="rule_cfs", lazy="raise_on_sql")
+    pakar = relationship("Pakar", back_populates="rule_cfs", lazy="raise_on_sql")
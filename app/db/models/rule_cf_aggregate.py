@@ -0,0 +1,26 @@
+from sqlalchemy import VARCHAR, Double, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RuleCfAggregate(Base):
+    """
+    Agregat nilai CF pakar per rule (jumlah, total, rata-rata, minimum dan
+    maksimum). Diperbarui setiap kali rule_cf sebuah rule berubah; rule tanpa
+    CF pakar tidak memiliki baris agregat.
+    """
+
+    __tablename__ = "rule_cf_aggregate"
+
+    id_rule: Mapped[str] = mapped_column(
+        VARCHAR(8),
+        ForeignKey("rule.id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+    cf_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    cf_sum: Mapped[float] = mapped_column(Double(precision=53), nullable=False)
+    cf_avg: Mapped[float] = mapped_column(Double(precision=53), nullable=False)
+    cf_min: Mapped[float] = mapped_column(Double(precision=53), nullable=False)
+    cf_max: Mapped[float] = mapped_column(Double(precision=53), nullable=False)
@@ -0,0 +1,106 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool
+
+
+@dataclass
+class PoolStats:
+    """Checkout counters and recent checkout wait times (ms) of a pool"""
+
+    checkouts: int = 0
+    checkins: int = 0
+    connects: int = 0
+    timeouts: int = 0
+    checked_out: int = 0
+    peak_checked_out: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    recent_wait_ms: deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+
+    def record_wait(self, wait_ms: float) -> None:
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        self.recent_wait_ms.append(wait_ms)
+
+    def wait_percentile(self, percentile: float) -> float:
+        if not self.recent_wait_ms:
+            return 0.0
+        samples = sorted(self.recent_wait_ms)
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        return samples[index]
+
+
+class _InstrumentedPoolMixin:
+    """
+    Times ``_do_get`` (the time a caller waits for a connection, including
+    establishing a new one) and counts timeouts.
+    """
+
+    stats: PoolStats
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            self.stats.record_wait((time.perf_counter() - start) * 1000)
+
+    def recreate(self):
+        pool = super().recreate()  # type: ignore[misc]
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedAsyncAdaptedQueuePool(
+    _InstrumentedPoolMixin, AsyncAdaptedQueuePool
+): ...
+
+
+class InstrumentedNullPool(_InstrumentedPoolMixin, NullPool): ...
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Registers connect/checkout/checkin listeners updating the pool stats."""
+
+    def stats() -> PoolStats | None:
+        return getattr(engine.pool, "stats", None)
+
+    @event.listens_for(engine, "connect")
+    def on_connect(*_):
+        if (pool_stats := stats()) is not None:
+            pool_stats.connects += 1
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(*_):
+        if (pool_stats := stats()) is not None:
+            pool_stats.checkouts += 1
+            pool_stats.checked_out += 1
+            pool_stats.peak_checked_out = max(
+                pool_stats.peak_checked_out, pool_stats.checked_out
+            )
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(*_):
+        if (pool_stats := stats()) is not None:
+            pool_stats.checkins += 1
+            pool_stats.checked_out = max(0, pool_stats.checked_out - 1)
+
+
+def pool_capacity(pool: Pool) -> int | None:
+    """Maximum number of simultaneous connections, or None if unbounded."""
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        max_overflow = pool._max_overflow  # noqa: SLF001
+        return None if max_overflow < 0 else pool.size() + max_overflow
+    return None
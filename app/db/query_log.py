@@ -0,0 +1,46 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass(slots=True)
+class QueryLog:
+    """SQL statements emitted while recording, with an optional query budget"""
+
+    statements: list[str] = field(default_factory=list)
+    budget: Optional[int] = None
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def exceeded(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+
+query_log: ContextVar[Optional[QueryLog]] = ContextVar("query_log", default=None)
+
+
+def instrument_query_log(engine: Engine) -> None:
+    """Appends every statement executed on ``engine`` to the active QueryLog."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def on_execute(_conn, _cursor, statement, *_):
+        if (log := query_log.get()) is not None:
+            log.statements.append(statement)
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryLog]:
+    """Records the statements executed in the current context."""
+    log = QueryLog()
+    token = query_log.set(log)
+    try:
+        yield log
+    finally:
+        query_log.reset(token)
@@ -0,0 +1,49 @@
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def sync_links(
+    session: AsyncSession,
+    model: Any,
+    owner_column: str,
+    owner_id: Any,
+    target_column: str,
+    target_ids: Iterable[Any],
+    current: Optional[Iterable[Any]] = None,
+) -> tuple[set[Any], set[Any]]:
+    """
+    Menyamakan baris tabel relasi many-to-many ``model`` milik ``owner_id``
+    dengan ``target_ids`` di dalam transaksi pemanggil.
+
+    Hanya selisihnya yang ditulis: satu ``DELETE ... WHERE target IN`` untuk
+    relasi yang dilepas dan satu ``INSERT`` multi-baris untuk relasi baru.
+    ``current`` dapat diberikan jika relasi saat ini sudah diketahui (misalnya
+    kosong untuk data baru) sehingga SELECT-nya dilewati.
+
+    Mengembalikan ``(ditambahkan, dihapus)``.
+    """
+    owner = getattr(model, owner_column)
+    target = getattr(model, target_column)
+
+    desired = set(target_ids)
+    if current is None:
+        current = await session.scalars(select(target).where(owner == owner_id))
+    current = set(current)
+
+    removed = current - desired
+    added = desired - current
+    if removed:
+        await session.execute(
+            delete(model)
+            .where(owner == owner_id, target.in_(removed))
+            .execution_options(synchronize_session=False)
+        )
+    if added:
+        await session.execute(
+            insert(model).values(
+                [{owner_column: owner_id, target_column: value} for value in added]
+            )
+        )
+    return added, removed
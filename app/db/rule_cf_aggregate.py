@@ -0,0 +1,92 @@
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.rule_cf import RuleCf
+from app.db.models.rule_cf_aggregate import RuleCfAggregate
+
+# Toleransi perbedaan nilai float saat membandingkan agregat dengan rule_cf
+TOLERANCE = 1e-9
+
+
+def aggregate_query(rule_ids: Optional[Iterable[str]] = None):
+    """SELECT agregat rule_cf per rule, opsional hanya untuk ``rule_ids``."""
+    query = select(
+        RuleCf.id_rule,
+        func.count(),
+        func.sum(RuleCf.nilai),
+        func.avg(RuleCf.nilai),
+        func.min(RuleCf.nilai),
+        func.max(RuleCf.nilai),
+    ).group_by(RuleCf.id_rule)
+    if rule_ids is not None:
+        query = query.where(RuleCf.id_rule.in_(rule_ids))
+    return query
+
+
+async def refresh_rule_cf_aggregates(
+    session: AsyncSession, rule_ids: Optional[Iterable[str]] = None
+) -> None:
+    """
+    Menghitung ulang agregat untuk ``rule_ids`` (atau seluruh rule jika None)
+    dengan satu DELETE dan satu INSERT ... SELECT di dalam transaksi pemanggil.
+    Perubahan ORM yang tertunda di-flush lebih dulu.
+    """
+    if rule_ids is not None:
+        rule_ids = list(set(rule_ids))
+        if not rule_ids:
+            return
+
+    await session.flush()
+
+    delete_query = delete(RuleCfAggregate)
+    if rule_ids is not None:
+        delete_query = delete_query.where(RuleCfAggregate.id_rule.in_(rule_ids))
+    await session.execute(delete_query)
+
+    await session.execute(
+        insert(RuleCfAggregate).from_select(
+            [
+                RuleCfAggregate.id_rule,
+                RuleCfAggregate.cf_count,
+                RuleCfAggregate.cf_sum,
+                RuleCfAggregate.cf_avg,
+                RuleCfAggregate.cf_min,
+                RuleCfAggregate.cf_max,
+            ],
+            aggregate_query(rule_ids),
+        )
+    )
+
+
+async def find_inconsistent_rule_ids(session: AsyncSession) -> list[str]:
+    """Mengembalikan ID rule yang agregatnya tidak sesuai dengan isi rule_cf."""
+    expected = {
+        row[0]: tuple(row[1:])
+        for row in (await session.execute(aggregate_query())).all()
+    }
+    stored = {
+        row[0]: tuple(row[1:])
+        for row in (
+            await session.execute(
+                select(
+                    RuleCfAggregate.id_rule,
+                    RuleCfAggregate.cf_count,
+                    RuleCfAggregate.cf_sum,
+                    RuleCfAggregate.cf_avg,
+                    RuleCfAggregate.cf_min,
+                    RuleCfAggregate.cf_max,
+                )
+            )
+        ).all()
+    }
+
+    inconsistent = []
+    for rule_id in expected.keys() | stored.keys():
+        a, b = expected.get(rule_id), stored.get(rule_id)
+        if a is None or b is None or any(
+            abs(x - y) > TOLERANCE for x, y in zip(a, b, strict=True)
+        ):
+            inconsistent.append(rule_id)
+    return sorted(inconsistent)
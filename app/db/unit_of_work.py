@@ -0,0 +1,82 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+# session.info: callback yang menunggu commit unit of work yang sedang berjalan
+_AFTER_COMMIT = "unit_of_work_after_commit"
+# session.info: unit of work yang sedang berjalan sudah menulis ke database
+_WROTE = "unit_of_work_wrote"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush(session: Session, _flush_context) -> None:
+    session.info[_WROTE] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml(state: ORMExecuteState) -> None:
+    # INSERT/UPDATE/DELETE yang dijalankan langsung (upsert, alokasi ID)
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[_WROTE] = True
+
+
+@asynccontextmanager
+async def unit_of_work(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    Satu transaksi untuk sekumpulan penulisan.
+
+    Pemanggilan terluar membuka transaksi, melakukan commit sekali di akhir
+    dan rollback seluruhnya jika terjadi exception. Pemanggilan di dalamnya
+    (misalnya operasi manager di dalam request) menjadi savepoint: perubahan
+    hanya di-flush, dan kegagalannya hanya membatalkan savepoint tersebut.
+
+    Jika tidak ada yang ditulis (request baca) transaksi cukup di-rollback
+    tanpa COMMIT, sehingga request tersebut juga tidak ditandai menulis oleh
+    read-your-writes.
+
+    Dependency ``get_async_session`` membungkus setiap request dengan unit of
+    work, sehingga manager cukup memakai ``unit_of_work`` dan ``on_commit``
+    tanpa memanggil ``commit`` sendiri. Di luar request (CLI, skrip) manager
+    yang sama membuka transaksinya sendiri.
+    """
+    if _AFTER_COMMIT in session.info:
+        async with session.begin_nested():
+            yield session
+        return
+
+    callbacks: list[Callable[[], None]] = []
+    session.info[_AFTER_COMMIT] = callbacks
+    session.info[_WROTE] = False
+    try:
+        yield session
+        # Perubahan yang belum di-flush ikut menandai penulisan
+        await session.flush()
+        if session.info[_WROTE]:
+            await session.commit()
+        else:
+            await session.rollback()
+    except BaseException:
+        await session.rollback()
+        raise
+    finally:
+        del session.info[_AFTER_COMMIT]
+        del session.info[_WROTE]
+
+    for callback in callbacks:
+        callback()
+
+
+def on_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Menjalankan ``callback`` (misalnya invalidasi cache) setelah unit of work
+    terluar berhasil di-commit; langsung jika tidak ada unit of work aktif.
+    Callback dibuang jika transaksi di-rollback.
+    """
+    callbacks = session.info.get(_AFTER_COMMIT)
+    if callbacks is None:
+        callback()
+    elif callback not in callbacks:
+        callbacks.append(callback)
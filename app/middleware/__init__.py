@@ -1,7 +1,21 @@
 from starlette.middleware import Middleware
 
+from app.core.config import settings
+from app.db.base import engine, read_engine
+
 from .pagination import PaginationMiddleware
+from .query_budget import QueryBudgetMiddleware
+from .read_your_writes import ReadYourWritesMiddleware
 
-__all__ = ("PaginationMiddleware", "middleware")
+__all__ = (
+    "PaginationMiddleware",
+    "QueryBudgetMiddleware",
+    "ReadYourWritesMiddleware",
+    "middleware",
+)
 
 middleware = [Middleware(PaginationMiddleware)]
+if read_engine is not engine:
+    middleware.append(Middleware(ReadYourWritesMiddleware))
+if settings.DB_QUERY_BUDGET != "off":
+    middleware.append(Middleware(QueryBudgetMiddleware))
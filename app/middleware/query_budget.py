@@ -0,0 +1,50 @@
+import logging
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.db.query_log import record_queries
+from app.utils.common import ErrorCode
+from app.utils.exceptions import AppExceptionError
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_BUDGET_HEADER = "X-DB-Query-Budget"
+
+
+class QueryBudgetMiddleware(BaseHTTPMiddleware):
+    """
+    Menghitung query SQL yang dijalankan selama request dan membandingkannya
+    dengan batas yang ditetapkan route melalui dependency ``query_budget``.
+    """
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        with record_queries() as log:
+            response = await call_next(request)
+
+        if log.exceeded:
+            logger.warning(
+                f"{request.method} {request.url.path} menjalankan {log.count} "
+                f"query (batas {log.budget}):\n" + "\n".join(log.statements)
+            )
+            if settings.DB_QUERY_BUDGET == "enforce":
+                response = JSONResponse(
+                    AppExceptionError(
+                        f"Route menjalankan {log.count} query, melebihi batas "
+                        f"{log.budget}.",
+                        error_code=ErrorCode.QUERY_BUDGET_EXCEEDED,
+                    ).dump(),
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
+
+        response.headers[QUERY_COUNT_HEADER] = str(log.count)
+        if log.budget is not None:
+            response.headers[QUERY_BUDGET_HEADER] = str(log.budget)
+        return response
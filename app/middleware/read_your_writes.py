@@ -0,0 +1,46 @@
+import time
+
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.db.consistency import ReadConsistency, read_consistency
+
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+
+def _cookie_active(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """
+    Setelah request yang menulis ke database utama, klien diberi cookie sehingga
+    request berikutnya selama ``DB_READ_YOUR_WRITES_WINDOW`` detik membaca dari
+    database utama, bukan dari replika yang mungkin tertinggal.
+    """
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        consistency = ReadConsistency(prefer_primary=_cookie_active(request))
+        token = read_consistency.set(consistency)
+        try:
+            response = await call_next(request)
+        finally:
+            read_consistency.reset(token)
+
+        window = settings.DB_READ_YOUR_WRITES_WINDOW
+        if consistency.wrote and window > 0:
+            response.set_cookie(
+                READ_PRIMARY_COOKIE,
+                str(time.time() + window),
+                max_age=window,
+                httponly=True,
+                samesite="lax",
+            )
+        return response
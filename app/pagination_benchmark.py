@@ -0,0 +1,111 @@
+# CARA MENJALANKAN, DARI ROOT DIREKTORI, JALANKAN DI TERMINAL:
+# python3 -m app.pagination_benchmark run
+# atau dengan ukuran tabel dan jumlah pengulangan tertentu:
+# python3 -m app.pagination_benchmark run --sizes=10000,100000 --repeat=50
+#
+# PERINGATAN: setiap ukuran mengisi ulang database yang dikonfigurasi dengan data
+# sintetis (lihat app.query_plan seed). Gunakan database lokal, mis.
+# DATABASE_URL=sqlite+aiosqlite:///./bench.db atau PostgreSQL lokal.
+
+import statistics
+import time
+
+import fire
+from rich.console import Console
+from rich.table import Table
+from sqlalchemy import select
+from starlette.requests import Request
+
+from app.db.base import async_session_maker, engine
+from app.db.models.rule import Rule
+from app.middleware.pagination import request_object
+from app.query_plan import QueryPlanCommand
+from app.utils.pagination import CountStrategy, paginate
+
+console = Console()
+
+# Jumlah gejala (dan aturan per penyakit) saat seed; jumlah aturan = ukuran.
+GEJALA_PER_SIZE = 1000
+
+
+async def _time_page(
+    page: int, per_page: int, strategy: CountStrategy, repeat: int
+) -> float:
+    """Median waktu (ms) satu panggilan paginate untuk halaman ``page``."""
+    samples = []
+    async with async_session_maker() as session:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await paginate(
+                session, select(Rule), page, per_page, count_strategy=strategy
+            )
+            samples.append((time.perf_counter() - start) * 1000)
+            session.expunge_all()
+    return statistics.median(samples)
+
+
+class PaginationBenchmarkCommand:
+    """Membandingkan COUNT(*) terpisah dengan count(*) OVER () pada paginasi."""
+
+    async def run(
+        self,
+        sizes: int | tuple[int, ...] = (10_000, 100_000, 1_000_000),
+        per_page: int = 20,
+        repeat: int = 20,
+    ):
+        """
+        Mengisi tabel rule dengan setiap ukuran lalu mengukur median waktu
+        paginate halaman pertama, tengah, dan terakhir untuk kedua strategi.
+
+        Args:
+            sizes (int | tuple[int, ...]): Jumlah baris tabel rule yang diuji.
+            per_page (int): Jumlah item per halaman.
+            repeat (int): Jumlah pengulangan per pengukuran.
+        """
+        if isinstance(sizes, int):
+            sizes = (sizes,)
+        # Paginator membangun URL halaman berikutnya dari request aktif
+        request_object.set(
+            Request(
+                {
+                    "type": "http",
+                    "scheme": "http",
+                    "server": ("localhost", 80),
+                    "path": "/rules",
+                    "query_string": b"",
+                    "headers": [],
+                }
+            )
+        )
+        table = Table("Baris", "Halaman", "subquery (ms)", "window (ms)", "Selisih")
+        for size in sizes:
+            await QueryPlanCommand().seed(
+                penyakit=max(1, size // GEJALA_PER_SIZE),
+                gejala=GEJALA_PER_SIZE,
+                rules_per_penyakit=min(size, GEJALA_PER_SIZE),
+                pakar=1,
+                kelompok=1,
+            )
+            last_page = max(1, -(-size // per_page))
+            for label, page in (
+                ("pertama", 1),
+                ("tengah", max(1, last_page // 2)),
+                ("terakhir", last_page),
+            ):
+                subquery = await _time_page(page, per_page, "subquery", repeat)
+                window = await _time_page(page, per_page, "window", repeat)
+                table.add_row(
+                    f"{size:,}",
+                    f"{label} ({page})",
+                    f"{subquery:.2f}",
+                    f"{window:.2f}",
+                    f"{(window - subquery) / subquery:+.0%}",
+                )
+            await engine.dispose()
+
+        console.print(f"Dialek: {engine.dialect.name}, per_page={per_page}")
+        console.print(table)
+
+
+if __name__ == "__main__":
+    fire.Fire(PaginationBenchmarkCommand)
@@ -0,0 +1,112 @@
+# CARA MENJALANKAN, DARI ROOT DIREKTORI, JALANKAN DI TERMINAL:
+# python3 -m app.query_budget check
+# atau untuk menampilkan semua route (termasuk yang tidak melanggar batas):
+# python3 -m app.query_budget check --verbose=True
+#
+# Route GET dijalankan terhadap database yang dikonfigurasi (gunakan database
+# hasil seeder). Query SQL yang dijalankan route yang melanggar batas dicatat di
+# log oleh QueryBudgetMiddleware.
+
+import sys
+from typing import TYPE_CHECKING, Iterator
+
+import fire
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from rich.console import Console
+from rich.table import Table
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from fastapi.testclient import TestClient
+    from httpx import Response
+
+console = Console()
+
+# Endpoint daftar yang item pertamanya menjadi contoh ID untuk parameter path
+SAMPLE_SOURCES = {
+    "gejala_id": "/gejala?per_page=1",
+    "penyakit_id": "/penyakit?per_page=1",
+    "rule_id": "/rules?per_page=1",
+    "pakar_id": "/pakar",
+}
+
+
+def run_get_routes(
+    app: FastAPI, client: "TestClient"
+) -> Iterator[tuple[str, "Response | None"]]:
+    """
+    Menjalankan setiap route GET ``app`` sekali dan menghasilkan ``(path,
+    response)``. Parameter path diisi ID item pertama dari ``SAMPLE_SOURCES``;
+    route dengan parameter lain dilewati (response None).
+    """
+    prefix = f"/api/{settings.API_V1_STR}"
+    samples = {
+        param: client.get(prefix + source).json()["items"][0]["id"]
+        for param, source in SAMPLE_SOURCES.items()
+    }
+
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or "GET" not in route.methods:
+            continue
+        if not set(route.param_convertors) <= set(samples):
+            yield route.path, None
+            continue
+        yield route.path, client.get(route.path.format(**samples))
+
+
+class QueryBudgetCommand:
+    """Memeriksa jumlah query SQL setiap route GET terhadap batasnya."""
+
+    def check(self, verbose: bool = False):
+        """
+        Menjalankan setiap route GET sekali dan membandingkan jumlah query yang
+        dijalankan dengan batas ``query_budget`` route tersebut.
+
+        Args:
+            verbose (bool): Jika True, tampilkan semua route.
+        """
+        # Middleware dipasang saat app diimpor, jadi mode diatur lebih dulu.
+        if settings.DB_QUERY_BUDGET == "off":
+            settings.DB_QUERY_BUDGET = "warn"
+
+        from fastapi.testclient import TestClient
+
+        from app.middleware.query_budget import (
+            QUERY_BUDGET_HEADER,
+            QUERY_COUNT_HEADER,
+        )
+        from main import app
+
+        table = Table("Route", "Status", "Query", "Batas")
+        failed = 0
+        with TestClient(app) as client:
+            for path, response in run_get_routes(app, client):
+                if response is None:
+                    console.print(f"[yellow]Dilewati: {path}[/yellow]")
+                    continue
+
+                count = int(response.headers[QUERY_COUNT_HEADER])
+                budget = response.headers.get(QUERY_BUDGET_HEADER)
+                exceeded = budget is not None and count > int(budget)
+                failed += exceeded
+                if verbose or exceeded:
+                    style = "red" if exceeded else ""
+                    table.add_row(
+                        path,
+                        str(response.status_code),
+                        f"[{style}]{count}[/{style}]" if style else str(count),
+                        budget or "-",
+                    )
+
+        if table.row_count:
+            console.print(table)
+        if failed:
+            console.print(f"[red]{failed} route melebihi batas query.[/red]")
+            sys.exit(1)
+        console.print("[green]Semua route berada dalam batas query.[/green]")
+
+
+if __name__ == "__main__":
+    fire.Fire(QueryBudgetCommand)
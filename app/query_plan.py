@@ -0,0 +1,320 @@
+# CARA MENJALANKAN, DARI ROOT DIREKTORI, JALANKAN DI TERMINAL:
+# python3 -m app.query_plan seed
+# atau dengan ukuran data tertentu:
+# python3 -m app.query_plan seed --penyakit=1000 --gejala=5000 --pakar=20
+# lalu periksa rencana eksekusi query yang sering dipakai:
+# python3 -m app.query_plan check --max_seq_scan_rows=1000
+#
+# PERINGATAN: "seed" menghapus seluruh data di database yang dikonfigurasi.
+# Gunakan database lokal (mis. DATABASE_URL=sqlite+aiosqlite:///./plan.db).
+
+import json
+import random
+import sys
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+import fire
+from rich.console import Console
+from rich.table import Table
+from sqlalchemy import Select, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import async_session_maker, create_db_and_tables, engine
+from app.db.meta import meta
+from app.db.models.gejala import Gejala
+from app.db.models.kelompok import Kelompok
+from app.db.models.kelompok_gejala import KelompokGejala
+from app.db.models.pakar import Pakar
+from app.db.models.penyakit import Penyakit
+from app.db.models.rule import Rule
+from app.db.models.rule_cf import RuleCf
+from app.db.rule_cf_aggregate import refresh_rule_cf_aggregates
+from app.seeder import clear_database
+
+console = Console()
+
+CHUNK_SIZE = 5000
+
+
+@dataclass
+class Samples:
+    """ID contoh yang dipakai sebagai parameter query saat EXPLAIN."""
+
+    gejala_ids: list[str]
+    rule_ids: list[str]
+    penyakit_id: str
+    pakar_id: str
+    kelompok_id: int
+    rule_gejala_id: str
+    rule_penyakit_id: str
+
+
+def hot_queries(samples: Samples) -> dict[str, Select]:
+    """Query dengan filter yang paling sering dijalankan aplikasi."""
+    return {
+        "rule: id_gejala IN (...)": select(
+            Rule.id, Rule.id_penyakit, Rule.id_gejala
+        ).where(Rule.id_gejala.in_(samples.gejala_ids)),
+        "rule: id_penyakit = ?": select(Rule).where(
+            Rule.id_penyakit == samples.penyakit_id
+        ),
+        "rule: cek duplikat (id_penyakit, id_gejala)": select(Rule).where(
+            Rule.id_penyakit == samples.rule_penyakit_id,
+            Rule.id_gejala == samples.rule_gejala_id,
+        ),
+        "rule_cf: id_rule IN (...)": select(RuleCf).where(
+            RuleCf.id_rule.in_(samples.rule_ids)
+        ),
+        "rule_cf: id_pakar = ?": select(RuleCf.id_rule).where(
+            RuleCf.id_pakar == samples.pakar_id
+        ),
+        "kelompok_gejala: id_kelompok = ?": select(Gejala)
+        .join(Gejala.kelompoks)
+        .where(Kelompok.id == samples.kelompok_id),
+    }
+
+
+async def _insert_chunked(
+    session: AsyncSession, model: Any, rows: list[dict[str, Any]]
+) -> None:
+    for start in range(0, len(rows), CHUNK_SIZE):
+        await session.execute(insert(model), rows[start : start + CHUNK_SIZE])
+
+
+async def _load_samples(session: AsyncSession) -> Samples:
+    gejala_ids = list(
+        await session.scalars(select(Gejala.id).order_by(Gejala.id).limit(20))
+    )
+    rules = (await session.execute(select(Rule).limit(20))).scalars().all()
+    if not gejala_ids or not rules:
+        console.print("[red]Database kosong. Jalankan perintah seed dulu.[/red]")
+        sys.exit(1)
+    return Samples(
+        gejala_ids=gejala_ids,
+        rule_ids=[rule.id for rule in rules],
+        penyakit_id=rules[0].id_penyakit,
+        pakar_id=await session.scalar(select(Pakar.id).limit(1)),  # type: ignore[arg-type]
+        kelompok_id=await session.scalar(select(Kelompok.id).limit(1)),  # type: ignore[arg-type]
+        rule_gejala_id=rules[-1].id_gejala,
+        rule_penyakit_id=rules[-1].id_penyakit,
+    )
+
+
+async def _explain(session: AsyncSession, sql: str) -> list[tuple[str, str]]:
+    """
+    Menjalankan EXPLAIN dan mengembalikan daftar (jenis scan, tabel) untuk
+    setiap akses tabel. Jenis scan "seq" berarti seluruh tabel dibaca.
+    """
+    # Driver SQL: text() akan membaca ":" di dalam literal sebagai parameter bind
+    connection = await session.connection()
+    if engine.dialect.name == "sqlite":
+        rows = (await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")).all()
+        scans = []
+        for row in rows:
+            detail = row[-1].split()
+            # "SCAN tabel" membaca seluruh tabel (atau seluruh indeks),
+            # "SEARCH tabel USING INDEX ..." memakai indeks.
+            if detail and detail[0] in ("SCAN", "SEARCH"):
+                kind = "seq" if detail[0] == "SCAN" else "index"
+                scans.append((kind, _table_name(detail[1])))
+        return scans
+
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return list(_walk_postgres_plan(plan[0]["Plan"]))  # type: ignore[index]
+
+
+def _table_name(name: str) -> str:
+    """SQLite menampilkan alias tabel (mis. ``kelompok_gejala_1``)."""
+    if name not in meta.tables:
+        name = name.rsplit("_", 1)[0]
+    return name
+
+
+def _walk_postgres_plan(node: dict[str, Any]) -> Iterable[tuple[str, str]]:
+    if "Relation Name" in node:
+        kind = "seq" if node["Node Type"] == "Seq Scan" else "index"
+        yield kind, node["Relation Name"]
+    for child in node.get("Plans", ()):
+        yield from _walk_postgres_plan(child)
+
+
+async def _check_queries(
+    session: AsyncSession, table: Table, max_seq_scan_rows: int
+) -> int:
+    """Mengisi ``table`` dan mengembalikan jumlah query yang melanggar batas."""
+    samples = await _load_samples(session)
+    row_counts: dict[str, int] = {}
+    failed = 0
+    for name, query in hot_queries(samples).items():
+        sql = str(
+            query.compile(
+                dialect=engine.dialect, compile_kwargs={"literal_binds": True}
+            )
+        )
+        violations = []
+        accesses = []
+        for kind, table_name in await _explain(session, sql):
+            if table_name not in row_counts:
+                row_counts[table_name] = await session.scalar(
+                    select(func.count()).select_from(text(table_name))
+                )  # type: ignore[assignment]
+            accesses.append(f"{kind}:{table_name}")
+            if kind == "seq" and row_counts[table_name] > max_seq_scan_rows:
+                violations.append(f"{table_name} ({row_counts[table_name]})")
+
+        failed += bool(violations)
+        table.add_row(
+            name,
+            ", ".join(accesses),
+            f"[red]seq scan: {', '.join(violations)}[/red]"
+            if violations
+            else "[green]OK[/green]",
+        )
+    return failed
+
+
+class QueryPlanCommand:
+    """Harness rencana eksekusi (EXPLAIN) untuk query yang sering dipakai."""
+
+    async def seed(
+        self,
+        penyakit: int = 500,
+        gejala: int = 2000,
+        rules_per_penyakit: int = 40,
+        pakar: int = 10,
+        kelompok: int = 20,
+        random_seed: int = 0,
+    ):
+        """
+        Menghapus data lalu mengisi database dengan data sintetis berukuran besar.
+
+        Args:
+            penyakit (int): Jumlah penyakit (maks. 9999).
+            gejala (int): Jumlah gejala (maks. 9999).
+            rules_per_penyakit (int): Jumlah aturan per penyakit.
+            pakar (int): Jumlah pakar (maks. 99); setiap pakar menilai semua aturan.
+            kelompok (int): Jumlah kelompok gejala.
+            random_seed (int): Seed generator acak.
+        """
+        if penyakit > 9999 or gejala > 9999 or pakar > 99:
+            console.print("[red]Jumlah melebihi format ID yang tersedia.[/red]")
+            sys.exit(1)
+        rules_per_penyakit = min(rules_per_penyakit, gejala)
+        rng = random.Random(random_seed)
+
+        await create_db_and_tables()
+        await clear_database(async_session_maker)
+
+        gejala_ids = [f"G{i:04d}" for i in range(1, gejala + 1)]
+        penyakit_ids = [f"P{i:04d}" for i in range(1, penyakit + 1)]
+        pakar_ids = [f"PKR{i:02d}" for i in range(1, pakar + 1)]
+
+        rules = []
+        for id_penyakit in penyakit_ids:
+            for id_gejala in rng.sample(gejala_ids, rules_per_penyakit):
+                rules.append(
+                    {
+                        "id": f"R{len(rules) + 1:07d}",
+                        "id_penyakit": id_penyakit,
+                        "id_gejala": id_gejala,
+                    }
+                )
+
+        async with async_session_maker() as session:
+            await _insert_chunked(
+                session,
+                Kelompok,
+                [
+                    {"id": i, "nama": f"Kelompok {i}", "deskripsi": ""}
+                    for i in range(1, kelompok + 1)
+                ],
+            )
+            await _insert_chunked(
+                session,
+                Pakar,
+                [{"id": id_, "nama": f"Pakar {id_}"} for id_ in pakar_ids],
+            )
+            await _insert_chunked(
+                session,
+                Penyakit,
+                [
+                    {"id": id_, "nama": f"Penyakit {id_}", "solusi": "-"}
+                    for id_ in penyakit_ids
+                ],
+            )
+            await _insert_chunked(
+                session,
+                Gejala,
+                [
+                    {"id": id_, "nama": f"Gejala {id_}", "pertanyaan": "?"}
+                    for id_ in gejala_ids
+                ],
+            )
+            await _insert_chunked(
+                session,
+                KelompokGejala,
+                [
+                    {"id_gejala": id_, "id_kelompok": rng.randint(1, kelompok)}
+                    for id_ in gejala_ids
+                ],
+            )
+            await _insert_chunked(session, Rule, rules)
+            await _insert_chunked(
+                session,
+                RuleCf,
+                [
+                    {
+                        "id_rule": rule["id"],
+                        "id_pakar": id_pakar,
+                        "nilai": round(rng.uniform(0.2, 1.0), 2),
+                    }
+                    for rule in rules
+                    for id_pakar in pakar_ids
+                ],
+            )
+            await refresh_rule_cf_aggregates(session)
+            await session.commit()
+
+        # Statistik tabel untuk query planner
+        async with engine.connect() as conn:
+            await conn.execute(text("ANALYZE"))
+            await conn.commit()
+        # Koneksi aiosqlite yang tersisa di pool menahan proses agar tidak keluar
+        await engine.dispose()
+
+        console.print(
+            f"[green]Seed selesai: {penyakit} penyakit, {gejala} gejala, "
+            f"{len(rules)} aturan, {len(rules) * pakar} rule_cf.[/green]"
+        )
+
+    async def check(self, max_seq_scan_rows: int = 1000):
+        """
+        Menjalankan EXPLAIN untuk setiap query dan gagal jika ada sequential
+        scan pada tabel dengan jumlah baris di atas ``max_seq_scan_rows``.
+
+        Args:
+            max_seq_scan_rows (int): Batas jumlah baris tabel untuk seq scan.
+        """
+        table = Table("Query", "Akses tabel", "Status")
+        try:
+            async with async_session_maker() as session:
+                failed = await _check_queries(session, table, max_seq_scan_rows)
+        finally:
+            await engine.dispose()
+
+        console.print(table)
+        if failed:
+            console.print(
+                f"[red]{failed} query memakai sequential scan pada tabel dengan "
+                f"lebih dari {max_seq_scan_rows} baris.[/red]"
+            )
+            sys.exit(1)
+        console.print("[green]Semua query memakai indeks.[/green]")
+
+
+if __name__ == "__main__":
+    fire.Fire(QueryPlanCommand)
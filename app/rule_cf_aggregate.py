@@ -0,0 +1,69 @@
+# CARA MENJALANKAN, DARI ROOT DIREKTORI, JALANKAN DI TERMINAL:
+# python3 -m app.rule_cf_aggregate check
+# atau untuk memperbaiki agregat yang tidak konsisten:
+# python3 -m app.rule_cf_aggregate check --fix=True
+# atau untuk membangun ulang seluruh agregat:
+# python3 -m app.rule_cf_aggregate rebuild
+
+import fire
+from rich.console import Console
+
+from app.db.base import async_session_maker, dispose_engines
+from app.db.models import load_all_models
+from app.db.rule_cf_aggregate import (
+    find_inconsistent_rule_ids,
+    refresh_rule_cf_aggregates,
+)
+
+console = Console()
+
+# Relasi antar model (RuleCf -> Rule, dst.) baru bisa dipetakan setelah semua
+# model diimpor
+load_all_models()
+
+
+class RuleCfAggregateCommand:
+    """Perintah pemeriksaan dan pembangunan ulang agregat CF per rule."""
+
+    async def check(self, fix: bool = False):
+        """
+        Memeriksa konsistensi agregat terhadap rule_cf.
+
+        Args:
+            fix (bool): Jika True, hitung ulang agregat rule yang tidak konsisten.
+        """
+        try:
+            async with async_session_maker() as session:
+                rule_ids = await find_inconsistent_rule_ids(session)
+                if not rule_ids:
+                    console.print(
+                        "[green]Semua agregat CF rule konsisten.[/green]"
+                    )
+                    return
+
+                console.print(
+                    f"[yellow]{len(rule_ids)} agregat rule tidak konsisten: "
+                    f"{', '.join(rule_ids)}[/yellow]"
+                )
+                if fix:
+                    await refresh_rule_cf_aggregates(session, rule_ids)
+                    await session.commit()
+                    console.print("[green]Agregat berhasil diperbaiki.[/green]")
+        finally:
+            await dispose_engines()
+
+    async def rebuild(self):
+        """Membangun ulang seluruh agregat CF rule dari rule_cf."""
+        try:
+            async with async_session_maker() as session:
+                await refresh_rule_cf_aggregates(session)
+                await session.commit()
+        finally:
+            await dispose_engines()
+        console.print(
+            "[green]Seluruh agregat CF rule berhasil dibangun ulang.[/green]"
+        )
+
+
+if __name__ == "__main__":
+    fire.Fire(RuleCfAggregateCommand)
@@ -0,0 +1,20 @@
+from pydantic import Field
+
+from app.schemas.base import BaseSchema
+
+
+class ImportRowError(BaseSchema):
+    """Kesalahan validasi satu baris file impor."""
+
+    row: int = Field(..., description="Nomor baris data (dimulai dari 1).")
+    id: str | None = Field(None, description="ID pada baris, jika ada.")
+    errors: list[str]
+
+
+class ImportResult(BaseSchema):
+    """Ringkasan hasil impor massal."""
+
+    total_rows: int = Field(..., description="Jumlah baris data yang dibaca.")
+    imported: int = Field(..., description="Jumlah baris yang ditulis.")
+    skipped: int = Field(..., description="Jumlah baris tidak valid yang dilewati.")
+    errors: list[ImportRowError] = Field(default_factory=list)
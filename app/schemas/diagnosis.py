@@ -1,5 +1,9 @@
+from datetime import datetime
+from typing import Any, Literal
+
 from pydantic import Field
 
+from app.core.config import settings
 from app.schemas.base import BaseSchema
 from app.schemas.gejala import SimpleGejalaRead
 from app.schemas.penyakit import PenyakitRead
@@ -61,3 +65,196 @@ class DiagnosisResult(BaseSchema):
     """Skema untuk hasil akhir diagnosis yang sudah diurutkan."""
 
     ranked_results: list[PenyakitResult]
+
+
+class PenyakitSummaryResult(BaseSchema):
+    """Skema ringkas satu hasil penyakit (tanpa teks panjang dan rincian bukti)."""
+
+    id: str
+    nama: str
+    certainty_score: float = Field(
+        ..., description="Skor akhir keyakinan dalam persentase (%)."
+    )
+    matching_gejala_count: int = Field(..., description="Jumlah gejala yang cocok.")
+
+
+class DiagnosisSummaryResult(BaseSchema):
+    """Skema ringkas hasil diagnosis yang sudah diurutkan."""
+
+    ranked_results: list[PenyakitSummaryResult]
+
+
+class DiagnosisOptions(BaseSchema):
+    """Opsi pemilihan dan bentuk hasil diagnosis."""
+
+    top_k: int | None = Field(
+        None, ge=1, description="Jumlah penyakit teratas. Kosong: semua penyakit."
+    )
+    min_score: float = Field(
+        0, ge=0, le=100, description="Skor keyakinan minimum (%) yang ditampilkan."
+    )
+    detail: Literal["summary", "full"] = Field(
+        "full",
+        description=(
+            "full: data penyakit lengkap dan rincian bukti. summary: hanya ID, nama "
+            "dan skor penyakit."
+        ),
+    )
+
+
+class DiagnosisBatchRequest(BaseSchema):
+    """Request body untuk diagnosis banyak kasus sekaligus."""
+
+    id_pakar: str | None = Field(
+        None,
+        description="ID pakar yang CF-nya digunakan. Kosong: rata-rata pakar.",
+    )
+    cases: list[dict[str, Any]] = Field(
+        ...,
+        max_length=settings.DIAGNOSIS_BATCH_MAX_SIZE,
+        description=(
+            "Daftar kasus dengan format yang sama dengan DiagnosisRequest. "
+            "Setiap kasus divalidasi secara terpisah."
+        ),
+    )
+    options: DiagnosisOptions = Field(
+        default_factory=DiagnosisOptions,
+        description="Opsi hasil yang berlaku untuk semua kasus.",
+    )
+
+
+class DiagnosisBatchItem(BaseSchema):
+    """Hasil diagnosis untuk satu kasus dalam batch."""
+
+    index: int = Field(..., description="Posisi kasus dalam request batch.")
+    result: DiagnosisResult | DiagnosisSummaryResult | None = Field(
+        None, description="Hasil diagnosis jika kasus berhasil dievaluasi."
+    )
+    error_code: str | None = Field(
+        None, description="Kode error jika kasus gagal dievaluasi."
+    )
+    messages: list[str] = Field(
+        default_factory=list, description="Pesan error jika kasus gagal dievaluasi."
+    )
+
+
+class DiagnosisBatchResult(BaseSchema):
+    """Skema untuk hasil diagnosis batch, berurutan sesuai request."""
+
+    results: list[DiagnosisBatchItem]
+    total_success: int = Field(..., description="Jumlah kasus yang berhasil.")
+    total_failed: int = Field(..., description="Jumlah kasus yang gagal.")
+
+
+class PakarScore(BaseSchema):
+    """Skor keyakinan satu pakar untuk sebuah penyakit."""
+
+    id_pakar: str
+    nama: str
+    certainty_score: float | None = Field(
+        None,
+        description=(
+            "Skor keyakinan pakar ini dalam persentase (%). Kosong jika pakar tidak "
+            "memberi CF untuk gejala yang cocok."
+        ),
+    )
+    matching_gejala_count: int = Field(
+        ..., description="Jumlah gejala cocok yang memiliki CF dari pakar ini."
+    )
+
+
+class PenyakitConsensusResult(BaseSchema):
+    """Skema untuk satu hasil penyakit pada diagnosis konsensus pakar."""
+
+    penyakit: PenyakitRead
+    certainty_score: float = Field(
+        ..., description="Skor keyakinan berdasarkan rata-rata CF pakar (%)."
+    )
+    pakar_scores: list[PakarScore] = Field(
+        default_factory=list, description="Skor keyakinan per pakar."
+    )
+    mean_score: float | None = Field(
+        None, description="Rata-rata skor pakar yang memberi penilaian (%)."
+    )
+    spread: float | None = Field(
+        None, description="Simpangan baku skor antar pakar (%)."
+    )
+    score_range: float | None = Field(
+        None, description="Selisih skor pakar tertinggi dan terendah (%)."
+    )
+
+
+class DiagnosisConsensusResult(BaseSchema):
+    """Skema untuk hasil diagnosis konsensus pakar yang sudah diurutkan."""
+
+    ranked_results: list[PenyakitConsensusResult]
+
+
+class DiagnosisSessionCreate(BaseSchema):
+    """Request body untuk membuat sesi diagnosis interaktif."""
+
+    id_pakar: str | None = Field(
+        None,
+        description="ID pakar yang CF-nya digunakan. Kosong: rata-rata pakar.",
+    )
+
+
+class DiagnosisSessionRead(BaseSchema):
+    """Skema untuk menampilkan status dan peringkat sesi diagnosis interaktif."""
+
+    id: str = Field(..., description="ID sesi diagnosis.")
+    id_pakar: str | None = Field(
+        None, description="ID pakar yang digunakan. Kosong: rata-rata pakar."
+    )
+    answers: list[UserGejalaInput] = Field(
+        default_factory=list, description="Jawaban gejala sesuai urutan diberikan."
+    )
+    created_at: datetime = Field(..., description="Waktu sesi dibuat.")
+    updated_at: datetime = Field(..., description="Waktu jawaban terakhir.")
+    result: DiagnosisResult = Field(
+        ..., description="Peringkat penyakit berdasarkan jawaban saat ini."
+    )
+
+
+class NextQuestionRequest(BaseSchema):
+    """Request body untuk meminta gejala berikutnya yang perlu ditanyakan."""
+
+    gejala_user: list[UserGejalaInput] = Field(
+        default_factory=list, description="Jawaban gejala yang sudah diberikan."
+    )
+    id_pakar: str | None = Field(
+        None,
+        description="ID pakar yang CF-nya digunakan. Kosong: rata-rata pakar.",
+    )
+    limit: int = Field(3, ge=1, le=20, description="Jumlah gejala yang disarankan.")
+    top_penyakit: int = Field(
+        5,
+        ge=2,
+        le=50,
+        description="Jumlah penyakit teratas yang ingin dibedakan.",
+    )
+
+
+class NextQuestion(BaseSchema):
+    """Satu gejala yang disarankan untuk ditanyakan berikutnya."""
+
+    gejala: SimpleGejalaRead = Field(
+        ..., description="Gejala beserta pertanyaan yang diajukan ke pengguna."
+    )
+    score: float = Field(
+        ...,
+        description=(
+            "Daya pembeda gejala: simpangan baku CF pakar gejala ini terhadap "
+            "penyakit kandidat."
+        ),
+    )
+
+
+class NextQuestionResult(BaseSchema):
+    """Skema untuk daftar gejala berikutnya yang disarankan."""
+
+    questions: list[NextQuestion]
+    candidate_penyakit_ids: list[str] = Field(
+        default_factory=list,
+        description="ID penyakit kandidat yang ingin dibedakan oleh pertanyaan.",
+    )
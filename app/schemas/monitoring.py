@@ -0,0 +1,78 @@
+from datetime import datetime
+
+from pydantic import Field
+
+from app.schemas.base import BaseSchema
+
+
+class KnowledgeBaseInfo(BaseSchema):
+    """Skema untuk menampilkan status basis pengetahuan yang sedang dimuat."""
+
+    version: int = Field(..., description="Versi basis pengetahuan yang aktif.")
+    built_at: datetime = Field(..., description="Waktu basis pengetahuan dibangun.")
+    build_time_ms: float = Field(
+        ..., description="Lama waktu pembangunan basis pengetahuan (ms)."
+    )
+    memory_bytes: int = Field(
+        ..., description="Perkiraan ukuran memori basis pengetahuan (byte)."
+    )
+    total_rules: int = Field(..., description="Jumlah aturan yang dikompilasi.")
+    total_penyakit: int = Field(..., description="Jumlah penyakit yang dimuat.")
+    total_gejala: int = Field(..., description="Jumlah gejala yang dimuat.")
+    total_pakar: int = Field(..., description="Jumlah pakar yang dimuat.")
+    stale: bool = Field(
+        False, description="True jika akan dibangun ulang pada akses berikutnya."
+    )
+
+
+class CacheInfo(BaseSchema):
+    """Skema untuk menampilkan statistik cache hasil diagnosis."""
+
+    size: int = Field(..., description="Jumlah entri yang tersimpan saat ini.")
+    max_size: int = Field(..., description="Jumlah maksimum entri.")
+    ttl: float | None = Field(
+        None, description="Umur maksimum entri (detik). Kosong: tanpa batas."
+    )
+    hits: int = Field(..., description="Jumlah permintaan yang dilayani dari cache.")
+    misses: int = Field(..., description="Jumlah permintaan yang dihitung ulang.")
+    evictions: int = Field(
+        ..., description="Jumlah entri yang dibuang karena cache penuh."
+    )
+    expirations: int = Field(
+        ..., description="Jumlah entri yang dibuang karena kedaluwarsa."
+    )
+    hit_ratio: float = Field(..., description="Rasio hits terhadap total akses.")
+
+
+class DbPoolInfo(BaseSchema):
+    """Skema untuk menampilkan status dan statistik pool koneksi database."""
+
+    mode: str = Field(..., description="Mode pool: pool atau serverless.")
+    pool_class: str = Field(..., description="Kelas pool SQLAlchemy yang dipakai.")
+    size: int | None = Field(None, description="Jumlah koneksi tetap di pool.")
+    max_overflow: int | None = Field(
+        None, description="Jumlah koneksi tambahan maksimum di atas size."
+    )
+    capacity: int | None = Field(
+        None, description="Jumlah koneksi bersamaan maksimum. Kosong: tanpa batas."
+    )
+    checked_out: int = Field(..., description="Koneksi yang sedang dipakai.")
+    idle: int | None = Field(None, description="Koneksi menganggur di pool.")
+    overflow: int | None = Field(None, description="Koneksi overflow saat ini.")
+    saturation: float | None = Field(
+        None, description="Rasio koneksi terpakai terhadap kapasitas (0-1)."
+    )
+    peak_checked_out: int = Field(
+        ..., description="Jumlah koneksi terpakai tertinggi sejak start."
+    )
+    checkouts: int = Field(..., description="Total koneksi diambil dari pool.")
+    connects: int = Field(..., description="Total koneksi baru ke database.")
+    timeouts: int = Field(..., description="Total timeout menunggu koneksi.")
+    wait_avg_ms: float = Field(..., description="Rata-rata waktu tunggu checkout.")
+    wait_p50_ms: float = Field(..., description="Median waktu tunggu checkout.")
+    wait_p95_ms: float = Field(..., description="Persentil 95 waktu tunggu.")
+    wait_p99_ms: float = Field(..., description="Persentil 99 waktu tunggu.")
+    wait_max_ms: float = Field(..., description="Waktu tunggu checkout terlama.")
+    read_pool: "DbPoolInfo | None" = Field(
+        None, description="Statistik pool replika baca. Kosong: tanpa replika."
+    )
@@ -3,6 +3,25 @@ from pydantic import Field
 from app.schemas.base import BaseSchema
 
 
+class PenyakitRuleCount(BaseSchema):
+    """Jumlah aturan yang dimiliki satu penyakit."""
+
+    id: str
+    nama: str
+    total_rules: int = Field(..., description="Jumlah aturan untuk penyakit ini.")
+
+
+class PakarCfCoverage(BaseSchema):
+    """Cakupan nilai CF yang diberikan satu pakar terhadap seluruh aturan."""
+
+    id: str
+    nama: str
+    total_cf: int = Field(..., description="Jumlah aturan yang sudah dinilai pakar.")
+    coverage: float = Field(
+        ..., description="Rasio aturan yang sudah dinilai pakar (0 hingga 1)."
+    )
+
+
 class SystemStats(BaseSchema):
     """Skema untuk menampilkan statistik sistem secara keseluruhan."""
 
@@ -21,6 +40,12 @@ class SystemStats(BaseSchema):
     total_rules: int = Field(
         ..., description="Jumlah total aturan (rules) yang terdaftar dalam sistem."
     )
+    rules_per_penyakit: list[PenyakitRuleCount] = Field(
+        default_factory=list, description="Jumlah aturan untuk setiap penyakit."
+    )
+    cf_coverage_per_pakar: list[PakarCfCoverage] = Field(
+        default_factory=list, description="Cakupan nilai CF setiap pakar."
+    )
 
 
 class CfTermRead(BaseSchema):
@@ -8,9 +8,10 @@ _T = TypeVar("_T")
 class PaginationSchema(BaseSchema, Generic[_T]):
     """Base schema for pagination."""
 
-    count: int
+    count: int | None
     items: list[_T]
-    curr_page: int
-    total_page: int
+    curr_page: int | None
+    total_page: int | None
     next_page: str | None = None
     previous_page: str | None = None
+    next_cursor: str | None = None
@@ -1,3 +1,5 @@
+from pydantic import Field
+
 from app.schemas.base import BaseSchema
 
 
@@ -13,3 +15,23 @@ class PakarRead(BaseSchema):
 
 class PakarUpdate(BaseSchema):
     nama: str
+
+
+class PakarCfRejected(BaseSchema):
+    """Nilai CF yang tidak ditulis beserta alasannya."""
+
+    id_rule: str
+    nilai: float
+    errors: list[str]
+
+
+class PakarCfResult(BaseSchema):
+    """Ringkasan penulisan matriks CF seorang pakar."""
+
+    inserted: list[str] = Field(
+        default_factory=list, description="ID rule yang nilai CF-nya baru."
+    )
+    updated: list[str] = Field(
+        default_factory=list, description="ID rule yang nilai CF-nya diperbarui."
+    )
+    rejected: list[PakarCfRejected] = Field(default_factory=list)
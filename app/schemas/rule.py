@@ -1,3 +1,5 @@
+from typing import Annotated
+
 from pydantic import Field
 
 from app.schemas.base import BaseSchema
@@ -5,13 +7,21 @@ from app.schemas.gejala import GejalaRead
 from app.schemas.pakar import PakarRead
 from app.schemas.penyakit import PenyakitRead
 
+# Rentang nilai CF pakar; nilai negatif adalah bukti yang menyangkal penyakit.
+# Dipakai oleh skema di bawah, PUT /pakar/{pakar_id}/cf dan impor rule_cf.
+CF_MIN = -1.0
+CF_MAX = 1.0
+CF_RANGE_MESSAGE = f"Nilai CF harus berada di antara {CF_MIN:g} dan {CF_MAX:g}."
+
+CfValue = Annotated[float, Field(ge=CF_MIN, le=CF_MAX)]
+
 
 class RuleCfCreate(BaseSchema):
     """Skema untuk menambahkan nilai CF dari pakar ke sebuah rule."""
 
     id_pakar: str = Field(..., description="ID Pakar yang memberikan nilai.")
-    nilai: float = Field(
-        ..., description="Nilai Certainty Factor (CF) dari pakar.", ge=0, le=1
+    nilai: CfValue = Field(
+        ..., description="Nilai Certainty Factor (CF) dari pakar."
     )
 
 
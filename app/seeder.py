@@ -13,7 +13,7 @@ from rich.progress import track
 from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
-from app.db.base import async_session_maker
+from app.db.base import async_session_maker, dispose_engines
 from app.db.models.gejala import Gejala
 from app.db.models.kelompok import Kelompok
 from app.db.models.kelompok_gejala import KelompokGejala
@@ -21,6 +21,8 @@ from app.db.models.pakar import Pakar
 from app.db.models.penyakit import Penyakit
 from app.db.models.rule import Rule
 from app.db.models.rule_cf import RuleCf
+from app.db.models.rule_cf_aggregate import RuleCfAggregate
+from app.db.rule_cf_aggregate import refresh_rule_cf_aggregates
 
 # Inisialisasi console untuk output yang lebih baik
 console = Console()
@@ -35,6 +37,7 @@ async def clear_database(session_maker: async_sessionmaker):
     """Menghapus semua data dari tabel dengan urutan yang benar."""
     console.print("\n[bold red]Menghapus data lama dari database...[/bold red]")
     tables_to_clear = [
+        RuleCfAggregate,
         RuleCf,
         KelompokGejala,
         Rule,
@@ -223,6 +226,12 @@ async def seed_data(session_maker: async_sessionmaker):
         await session.commit()
         console.print(f"[green]  -> {len(cf_list)} record Rule CF berhasil dibuat.[/green]")
 
+        # 8. Agregat CF per Rule
+        console.print("\n[bold cyan]8. Menghitung Agregat Rule CF...[/bold cyan]")
+        await refresh_rule_cf_aggregates(session)
+        await session.commit()
+        console.print("[green]  -> Agregat Rule CF berhasil dihitung.[/green]")
+
 
 async def main(clear_all: bool = False):
     """
@@ -231,10 +240,13 @@ async def main(clear_all: bool = False):
     Args:
         clear_all (bool): Jika True, hapus semua data sebelum seeding.
     """
-    if clear_all:
-        await clear_database(async_session_maker)
+    try:
+        if clear_all:
+            await clear_database(async_session_maker)
 
-    await seed_data(async_session_maker)
+        await seed_data(async_session_maker)
+    finally:
+        await dispose_engines()
     console.print("\n[bold green]Proses seeding selesai dengan sukses![/bold green]")
 
 
@@ -1,16 +1,26 @@
 import logging
-from typing import Any, Generic, List, Optional, Type, TypeVar
+from collections import Counter
+from typing import Any, Generic, List, Optional, Sequence, Type, TypeVar
 
 from fastapi import status
 from pydantic import BaseModel
-from sqlalchemy import exc
+from sqlalchemy import exc, insert, inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.sql.expression import func
+from sqlalchemy.sql.base import ExecutableOption
+from sqlalchemy.sql.expression import exists, func
 
+from app.db.id_allocator import IdAllocator
+from app.db.unit_of_work import on_commit, unit_of_work
 from app.utils.common import ErrorCode
-from app.utils.exceptions import AppExceptionError, NotValidIDError
+from app.utils.exceptions import (
+    AppExceptionError,
+    DuplicateIDError,
+    DuplicateNamaError,
+    NotValidIDError,
+)
 from app.utils.id_healper import IDConfig, IDHelper
+from app.utils.integrity import classify_integrity_error
 
 logger = logging.getLogger(__name__)
 
@@ -23,8 +33,15 @@ class BaseManager(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
     Generic base class for CRUD and bulk operations on SQLAlchemy models.
     Uses AppExceptionError for error handling.
+
+    Relationships are not loaded unless requested: pass a loader profile
+    (``app.db.loaders``) as ``options``. ``read_options`` is the profile needed
+    to serialize the model's read schema and is applied when items are
+    reloaded after a write.
     """
 
+    read_options: Sequence[ExecutableOption] = ()
+
     def __init__(
         self,
         session: AsyncSession,
@@ -37,10 +54,15 @@ class BaseManager(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         self.session = session
         self.model = model
         self._model_name = self.model.__name__
+        # Only models with their own ID series (an explicit id_config) get an
+        # allocator; e.g. kelompok uses integer IDs from the database.
+        self.id_allocator: IdAllocator[ModelType] | None = None
         self.id_config = id_config or IDConfig(
             prefix="G", length=5, minimum_length_number=4, example="G0001"
         )
         self.id_helper = IDHelper[ModelType](self.id_config, field_id)
+        if id_config is not None:
+            self.id_allocator = IdAllocator(session, model, self.id_helper)
 
     async def _execute_query(self, query):
         try:
@@ -66,23 +88,37 @@ class BaseManager(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 error_code=ErrorCode.INTERNAL_SERVER_ERROR,
             ) from None
 
-    async def get_all(self, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
+    async def get_all(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        options: Sequence[ExecutableOption] = (),
+    ) -> List[ModelType]:
         logger.debug(f"Fetching all {self._model_name} (skip={skip}, limit={limit})")
-        query = select(self.model).offset(skip).limit(limit)
+        query = select(self.model).options(*options).offset(skip).limit(limit)
         result = await self._execute_query(query)
         return result.scalars().all()  # type: ignore
 
-    async def get_by_id(self, item_id: Any) -> Optional[ModelType]:
+    async def get_by_id(
+        self, item_id: Any, options: Sequence[ExecutableOption] = ()
+    ) -> Optional[ModelType]:
         logger.debug(f"Fetching {self._model_name} by ID: {item_id}")
-        query = select(self.model).where(self.model.id == item_id)  # type: ignore
+        query = (
+            select(self.model)
+            .where(self.model.id == item_id)  # type: ignore
+            .options(*options)
+        )
         result = await self._execute_query(query)
         instance = result.scalars().first()
         if not instance:
             logger.info(f"{self._model_name} with ID '{item_id}' not found.")
         return instance
 
-    async def get_by_id_or_fail(self, item_id: Any) -> ModelType:
-        instance = await self.get_by_id(item_id)
+    async def get_by_id_or_fail(
+        self, item_id: Any, options: Sequence[ExecutableOption] = ()
+    ) -> ModelType:
+        instance = await self.get_by_id(item_id, options)
         if not instance:
             raise NotValidIDError(
                 f"{self._model_name} with ID '{item_id}' not found.",
@@ -108,11 +144,78 @@ class BaseManager(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
         await self.validate_schema(input_data)
         db_item = await self.build(input_data)
-        self.session.add(db_item)
         return await self.save(db_item)
 
     async def validate_schema(self, item_in: CreateSchemaType): ...
 
+    def map_integrity_error(
+        self, error: exc.IntegrityError, values: dict[str, Any] | None = None
+    ) -> AppExceptionError | None:
+        """
+        Maps a unique violation on the ID or ``nama`` column to the manager's
+        ``duplicate_id``/``duplicate_nama`` error, so creates and updates can
+        rely on the database constraints instead of pre-checks. ``values`` are
+        the written column values, used in the message. Returns None for any
+        other violation.
+        """
+        violation = classify_integrity_error(error, self.model.__table__)  # type: ignore
+        if violation.kind != "unique":
+            return None
+
+        values = values or {}
+        field_id = self.id_helper.field_id
+        if violation.columns == {field_id}:
+            detail = f"ID: {values[field_id]}" if field_id in values else "ID"
+            return DuplicateIDError(
+                f"{detail} telah terdaftar",
+                error_code=self.error_codes["duplicate_id"],
+                status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            )
+        if violation.columns == {"nama"}:
+            detail = f"Nama: {values['nama']}" if "nama" in values else "Nama"
+            return DuplicateNamaError(
+                f"{detail} telah terdaftar",
+                "Gunakan nama yang berbeda",
+                error_code=self.error_codes["duplicate_nama"],
+                status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            )
+        return None
+
+    async def find_existing(self, checks: dict[str, Any]) -> set[str]:
+        """
+        Runs several existence checks in a single ``SELECT EXISTS (...), ...``.
+
+        ``checks`` maps a name to a WHERE clause; the names of the clauses that
+        match at least one row are returned. Each clause should be served by
+        an index (primary key, unique constraint or ``index=True``).
+        """
+        if not checks:
+            return set()
+        query = select(
+            *(exists().where(clause).label(name) for name, clause in checks.items())
+        )
+        row = (await self._execute_query(query)).mappings().one()
+        return {name for name, found in row.items() if found}
+
+    def after_commit(self) -> None:
+        """
+        Hook called once the transaction containing this manager's write is
+        committed (see ``on_commit``). Override in subclasses to invalidate
+        derived caches.
+        """
+
+    async def before_save_commit(self, db_item: ModelType) -> None:
+        """
+        Hook called by ``save`` inside its unit of work, so writes to related
+        tables share the transaction and its error handling.
+        """
+
+    async def before_delete_commit(self, db_item: ModelType) -> None:
+        """
+        Hook called after ``db_item`` is deleted, inside the same unit of work.
+        Override in subclasses to keep derived data consistent.
+        """
+
     async def update(
         self, *, item_id: Any, item_update: UpdateSchemaType
     ) -> ModelType:
@@ -141,22 +244,21 @@ class BaseManager(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return validated_update_dict
 
     async def _update(self, db_item: ModelType, update_dict: dict[str, Any]):
-        for field, value in update_dict.items():
-            setattr(db_item, field, value)
-
-        self.session.add(db_item)
-        return await self.save(db_item)
+        return await self.save(db_item, update_dict)
 
     async def delete(self, *, item_id: Any) -> ModelType:
         logger.info(f"Deleting {self._model_name} ID: {item_id}")
         db_item = await self.get_by_id_or_fail(item_id)
         try:
-            await self.session.delete(db_item)
-            await self.session.commit()
+            async with unit_of_work(self.session):
+                await self.session.delete(db_item)
+                if self.id_allocator is not None:
+                    await self.id_allocator.release([db_item.id])  # type: ignore
+                await self.before_delete_commit(db_item)
+            on_commit(self.session, self.after_commit)
             logger.info(f"{self._model_name} ID: {item_id} deleted.")
             return db_item
         except exc.IntegrityError as e:
-            await self.session.rollback()
             logger.error(
                 f"Integrity error deleting {self._model_name} ID {item_id}: {e}",
                 exc_info=True,
@@ -176,7 +278,6 @@ class BaseManager(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             ) from None
 
         except exc.SQLAlchemyError as e:
-            await self.session.rollback()
             logger.error(
                 f"SQLAlchemy error deleting {self._model_name} ID {item_id}: {e}",
                 exc_info=True,
@@ -195,29 +296,42 @@ class BaseManager(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return total or 0
 
     async def bulk(self, *, items_in: List[CreateSchemaType]) -> List[ModelType]:
+        """
+        Creates ``items_in`` in one transaction.
+
+        The batch is validated as a whole by :meth:`validate_bulk`, inserted
+        with a single executemany ``INSERT ... RETURNING`` and, when the model
+        has ``read_options``, reloaded with one select for serialization.
+        """
         logger.info(f"Bulk creating {len(items_in)} {self._model_name} items.")
         if not items_in:
             return []
 
-        for item in items_in:
-            await self.validate_schema(item_in=item)
+        await self.validate_bulk(items_in)
 
-        db_items = [
-            self.model(**item.model_dump(exclude_unset=True)) for item in items_in
-        ]
-        self.session.add_all(db_items)
+        query = insert(self.model).returning(
+            self.model, sort_by_parameter_order=True
+        )
         try:
-            await self.session.commit()
-            for item in db_items:
-                await self.session.refresh(item)
+            async with unit_of_work(self.session):
+                db_items = list(
+                    await self.session.scalars(
+                        query, [self.bulk_values(item) for item in items_in]
+                    )
+                )
+                await self.after_bulk_insert(items_in, db_items)
+            on_commit(self.session, self.after_commit)
+            await self.reload_all(db_items)
             logger.info(f"Bulk created {len(db_items)} {self._model_name} items.")
             return db_items
         except exc.IntegrityError as e:
-            await self.session.rollback()
             logger.error(
                 f"Integrity error during bulk create {self._model_name}: {e}",
                 exc_info=True,
             )
+            mapped = self.map_integrity_error(e)
+            if mapped is not None:
+                raise mapped from None
             raise AppExceptionError(
                 f"Bulk create failed for {self._model_name} due to integrity error. "
                 f"All items rolled back. Detail: {e.orig}",
@@ -225,7 +339,6 @@ class BaseManager(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 error_code=ErrorCode.INTEGRITY_ERROR,
             ) from None
         except exc.SQLAlchemyError as e:
-            await self.session.rollback()
             logger.error(
                 f"SQLAlchemy error during bulk create {self._model_name}: {e}",
                 exc_info=True,
@@ -237,24 +350,142 @@ class BaseManager(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 error_code=ErrorCode.INTERNAL_SERVER_ERROR,
             ) from None
 
+    async def validate_bulk(self, items_in: List[CreateSchemaType]) -> None:
+        """
+        Validates a batch for :meth:`bulk`, assigning missing IDs.
+
+        Defaults to :meth:`validate_schema` per item. Managers override this
+        with set-based checks (:meth:`check_bulk_ids`, :meth:`check_bulk_unique`,
+        :meth:`assign_bulk_ids`) so the query count does not grow with the batch.
+        """
+        for item in items_in:
+            await self.validate_schema(item)
+
+    def bulk_values(self, item_in: CreateSchemaType) -> dict[str, Any]:
+        """Column values inserted by :meth:`bulk` for ``item_in``."""
+        return item_in.model_dump(exclude_unset=True)
+
+    async def after_bulk_insert(
+        self, items_in: List[CreateSchemaType], db_items: List[ModelType]
+    ) -> None:
+        """
+        Hook called after :meth:`bulk` inserted ``db_items`` (in the order of
+        ``items_in``) but before the transaction is committed.
+        """
+
+    async def check_bulk_ids(self, items_in: List[CreateSchemaType]) -> None:
+        """
+        Validates the format of the given IDs and rejects IDs repeated in the
+        batch or already stored, using one ``IN`` query.
+        """
+        ids = [item.id for item in items_in if item.id is not None]  # type: ignore
+        for data_id in ids:
+            is_valid, error_message = self.id_helper.validate_format(data_id)
+            if not is_valid:
+                raise NotValidIDError(
+                    error_message,
+                    f"ID: {data_id}",
+                    f"Contoh ID valid: {self.id_config.example}",
+                    error_code=self.error_codes["not_valid_id"],
+                    status_code=status.HTTP_406_NOT_ACCEPTABLE,
+                )
+
+        taken = _repeated(ids) | await self._existing(self.model.id, ids)  # type: ignore
+        if taken:
+            raise DuplicateIDError(
+                f"ID: {', '.join(sorted(taken))} telah terdaftar",
+                error_code=self.error_codes["duplicate_id"],
+                status_code=status.HTTP_406_NOT_ACCEPTABLE,
+                data=sorted(taken),
+            )
+
+    async def check_bulk_unique(
+        self, items_in: List[CreateSchemaType], field: str = "nama"
+    ) -> None:
+        """
+        Rejects values of ``field`` repeated in the batch or already stored,
+        using one ``IN`` query.
+        """
+        values = [getattr(item, field) for item in items_in]
+        taken = _repeated(values) | await self._existing(
+            getattr(self.model, field), values
+        )
+        if taken:
+            raise DuplicateNamaError(
+                f"Nama: {', '.join(sorted(taken))} telah terdaftar",
+                "Gunakan nama yang berbeda",
+                error_code=self.error_codes["duplicate_nama"],
+                status_code=status.HTTP_406_NOT_ACCEPTABLE,
+                data=sorted(taken),
+            )
+
+    async def assign_id(self, item_in: CreateSchemaType) -> None:
+        """
+        Allocates an ID for ``item_in`` or, when it carries one, reserves that
+        ID so the allocator never hands it out.
+        """
+        await self.assign_bulk_ids([item_in])
+
+    async def assign_bulk_ids(self, items_in: List[CreateSchemaType]) -> None:
+        """
+        Allocates IDs for every item without one with a single counter update,
+        so items of the same batch never receive the same ID.
+        """
+        if self.id_allocator is None:
+            return
+        pending = [item for item in items_in if item.id is None]  # type: ignore
+        await self.id_allocator.claim(
+            [item.id for item in items_in if item.id is not None]  # type: ignore
+        )
+        if not pending:
+            return
+        new_ids = await self.id_allocator.allocate(len(pending))
+        for item, new_id in zip(pending, new_ids, strict=True):
+            item.id = new_id  # type: ignore
+
+    async def _existing(self, column: Any, values: Sequence[Any]) -> set[Any]:
+        """Subset of ``values`` already stored in ``column``."""
+        if not values:
+            return set()
+        query = select(column).where(column.in_(set(values)))
+        return set((await self._execute_query(query)).scalars())
+
     async def build(self, create_schema: CreateSchemaType) -> ModelType:
         data = create_schema.model_dump(exclude_unset=True)
         return self.model(**data)
 
-    async def save(self, db_item: ModelType) -> ModelType:
+    async def save(
+        self, db_item: ModelType, changes: Optional[dict[str, Any]] = None
+    ) -> ModelType:
+        """
+        Writes ``db_item`` with ``changes`` applied in a unit of work: a
+        savepoint inside a request, its own transaction otherwise.
+        """
         item_id = db_item.id  # type: ignore
+        # A failed flush expires db_item, so the values for error messages are
+        # taken beforehand
+        values = {**inspect(db_item).dict, **(changes or {})}
 
         try:
-            await self.session.commit()
-            await self.session.refresh(db_item)
+            # Changes are staged inside the unit of work so that a failing
+            # flush only rolls back its savepoint
+            async with unit_of_work(self.session):
+                for field, value in (changes or {}).items():
+                    setattr(db_item, field, value)
+                self.session.add(db_item)
+                await self.before_save_commit(db_item)
+            on_commit(self.session, self.after_commit)
+            await self.reload(db_item)
             logger.info(f"{self._model_name} ID: {item_id} updated.")
             return db_item
         except exc.IntegrityError as e:
-            await self.session.rollback()
             logger.error(
                 f"Integrity error updating {self._model_name} ID {item_id}: {e}",
                 exc_info=True,
             )
+            mapped = self.map_integrity_error(e, values)
+            if mapped is not None:
+                raise mapped from None
             raise AppExceptionError(
                 f"Failed to update {self._model_name} ID {item_id}.",
                 f"Data may conflict. Detail: {e.orig}",
@@ -262,7 +493,6 @@ class BaseManager(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 error_code=ErrorCode.INTEGRITY_ERROR,
             ) from None
         except exc.SQLAlchemyError as e:
-            await self.session.rollback()
             logger.error(
                 f"SQLAlchemy error updating {self._model_name} ID {item_id}: {e}",
                 exc_info=True,
@@ -272,3 +502,43 @@ class BaseManager(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 error_code=ErrorCode.INTERNAL_SERVER_ERROR,
             ) from None
+
+    async def reload(self, db_item: ModelType) -> ModelType:
+        """
+        Refreshes ``db_item`` from the database, loading the relationships of
+        ``read_options`` so the item can be serialized.
+        """
+        if not self.read_options:
+            await self.session.refresh(db_item)
+            return db_item
+
+        query = (
+            select(self.model)
+            .where(self.model.id == db_item.id)  # type: ignore
+            .options(*self.read_options)
+            .execution_options(populate_existing=True)
+        )
+        await self._execute_query(query)
+        return db_item
+
+    async def reload_all(self, db_items: List[ModelType]) -> List[ModelType]:
+        """
+        Loads the relationships of ``read_options`` for ``db_items`` with one
+        select. Column values are already current after ``RETURNING``.
+        """
+        if not self.read_options or not db_items:
+            return db_items
+
+        query = (
+            select(self.model)
+            .where(self.model.id.in_([item.id for item in db_items]))  # type: ignore
+            .options(*self.read_options)
+            .execution_options(populate_existing=True)
+        )
+        await self._execute_query(query)
+        return db_items
+
+
+def _repeated(values: Sequence[Any]) -> set[Any]:
+    """Values occurring more than once in ``values``."""
+    return {value for value, count in Counter(values).items() if count > 1}
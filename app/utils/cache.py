@@ -0,0 +1,86 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Generic, Hashable, Optional, TypeVar
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+
+@dataclass
+class CacheStats:
+    """Counters describing how a cache has been used"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache(Generic[KeyType, ValueType]):
+    """
+    Bounded in-process LRU cache with an optional time-to-live per entry.
+
+    Not thread safe; intended for use from a single event loop. A ``max_size``
+    of 0 disables the cache (every lookup is a miss and nothing is stored).
+    With ``sliding`` enabled, every hit restarts the entry's TTL, so the TTL
+    acts as an idle timeout.
+    """
+
+    def __init__(
+        self, max_size: int, ttl: Optional[float] = None, sliding: bool = False
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.sliding = sliding
+        self.stats = CacheStats()
+        self._data: OrderedDict[KeyType, tuple[float, ValueType]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: KeyType) -> Optional[ValueType]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        if self.sliding:
+            self._data[key] = (self._expires_at(), value)
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: KeyType, value: ValueType) -> None:
+        if self.max_size <= 0:
+            return
+
+        self._data[key] = (self._expires_at(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def pop(self, key: KeyType) -> Optional[ValueType]:
+        entry = self._data.pop(key, None)
+        return entry[1] if entry is not None else None
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def _expires_at(self) -> float:
+        if self.ttl is None:
+            return float("inf")
+        return time.monotonic() + self.ttl
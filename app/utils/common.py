@@ -10,6 +10,12 @@ class ErrorCode(StrEnum):
     APP_ERROR = auto()
     INTERNAL_SERVER_ERROR = auto()
     INTEGRITY_ERROR = auto()
+    VALIDATION_ERROR = auto()
+    QUERY_BUDGET_EXCEEDED = auto()
+    INVALID_CURSOR = auto()
+    IMPORT_FILE_INVALID = auto()
+    IMPORT_VALIDATION_ERROR = auto()
+    ID_EXHAUSTED = auto()
 
     # BASE
     NOT_FOUND = auto()
@@ -40,3 +46,6 @@ class ErrorCode(StrEnum):
     ID_KELOMPOK_DUPLICATE = auto()
     NAMA_KELOMPOK_DUPLICATE = auto()
     NOT_VALID_ID_KELOMPOK = auto()
+
+    # DIAGNOSIS
+    DIAGNOSIS_SESSION_NOT_FOUND = auto()
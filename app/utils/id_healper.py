@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import ClassVar, Generic, Sequence, Set, Tuple, TypeVar
+from typing import ClassVar, Generic, TypeVar
 
 ModelType = TypeVar("ModelType")
 
@@ -12,12 +12,15 @@ class IDConfig:
     length: int
     minimum_length_number: int
     example: str
+    # Reuse IDs of deleted rows (through the id_free table) before new numbers
+    reuse_freed: bool = True
     error_messages: ClassVar[dict[str, str]] = {
         "length": "ID harus memiliki panjang {length} karakter",
         "prefix": "ID harus dimulai dengan {prefix}",
         "numeric": "Bagian angka harus berisi digit",
         "duplicate": "ID {id} sudah digunakan",
         "invalid": "ID tidak valid. Contoh: {example}",
+        "exhausted": "ID dengan prefix {prefix} sudah habis",
     }
 
 
@@ -57,54 +60,18 @@ class IDHelper(Generic[ModelType]):
 
         return True, ""
 
-    def create_id(self, existing_ids: Set[str], nums_ids: Set[int]) -> str:
-        """
-        Creates a new unique ID
-        Args:
-            existing_ids: Set of existing IDs to avoid duplicates
-            nums_ids: Set of numeric parts of existing IDs
-        Returns:
-            str: A new unique ID
-        """
-        if not nums_ids:
-            return f"{self.config.prefix}{'0' * (self.config.minimum_length_number - 1)}1"
-
-        # Try to fill gaps first
-        expected = set(range(1, max(nums_ids) + 1))
-        missing_nums = sorted(expected - nums_ids)
+    def format_id(self, number: int) -> str:
+        """Formats ``number`` as an ID, e.g. 7 -> ``G007``."""
+        digits = str(number).zfill(self.config.minimum_length_number)
+        return f"{self.config.prefix}{digits}"
 
-        if missing_nums:
-            for num in missing_nums:
-                i = str(num)
-                if len(i) < self.config.minimum_length_number:
-                    i = i.zfill(self.config.minimum_length_number)
-                new_id = f"{self.config.prefix}{i}"
-                if new_id not in existing_ids:
-                    return new_id
-
-        # No gaps found, create new sequential ID
-        next_num = max(nums_ids) + 1
-        while True:
-            i = str(next_num)
-            if len(i) <= self.config.minimum_length_number:
-                i = i.zfill(self.config.minimum_length_number)
-            new_id = f"{self.config.prefix}{i}"
-            if new_id not in existing_ids:
-                return new_id
-            next_num += 1
-
-    def extract_numeric_ids(
-        self, items: Sequence[ModelType]
-    ) -> Tuple[Set[str], Set[int]]:
+    def parse_number(self, id_value: str) -> int | None:
         """
-        Extracts IDs and their numeric parts from a sequence of items
-        Args:
-            items: Sequence of items with ID attributes
-        Returns:
-            Tuple[Set[str], Set[int]]: (existing IDs, numeric parts of IDs)
+        Returns the numeric part of an ID with this prefix, or None when
+        ``id_value`` does not belong to this ID series.
         """
-        existing_ids: Set[str] = {self.get_id(item) for item in items}
-        nums_ids: Set[int] = {
-            int(self.get_id(item)[len(self.config.prefix) :]) for item in items
-        }
-        return existing_ids, nums_ids
+        id_value = id_value.strip()
+        if not id_value.startswith(self.config.prefix):
+            return None
+        numeric_part = id_value[len(self.config.prefix) :]
+        return int(numeric_part) if numeric_part.isdigit() else None
@@ -0,0 +1,73 @@
+import re
+from dataclasses import dataclass
+from typing import Literal
+
+from sqlalchemy import Table, exc
+
+ViolationKind = Literal["unique", "foreign_key", "not_null", "other"]
+
+# PostgreSQL SQLSTATE codes of the integrity_constraint_violation class
+_SQLSTATE_KINDS: dict[str, ViolationKind] = {
+    "23505": "unique",
+    "23503": "foreign_key",
+    "23502": "not_null",
+}
+_SQLITE_KINDS: dict[str, ViolationKind] = {
+    "UNIQUE": "unique",
+    "FOREIGN KEY": "foreign_key",
+    "NOT NULL": "not_null",
+}
+_SQLITE_MESSAGE = re.compile(
+    r"(UNIQUE|FOREIGN KEY|NOT NULL) constraint failed(?:: (?P<columns>.+))?"
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Violation:
+    """
+    The constraint an ``IntegrityError`` violated.
+
+    ``columns`` are the columns of the constraint when the backend reports
+    them; SQLite does not for foreign keys, so it may be empty.
+    """
+
+    kind: ViolationKind
+    columns: frozenset[str] = frozenset()
+
+
+def classify_integrity_error(error: exc.IntegrityError, table: Table) -> Violation:
+    """
+    Classifies ``error`` raised while writing to ``table``, for asyncpg
+    (SQLSTATE and constraint name) and SQLite (error message).
+    """
+    orig = error.orig
+    sqlstate = getattr(orig, "sqlstate", None)
+    if sqlstate:
+        # asyncpg's exception, chained by SQLAlchemy's adapter, names the
+        # constraint (or the column for NOT NULL)
+        cause = getattr(orig, "__cause__", None)
+        constraint = getattr(cause, "constraint_name", None)
+        columns = _constraint_columns(table, constraint)
+        column = getattr(cause, "column_name", None)
+        if not columns and column:
+            columns = frozenset((column,))
+        return Violation(_SQLSTATE_KINDS.get(sqlstate, "other"), columns)
+
+    match = _SQLITE_MESSAGE.search(str(orig))
+    if match is None:
+        return Violation("other")
+    columns = frozenset(
+        column.strip().rsplit(".", 1)[-1]
+        for column in (match["columns"] or "").split(",")
+        if column.strip()
+    )
+    return Violation(_SQLITE_KINDS[match[1]], columns)
+
+
+def _constraint_columns(table: Table, name: str | None) -> frozenset[str]:
+    if not name:
+        return frozenset()
+    for constraint in (*table.constraints, *table.indexes):
+        if constraint.name == name:
+            return frozenset(column.name for column in constraint.columns)
+    return frozenset()
@@ -1,51 +1,170 @@
-from sqlalchemy import Select, func, select
+import base64
+import binascii
+import json
+from typing import Any, Literal
+
+from fastapi import status
+from sqlalchemy import ColumnElement, Select, func, inspect, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.middleware.pagination import request_object
+from app.utils.common import ErrorCode
+from app.utils.exceptions import AppExceptionError
+
+CountMode = Literal["exact", "estimate", "none"]
+CountStrategy = Literal["subquery", "window"]
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Encodes the sort key of the last item of a page as an opaque cursor."""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise AppExceptionError(
+            "Cursor tidak valid",
+            error_code=ErrorCode.INVALID_CURSOR,
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+    return values
 
 
 class Paginator:
+    """
+    Paginates a select of a single entity.
+
+    Two modes are supported:
+
+    - offset (default): ``page``/``per_page`` translate to LIMIT/OFFSET.
+    - keyset: enabled by passing ``cursor`` (an empty string starts at the
+      first item). Rows after the cursor's primary key are fetched with
+      ``WHERE pk > :cursor``, so the cost does not grow with page depth.
+
+    The primary key is appended as the last sort key so that pages are stable;
+    keyset mode therefore expects a query without its own ordering.
+
+    ``count`` selects how the total is computed: ``exact`` runs ``COUNT(*)``,
+    ``estimate`` uses the planner's row estimate (PostgreSQL only, falls back to
+    exact) and ``none`` skips it. The next page is detected by fetching one
+    extra row, so it does not depend on the total.
+
+    With the ``window`` count strategy an exact offset page and its total are
+    fetched in one statement (``count(*) OVER ()``); the separate ``COUNT(*)``
+    only runs when the page is empty, since no row carries the total then.
+    """
+
     def __init__(
-        self, session: AsyncSession, query: Select, page: int, per_page: int
+        self,
+        session: AsyncSession,
+        query: Select,
+        page: int,
+        per_page: int,
+        cursor: str | None = None,
+        count: CountMode = "exact",
+        count_strategy: CountStrategy | None = None,
     ):
         self.session = session
-        self.query = query
+        self.primary_key: tuple[ColumnElement, ...] = tuple(
+            inspect(query.column_descriptions[0]["entity"]).primary_key
+        )
+        self.query = query.order_by(*self.primary_key)
         self.page = page
         self.per_page = per_page
-        self.limit = per_page * page
+        self.cursor = cursor
+        self.count_mode = count
+        self.count_strategy = count_strategy or settings.PAGINATION_COUNT_STRATEGY
+        self.limit = per_page
         self.offset = (page - 1) * per_page
         self.request = request_object.get()
         # computed later
-        self.number_of_pages = 0
-        self.next_page = ""
-        self.previous_page = ""
+        self.number_of_pages: int | None = None
+        self.has_next = False
+        self.next_cursor: str | None = None
+
+    @property
+    def is_keyset(self) -> bool:
+        return self.cursor is not None
 
     def _get_next_page(self) -> str | None:
-        if self.page >= self.number_of_pages:
+        if not self.has_next:
             return None
-        url = self.request.url.include_query_params(page=self.page + 1)
-        return str(url)
+        if self.is_keyset:
+            params = {"cursor": self.next_cursor}
+        else:
+            params = {"page": self.page + 1}
+        return str(self.request.url.include_query_params(**params))
 
     def _get_previous_page(self) -> str | None:
-        if self.page == 1 or self.page > self.number_of_pages + 1:
+        # Keyset pagination hanya bergerak maju
+        if self.is_keyset or self.page == 1:
+            return None
+        if self.number_of_pages is not None and self.page > self.number_of_pages + 1:
             return None
         url = self.request.url.include_query_params(page=self.page - 1)
         return str(url)
 
+    def _page_query(self) -> Select:
+        query = self.query.limit(self.limit + 1)
+        if not self.is_keyset:
+            return query.offset(self.offset)
+        if not self.cursor:
+            return query
+        values = decode_cursor(self.cursor, len(self.primary_key))
+        if len(self.primary_key) == 1:
+            return query.where(self.primary_key[0] > values[0])
+        return query.where(tuple_(*self.primary_key) > tuple_(*values))
+
+    async def _get_items(self) -> list:
+        items = list((await self.session.scalars(self._page_query())).fetchall())
+        self.has_next = len(items) > self.per_page
+        items = items[: self.per_page]
+        if self.is_keyset and self.has_next:
+            state = inspect(items[-1])
+            self.next_cursor = encode_cursor(list(state.identity))
+        return items
+
+    @property
+    def uses_window_count(self) -> bool:
+        return (
+            self.count_strategy == "window"
+            and self.count_mode == "exact"
+            and not self.is_keyset
+        )
+
+    async def _get_items_with_count(self) -> tuple[list, int]:
+        total = func.count().over().label("total_count")
+        rows = (
+            await self.session.execute(self._page_query().add_columns(total))
+        ).all()
+        if not rows:
+            return [], await self._get_total_count()  # type: ignore[return-value]
+        self.has_next = len(rows) > self.per_page
+        count = rows[0].total_count
+        self.number_of_pages = self._get_number_of_pages(count)
+        return [row[0] for row in rows[: self.per_page]], count
+
     async def get_response(self) -> dict:
+        if self.uses_window_count:
+            items, count = await self._get_items_with_count()
+        else:
+            count = await self._get_total_count()
+            items = await self._get_items()
         return {
-            "count": await self._get_total_count(),
-            "items": list(
-                (
-                    await self.session.scalars(
-                        self.query.limit(self.limit).offset(self.offset)
-                    )
-                ).fetchall()
-            ),
-            "curr_page": self.page,
+            "count": count,
+            "items": items,
+            "curr_page": None if self.is_keyset else self.page,
             "total_page": self.number_of_pages,
             "next_page": self._get_next_page(),
             "previous_page": self._get_previous_page(),
+            "next_cursor": self.next_cursor,
         }
 
     def _get_number_of_pages(self, count: int) -> int:
@@ -53,18 +172,50 @@ class Paginator:
         quotient = count // self.per_page
         return quotient if not rest else quotient + 1
 
-    async def _get_total_count(self) -> int:
-        count = (
-            await self.session.scalar(
-                select(func.count()).select_from(self.query.subquery())
-            )
-        ) or 0
+    async def _get_total_count(self) -> int | None:
+        if self.count_mode == "none":
+            return None
+        count = None
+        if self.count_mode == "estimate":
+            count = await self._estimate_count()
+        if count is None:
+            count = (
+                await self.session.scalar(
+                    select(func.count()).select_from(
+                        self.query.order_by(None).subquery()
+                    )
+                )
+            ) or 0
         self.number_of_pages = self._get_number_of_pages(count)
         return count
 
+    async def _estimate_count(self) -> int | None:
+        """Row estimate of the PostgreSQL planner, or None if unavailable."""
+        dialect = self.session.get_bind().dialect
+        if dialect.name != "postgresql":
+            return None
+        sql = self.query.order_by(None).compile(
+            dialect=dialect, compile_kwargs={"literal_binds": True}
+        )
+        # Driver SQL: text() would parse ":" inside the inlined literals as binds
+        connection = await self.session.connection()
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])  # type: ignore[index]
+
 
 async def paginate(
-    session: AsyncSession, query: Select, page: int, per_page: int
+    session: AsyncSession,
+    query: Select,
+    page: int,
+    per_page: int,
+    cursor: str | None = None,
+    count: CountMode = "exact",
+    count_strategy: CountStrategy | None = None,
 ) -> dict:
-    paginator = Paginator(session, query, page, per_page)
+    paginator = Paginator(
+        session, query, page, per_page, cursor, count, count_strategy
+    )
     return await paginator.get_response()
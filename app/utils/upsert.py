@@ -0,0 +1,58 @@
+from typing import Any, Iterable, Sequence
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.dml import Insert
+
+
+def upsert_statement(
+    session: AsyncSession,
+    model: Any,
+    *,
+    index_elements: Sequence[str],
+    update_columns: Iterable[str] = (),
+) -> Insert:
+    """
+    Builds ``INSERT ... ON CONFLICT (index_elements)`` for the session's dialect.
+
+    Conflicting rows get ``update_columns`` overwritten with the inserted values
+    (and ``update_at`` bumped when the model has it); without update columns
+    they are left untouched (``DO NOTHING``).
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = postgresql.insert(model)
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(model)
+    else:
+        raise NotImplementedError(f"Upsert is not supported for {dialect}.")
+
+    update_set: dict[str, Any] = {
+        column: stmt.excluded[column] for column in update_columns
+    }
+    if not update_set:
+        return stmt.on_conflict_do_nothing(index_elements=index_elements)
+    if "update_at" in model.__table__.c:
+        update_set["update_at"] = func.now()
+    return stmt.on_conflict_do_update(index_elements=index_elements, set_=update_set)
+
+
+async def upsert(
+    session: AsyncSession,
+    model: Any,
+    rows: Sequence[dict[str, Any]],
+    *,
+    index_elements: Sequence[str],
+    update_columns: Iterable[str] = (),
+) -> None:
+    """
+    Inserts ``rows`` with one executemany of :func:`upsert_statement` inside
+    the caller's transaction.
+    """
+    if not rows:
+        return
+    stmt = upsert_statement(
+        session, model, index_elements=index_elements, update_columns=update_columns
+    )
+    await session.execute(stmt, rows)
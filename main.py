@@ -5,9 +5,10 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
+from app.api.dependencies.knowledge_base import knowledge_base
 from app.api.routes import api
 from app.core.config import settings
-from app.db.base import create_db_and_tables
+from app.db.base import create_db_and_tables, dispose_engines
 from app.middleware import middleware
 from app.utils import error_handler
 from app.utils.exceptions import AppExceptionError
@@ -17,7 +18,9 @@ from app.utils.exceptions import AppExceptionError
 async def lifespan(app: FastAPI):
     """Lifespan context manager for FastAPI application."""
     await create_db_and_tables()
+    await knowledge_base.rebuild()
     yield
+    await dispose_engines()
 
 
 def get_app():
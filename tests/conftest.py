@@ -0,0 +1,46 @@
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Settings dibaca saat modul app diimpor: arahkan ke database SQLite sementara
+# sebelum import app mana pun.
+_TMP_DIR = Path(tempfile.mkdtemp(prefix="cat-diagnosis-test-"))
+os.environ.setdefault("PROJECT_NAME", "cat-diagnosis-api-test")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_TMP_DIR / 'app.db'}")
+# Middleware query budget dipasang saat app diimpor; route yang melebihi
+# batasnya dijawab 500 sehingga test gagal.
+os.environ.setdefault("DB_QUERY_BUDGET", "enforce")
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker  # noqa: E402
+
+from app.db.base import Base, create_engine  # noqa: E402
+from app.db.models import load_all_models  # noqa: E402
+
+load_all_models()
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+async def create_schema(url: str, seed: bool = False) -> AsyncEngine:
+    """Engine baru dengan skema kosong (dan data seeder jika ``seed``)."""
+    from app import seeder
+
+    test_engine = create_engine(url)
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    if seed:
+        await seeder.seed_data(
+            async_sessionmaker(test_engine, expire_on_commit=False)
+        )
+    return test_engine
+
+
+@pytest.fixture
+def sqlite_url(tmp_path: Path) -> str:
+    return f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"
@@ -0,0 +1,108 @@
+import asyncio
+
+import numpy as np
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.api.dependencies.diagnosis import Diagnosis
+from app.api.dependencies.knowledge_base import KnowledgeBase, build_knowledge_base
+from tests.conftest import create_schema
+
+GEJALA_IDS = [f"G{i:03d}" for i in range(1, 55)]
+
+USER_CF_CASES = {
+    "positif": dict.fromkeys(GEJALA_IDS[:20], 0.8),
+    "positif-semua": {
+        gejala_id: (0.2, 0.4, 0.6, 0.8, 1.0)[i % 5]
+        for i, gejala_id in enumerate(GEJALA_IDS)
+    },
+    "negatif": dict.fromkeys(GEJALA_IDS[:20], -0.6),
+    "campuran": {
+        gejala_id: (0.8, -0.4, 0.6, -1.0, 0.2)[i % 5]
+        for i, gejala_id in enumerate(GEJALA_IDS)
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def kb(tmp_path_factory) -> KnowledgeBase:
+    url = f"sqlite+aiosqlite:///{tmp_path_factory.mktemp('kb') / 'kb.db'}"
+
+    async def build() -> KnowledgeBase:
+        engine = await create_schema(url, seed=True)
+        try:
+            async with async_sessionmaker(engine)() as session:
+                return await build_knowledge_base(session, version=0)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(build())
+
+
+def _cf_by_penyakit(result) -> dict[str, float]:
+    return {
+        penyakit_id: detail.cf_combined
+        for penyakit_id, detail in result.items()
+        if detail.cf_combined != 0
+    }
+
+
+@pytest.mark.parametrize("pakar_id", [None, "PKR01", "PKR02"])
+@pytest.mark.parametrize("case", USER_CF_CASES)
+def test_vectorized_matches_scalar(kb: KnowledgeBase, case: str, pakar_id):
+    user_cf_map = USER_CF_CASES[case]
+
+    scalar = Diagnosis.calculate_diagnosis_cf(
+        kb.rules_for(user_cf_map), user_cf_map, kb.penyakit, pakar_id
+    )
+    vectorized = Diagnosis.calculate_diagnosis_cf_vectorized(
+        kb, user_cf_map, pakar_id
+    )
+
+    expected = _cf_by_penyakit(scalar)
+    assert expected
+    assert _cf_by_penyakit(vectorized) == pytest.approx(expected)
+    for penyakit_id, detail in vectorized.items():
+        if detail.cf_combined > 0:
+            assert [e.cf_evidence for e in detail.evidence] == pytest.approx(
+                [e.cf_evidence for e in scalar[penyakit_id].evidence]
+            )
+
+
+@pytest.mark.parametrize("case", USER_CF_CASES)
+def test_cf_matrix_evaluates_all_columns(kb: KnowledgeBase, case: str):
+    user_cf_map = USER_CF_CASES[case]
+    pakar_ids = [*kb.pakar, None]
+    columns = [kb.cf_matrix.column(pakar_id) for pakar_id in pakar_ids]
+
+    result = kb.cf_matrix.evaluate(user_cf_map, columns=columns)
+
+    for i, pakar_id in enumerate(pakar_ids):
+        scalar = Diagnosis.calculate_diagnosis_cf(
+            kb.rules_for(user_cf_map), user_cf_map, kb.penyakit, pakar_id
+        )
+        actual = {
+            penyakit_id: cf
+            for penyakit_id, cf in zip(
+                result.penyakit_ids, result.cf[:, i], strict=False
+            )
+            if cf != 0
+        }
+        assert actual == pytest.approx(_cf_by_penyakit(scalar))
+
+
+def test_cf_matrix_separation_matches_dense(kb: KnowledgeBase):
+    matrix = kb.cf_matrix
+    dense = np.zeros((len(matrix.gejala_ids), len(matrix.penyakit_ids)))
+    for gejala_id, rules in kb.rules_by_gejala.items():
+        for rule in rules:
+            dense[
+                matrix.gejala_index[gejala_id],
+                matrix.penyakit_ids.index(rule.id_penyakit),
+            ] = rule.cf_pakar.get("PKR02", 0.0)
+
+    column = matrix.column("PKR02")
+    for candidates in ([0], [0, 1, 2], list(range(len(matrix.penyakit_ids)))):
+        assert matrix.separation(column, candidates) == pytest.approx(
+            dense[:, candidates].std(axis=1)
+        )
@@ -0,0 +1,41 @@
+import asyncio
+import os
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.middleware.query_budget import QUERY_BUDGET_HEADER, QUERY_COUNT_HEADER
+from app.query_budget import run_get_routes
+from tests.conftest import create_schema
+
+
+async def _seed_app_database() -> None:
+    engine = await create_schema(os.environ["DATABASE_URL"], seed=True)
+    await engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def client():
+    from main import app
+
+    asyncio.run(_seed_app_database())
+    with TestClient(app) as test_client:
+        yield app, test_client
+
+
+def test_get_routes_stay_within_query_budget(client):
+    app, test_client = client
+    over_budget = []
+    for path, response in run_get_routes(app, test_client):
+        if response is None:
+            continue
+        assert response.status_code != status.HTTP_500_INTERNAL_SERVER_ERROR, (
+            f"{path}: {response.text}"
+        )
+        budget = response.headers.get(QUERY_BUDGET_HEADER)
+        count = int(response.headers[QUERY_COUNT_HEADER])
+        if budget is not None and count > int(budget):
+            over_budget.append(f"{path}: {count} query (batas {budget})")
+
+    assert not over_budget, "\n".join(over_budget)